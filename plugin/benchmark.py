@@ -0,0 +1,84 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+from collections import deque
+import json
+import os
+import threading
+import time
+
+
+try:
+	clock = time.perf_counter
+except AttributeError:
+	clock = time.time
+
+
+class Benchmark(object):
+	# timings of the plugin's hot paths on a real receiver, saved per plugin version so versions can be compared
+
+	def __init__(self, tag, version, path, maxSamples=1000):
+		self.tag = tag
+		self.version = version
+		self.path = path
+		self.enabled = False
+		self.maxSamples = maxSamples # per name, the most recent ones
+		self.samples = {} # name -> deque of seconds
+		self.counts = {} # name -> number of calls, also those no longer in samples
+		self.lock = threading.Lock() # the parsers are timed in worker threads, save() runs on the main thread
+
+	def record(self, name, seconds):
+		with self.lock:
+			if name not in self.samples:
+				self.samples[name] = deque(maxlen=self.maxSamples)
+			self.samples[name].append(seconds)
+			self.counts[name] = self.counts.get(name, 0) + 1
+
+	def timed(self, name):
+		# decorator; costs one attribute check per call while disabled
+		def decorator(f):
+			def wrapper(*args, **kwargs):
+				if not self.enabled:
+					return f(*args, **kwargs)
+				start = clock()
+				try:
+					return f(*args, **kwargs)
+				finally:
+					self.record(name, clock() - start)
+			wrapper.__name__ = f.__name__
+			wrapper.__doc__ = f.__doc__
+			return wrapper
+		return decorator
+
+	def summary(self):
+		with self.lock:
+			copied = [(name, sorted(samples), self.counts[name]) for name, samples in self.samples.items()]
+		result = {}
+		for name, samples, count in copied:
+			result[name] = {"count": count, "min": samples[0], "median": samples[len(samples) // 2], "max": samples[-1]}
+		return result
+
+	def save(self):
+		if not self.enabled or not self.samples:
+			return
+		results = {}
+		try:
+			with open(self.path, "r") as f:
+				results = json.load(f)
+		except (IOError, ValueError):
+			pass
+		results[self.version] = self.summary()
+		try:
+			if not os.path.isdir(os.path.dirname(self.path)):
+				os.makedirs(os.path.dirname(self.path))
+			with open(self.path + ".tmp", "w") as f:
+				json.dump(results, f, indent=1, sort_keys=True)
+			os.rename(self.path + ".tmp", self.path)
+		except (IOError, OSError) as e:
+			print("[%s] could not write %s: %s" % (self.tag, self.path, e))
+			return
+		for name, s in sorted(results[self.version].items()):
+			print("[%s] benchmark %s: %d calls, min %.6fs, median %.6fs, max %.6fs" % (self.tag, name, s["count"], s["min"], s["median"], s["max"]))
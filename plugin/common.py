@@ -0,0 +1,115 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+from . import _, PLUGIN_NAME
+from .benchmark import Benchmark
+from .stats import Stats
+from Components.config import config, ConfigBoolean, ConfigInteger, ConfigSelection, ConfigSubsection, ConfigText, ConfigYesNo
+from Tools.Directories import fileExists, resolveFilename, SCOPE_CONFIG
+
+from collections import namedtuple
+import json
+import os
+
+
+VERSION = '0.18'
+
+
+setattr(config.plugins, PLUGIN_NAME, ConfigSubsection())
+settings = getattr(config.plugins, PLUGIN_NAME)
+settings.enabled = ConfigYesNo(True)
+settings.position = ConfigSelection(choices=[("1", _("In infobar")), ("2", _("Above infobar")), ("3", _("Top of screen"))], default="1")
+settings.locationid = ConfigInteger(0)
+settings.locationlat = ConfigText()
+settings.locationlon = ConfigText()
+settings.locationname = ConfigText()
+settings.displayas = ConfigText(fixed_size=False, visible_width=50)
+settings.locationname2 = ConfigSelection([_("Press OK")])
+settings.windSpeedUnit = ConfigSelection(choices=[("1", _("BFT")), ("2", _("m/s")), ("3", _("km/h")), ("4", _("mph"))], default="1")
+settings.temperatureUnit = ConfigSelection(choices=[("1", _("°C")), ("2", _("°F"))], default="1")
+settings.showregio = ConfigYesNo(True)
+settings.showtime = ConfigYesNo(True)
+settings.showsunriseset = ConfigYesNo(True)
+settings.showhumidity = ConfigYesNo(True)
+settings.showrain = ConfigYesNo(True)
+settings.showrainforecast = ConfigYesNo(True)
+settings.raingraph = ConfigSelection(choices=[("graph", _("Single graph")), ("pixmaps", _("Separate pixmaps"))], default="pixmaps")
+settings.showwind = ConfigYesNo(True)
+settings.showicon = ConfigYesNo(True)
+settings.showtemperature = ConfigYesNo(True)
+settings.showfeeltemperature = ConfigYesNo(True)
+settings.showminmaxtemperature = ConfigYesNo(True)
+settings.showuvindex = ConfigYesNo(True)
+settings.showsunpower = ConfigYesNo(True)
+settings.hasRain = ConfigBoolean()
+settings.watchedlocations = ConfigText(default="[]") # json list of [id, name, lat, lon, hasRain] of locations besides the main one
+settings.watchedlocations2 = ConfigSelection([_("Press OK")])
+settings.provider = ConfigSelection(choices=[("auto", _("Automatic")), ("buienradar", "Buienradar"), ("openmeteo", "Open-Meteo")], default="auto")
+settings.horizon = ConfigSelection(choices=[("6", _("6 hours")), ("12", _("12 hours")), ("24", _("24 hours")), ("48", _("48 hours"))], default="12")
+settings.locationmode = ConfigSelection(choices=[("pin", _("One location")), ("cycle", _("Next location each time"))], default="pin")
+settings.pinnedlocation = ConfigInteger(0) # id of the location shown in pin mode, 0 for the main location
+settings.pinnedlocation2 = ConfigSelection(choices=[("0", _("Main location"))], default="0")
+settings.backgroundrefresh = ConfigYesNo(False)
+settings.keepstale = ConfigYesNo(True)
+settings.staleage = ConfigSelection(choices=[("30", _("30 minutes")), ("60", _("1 hour")), ("120", _("2 hours")), ("180", _("3 hours"))], default="60")
+settings.refreshmin = ConfigSelection(choices=[("1", _("1 minute")), ("5", _("5 minutes")), ("10", _("10 minutes")), ("15", _("15 minutes"))], default="5")
+settings.refreshmax = ConfigSelection(choices=[("30", _("30 minutes")), ("60", _("1 hour")), ("120", _("2 hours")), ("180", _("3 hours"))], default="120")
+settings.debugfiles = ConfigYesNo(False) # write downloaded data to tmpdir for inspection
+settings.benchmark = ConfigYesNo(False) # time hot paths and save the results per version to benchmarkFile
+
+
+tmpdir = "/tmp/%s" % PLUGIN_NAME
+jsonFile = "%s/weather.json" % tmpdir
+rainFile = "%s/rainForecast.txt" % tmpdir
+persistentdir = resolveFilename(SCOPE_CONFIG, PLUGIN_NAME)
+skinCacheFile = "%s/skincache.json" % persistentdir
+snapshotFile = "%s/snapshot.bin" % persistentdir
+iconStoreDir = "%s/icons" % persistentdir
+benchmarkFile = "%s/benchmarks.json" % persistentdir
+statsFile = "%s/stats.prom" % tmpdir
+
+TAG = PLUGIN_NAME
+
+benchmark = Benchmark(TAG, VERSION, benchmarkFile)
+benchmark.enabled = settings.benchmark.value
+stats = Stats(TAG, statsFile)
+
+
+def writeDebugFile(filename, data):
+	if not settings.debugfiles.value:
+		return
+	try:
+		if not fileExists(tmpdir):
+			os.mkdir(tmpdir)
+		with open(filename, "wb") as f:
+			f.write(data)
+	except (IOError, OSError) as e:
+		print("[%s] could not write %s: %s" % (TAG, filename, e))
+
+
+WatchedLocation = namedtuple("WatchedLocation", "id name lat lon hasRain")
+
+def extraLocations():
+	from .locations import utf8 # not at the top: locations imports twisted, which plugin.py leaves to first use
+	try:
+		extra = json.loads(settings.watchedlocations.value)
+	except ValueError:
+		return []
+	result = []
+	for id, name, lat, lon, hasRain in extra:
+		result.append(WatchedLocation(id, utf8(name), lat, lon, hasRain))
+	return result
+
+def watchedLocations():
+	# the locations to download and show: the main location first, then the other watched locations, or only the
+	# pinned one in pin mode
+	if settings.locationid.value == 0:
+		return []
+	main = WatchedLocation(settings.locationid.value, settings.displayas.value or settings.locationname.value, settings.locationlat.value, settings.locationlon.value, settings.hasRain.value)
+	locations = [main] + [x for x in extraLocations() if x.id != main.id]
+	if settings.locationmode.value == "pin":
+		return [x for x in locations[1:] if x.id == settings.pinnedlocation.value][:1] or [main]
+	return locations
@@ -0,0 +1,196 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+from twisted.internet import defer, protocol, reactor, threads
+from twisted.web.client import Agent, BrowserLikeRedirectAgent, HTTPConnectionPool, ResponseDone
+from twisted.web.http import PotentialDataLoss
+from twisted.web.http_headers import Headers
+
+from .refresh import monotonic
+
+import os
+import time
+import zlib
+
+
+try:
+	from email.utils import mktime_tz, parsedate_tz
+except ImportError:
+	from email.Utils import mktime_tz, parsedate_tz
+
+
+class FetchResult(object):
+
+	def __init__(self, url, data=None, notModified=False, lifetime=None):
+		self.url = url
+		self.data = data # None when notModified
+		self.notModified = notModified
+		self.lifetime = lifetime # seconds, None if the server did not say
+
+
+def freshnessLifetime(headers):
+	cacheControl = headers.getRawHeaders(b"cache-control")
+	if cacheControl:
+		for directive in b",".join(cacheControl).decode("latin-1").split(","):
+			directive = directive.strip().lower()
+			if directive in ("no-cache", "no-store"):
+				return 0
+			if directive.startswith("max-age="):
+				try:
+					return max(int(directive[8:]), 0)
+				except ValueError:
+					pass
+	expires = headers.getRawHeaders(b"expires")
+	if expires:
+		expires = parsedate_tz(expires[-1].decode("latin-1"))
+		if expires is None:
+			return 0 # invalid dates mean already expired
+		now = time.time()
+		date = headers.getRawHeaders(b"date")
+		if date:
+			date = parsedate_tz(date[-1].decode("latin-1"))
+			if date is not None:
+				now = mktime_tz(date)
+		return max(int(mktime_tz(expires) - now), 0)
+	return None
+
+
+class BodyCollector(protocol.Protocol):
+
+	def __init__(self, finished, maxSize):
+		self.finished = finished
+		self.maxSize = maxSize
+		self.size = 0
+		self.chunks = []
+
+	def dataReceived(self, data):
+		if self.finished.called:
+			return
+		self.size += len(data)
+		if self.size > self.maxSize:
+			self.transport.stopProducing()
+			self.finished.errback(IOError("response larger than %d bytes" % self.maxSize))
+			return
+		self.chunks.append(data)
+
+	def connectionLost(self, reason):
+		if self.finished.called:
+			return
+		if reason.check(ResponseDone, PotentialDataLoss):
+			self.finished.callback(b"".join(self.chunks))
+		else:
+			self.finished.errback(reason)
+
+
+class HttpClient(object):
+	# shared client for all downloads: the forecast, rain forecast, icon and location downloads of a refresh reuse
+	# each other's connections to a host, it asks for gzip, follows redirects and remembers validators for
+	# conditional requests
+
+	def __init__(self, tag, stats, timeout=30, maxSize=4 * 1024 * 1024):
+		self.tag = tag
+		self.stats = stats
+		self.timeout = timeout # seconds, for the whole request
+		self.maxSize = maxSize # bytes, after decompression
+		self.pool = HTTPConnectionPool(reactor, persistent=True)
+		self.pool.maxPersistentPerHost = 2
+		# idle connections are closed after twisted's default of 4 minutes, so a refresh an hour later connects
+		# (and does the tls handshake) again; the servers close idle connections sooner than that anyway
+		self.agent = BrowserLikeRedirectAgent(Agent(reactor, connectTimeout=timeout, pool=self.pool))
+		self.validators = {} # url -> (etag, last-modified) of the last 200 response
+		self.timings = {} # url -> (seconds until response headers, seconds for the body, bytes received)
+
+	def fetch(self, url, conditional=False):
+		# returns a Deferred firing with a FetchResult
+		headers = Headers({b"Accept-Encoding": [b"gzip"]})
+		if conditional and url in self.validators:
+			etag, lastModified = self.validators[url]
+			if etag:
+				headers.setRawHeaders(b"If-None-Match", [etag])
+			if lastModified:
+				headers.setRawHeaders(b"If-Modified-Since", [lastModified])
+		start = monotonic()
+		timing = {}
+		self.stats.count("http_requests")
+
+		def gotResponse(response):
+			# includes name resolution, connecting and the tls handshake unless a pooled connection was reused, and
+			# any redirects
+			timing["response"] = monotonic() - start
+			self.stats.time("response", timing["response"])
+			lifetime = freshnessLifetime(response.headers)
+			if response.code == 304:
+				print("[%s] %s not modified" % (self.tag, url))
+				self.stats.count("http_not_modified")
+				return FetchResult(url, notModified=True, lifetime=lifetime)
+			if response.code < 200 or response.code >= 300:
+				raise IOError("HTTP %d for %s" % (response.code, url))
+			etag = response.headers.getRawHeaders(b"etag")
+			lastModified = response.headers.getRawHeaders(b"last-modified")
+			if etag or lastModified:
+				self.validators[url] = (etag and etag[-1], lastModified and lastModified[-1])
+			else:
+				self.validators.pop(url, None)
+			def cancel(d):
+				if collector.transport is not None:
+					collector.transport.stopProducing()
+			finished = defer.Deferred(cancel)
+			collector = BodyCollector(finished, self.maxSize)
+			response.deliverBody(collector)
+			finished.addCallback(gotBody)
+			encoding = response.headers.getRawHeaders(b"content-encoding")
+			if encoding and encoding[-1].strip().lower() == b"gzip":
+				finished.addCallback(gotGzipBody)
+			return finished.addCallback(lambda data: FetchResult(url, data, lifetime=lifetime))
+
+		def gotBody(data):
+			timing["body"] = monotonic() - start - timing["response"]
+			timing["size"] = len(data)
+			self.stats.time("download", timing["body"])
+			self.stats.count("http_bytes", len(data))
+			return data
+
+		def gotGzipBody(data):
+			started = monotonic()
+			return threads.deferToThread(decompress, data, self.maxSize).addCallback(decompressed, started)
+
+		def decompressed(data, started):
+			self.stats.time("decompress", monotonic() - started)
+			return data
+
+		def done(result):
+			if timeoutCall.active():
+				timeoutCall.cancel()
+			if isinstance(result, FetchResult):
+				self.timings[url] = (timing["response"], timing.get("body", 0), timing.get("size", 0))
+				print("[%s] %s: response after %.3fs, body %.3fs, %d bytes" % ((self.tag, url) + self.timings[url]))
+			else:
+				self.stats.count("http_failures")
+			return result
+
+		d = self.agent.request(b"GET", url if isinstance(url, bytes) else url.encode("utf-8"), headers)
+		timeoutCall = reactor.callLater(self.timeout, d.cancel)
+		return d.addCallback(gotResponse).addBoth(done)
+
+	def download(self, url, outputfile):
+		# fetch to a file, e.g. for icons; the file is written in a worker thread
+		def write(result):
+			directory = os.path.dirname(outputfile)
+			if not os.path.isdir(directory):
+				os.makedirs(directory)
+			with open(outputfile, "wb") as f:
+				f.write(result.data)
+			return result
+		return self.fetch(url).addCallback(lambda result: threads.deferToThread(write, result))
+
+
+def decompress(data, maxSize):
+	# runs in a worker thread
+	decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+	data = decompressor.decompress(data, maxSize)
+	if decompressor.unconsumed_tail:
+		raise IOError("response larger than %d bytes" % maxSize)
+	return data
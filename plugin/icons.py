@@ -0,0 +1,140 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+from .refresh import monotonic
+from Tools.LoadPixmap import LoadPixmap
+from twisted.internet import defer
+
+from collections import OrderedDict
+import os
+import time
+
+
+class IconManager(object):
+	# decoded weather icons by buienradar icon code, with icons that are not bundled downloaded once to a store on flash
+
+	iconUrl = "https://www.buienradar.nl/resources/images/icons/weather/30x30/%s.png"
+
+	minRetryDelay = 60 # seconds after a failed download before the icon is downloaded again
+	maxRetryDelay = 6 * 60 * 60 # seconds
+
+	def __init__(self, tag, httpClient, stats, bundledDir, storeDir, capacity=8, maxAge=None, clock=monotonic):
+		self.tag = tag
+		self.httpClient = httpClient
+		self.stats = stats
+		self.bundledDir = bundledDir
+		self.storeDir = storeDir
+		self.capacity = capacity
+		self.maxAge = maxAge # seconds before a downloaded icon is downloaded again, None to keep it forever
+		self.cache = OrderedDict() # iconcode -> pixmap, least recently used first
+		self.pending = {} # iconcode -> list of waiting Deferreds
+		self.refreshing = set() # iconcodes of expired icons being downloaded again
+		self.failures = {} # iconcode -> (number of consecutive failed downloads, clock() before which it is not retried)
+		self.clock = clock
+
+	def path(self, iconcode):
+		for directory in (self.bundledDir, self.storeDir):
+			path = "%s/%s.png" % (directory, iconcode)
+			if os.path.isfile(path):
+				return path
+		return None
+
+	def isExpired(self, path):
+		try:
+			return self.maxAge is not None and path.startswith(self.storeDir + "/") and time.time() - os.path.getmtime(path) > self.maxAge
+		except OSError:
+			return False
+
+	def cached(self, iconcode):
+		pixmap = self.cache.pop(iconcode, None)
+		if pixmap is not None:
+			self.cache[iconcode] = pixmap
+		return pixmap
+
+	def get(self, iconcode):
+		# returns a Deferred firing with the decoded pixmap, synchronously when it is cached or on flash
+		iconcode = str(iconcode)
+		if not iconcode.isalnum():
+			return defer.fail(ValueError("invalid icon code %r" % iconcode))
+		pixmap = self.cached(iconcode)
+		if pixmap is not None:
+			self.stats.count("icon_cache_hits")
+			return defer.succeed(pixmap)
+		d = defer.Deferred()
+		if iconcode in self.pending:
+			self.pending[iconcode].append(d)
+			return d
+		path = self.path(iconcode)
+		if path is not None:
+			self.stats.count("icon_flash_loads")
+			self.pending[iconcode] = [d]
+			self.loaded(path, iconcode)
+			if self.isExpired(path) and iconcode not in self.refreshing and not self.isBackingOff(iconcode):
+				# keep showing the stored icon until the new one is stored
+				self.refreshing.add(iconcode)
+				self.download(iconcode).addCallbacks(self.refreshed, self.refreshFailed, callbackArgs=(iconcode,), errbackArgs=(iconcode,))
+			return d
+		if self.isBackingOff(iconcode):
+			self.stats.count("icon_download_skips")
+			count, retryAt = self.failures[iconcode]
+			return defer.fail(IOError("icon %s failed to download, retrying in %d seconds" % (iconcode, retryAt - self.clock())))
+		self.pending[iconcode] = [d]
+		self.download(iconcode).addCallbacks(lambda path: self.loaded(path, iconcode), self.downloadFailed, errbackArgs=(iconcode,))
+		return d
+
+	def isBackingOff(self, iconcode):
+		return iconcode in self.failures and self.clock() < self.failures[iconcode][1]
+
+	def download(self, iconcode):
+		# returns a Deferred firing with the path of the stored icon
+		path = "%s/%s.png" % (self.storeDir, iconcode)
+		print("[%s] downloading icon %s to %s" % (self.tag, iconcode, path))
+		self.stats.count("icon_downloads")
+		return self.httpClient.download(self.iconUrl % iconcode, path).addCallback(self.downloaded, iconcode, path)
+
+	def downloaded(self, result, iconcode, path):
+		self.failures.pop(iconcode, None)
+		return path
+
+	def downloadFailed(self, failure, iconcode):
+		# exponential backoff, so an icon that cannot be downloaded is not requested on every update of the infobar
+		count = self.failures.get(iconcode, (0, None))[0] + 1
+		retryDelay = min(self.minRetryDelay * 2 ** (count - 1), self.maxRetryDelay)
+		self.failures[iconcode] = (count, self.clock() + retryDelay)
+		print("[%s] could not download icon %s, retrying in %d seconds: %s" % (self.tag, iconcode, retryDelay, failure.getErrorMessage()))
+		self.failed(failure, iconcode)
+
+	def refreshed(self, path, iconcode):
+		# the cached pixmap is the old icon, the next get() loads the new one
+		self.refreshing.discard(iconcode)
+		self.cache.pop(iconcode, None)
+
+	def refreshFailed(self, failure, iconcode):
+		self.refreshing.discard(iconcode)
+		self.downloadFailed(failure, iconcode)
+
+	def loaded(self, path, iconcode):
+		pixmap = LoadPixmap(path, cached=False)
+		if pixmap is None:
+			self.failed(IOError("could not load %s" % path), iconcode)
+			return
+		self.cache[iconcode] = pixmap
+		while len(self.cache) > self.capacity:
+			self.cache.popitem(last=False)
+		for d in self.pending.pop(iconcode, []):
+			d.callback(pixmap)
+
+	def failed(self, failure, iconcode):
+		for d in self.pending.pop(iconcode, []):
+			d.errback(failure)
+
+	def warm(self, iconcodes):
+		for iconcode in iconcodes:
+			if iconcode:
+				self.get(iconcode).addErrback(self.warmFailed)
+
+	def warmFailed(self, failure):
+		print("[%s] could not prefetch icon: %s" % (self.tag, failure.getErrorMessage()))
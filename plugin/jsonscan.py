@@ -0,0 +1,73 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+# walks a json document without keeping it: only the values a handler asks for are kept, everything else is
+# skipped over, and a handler can stop the walk once it has what it needs
+
+from json.decoder import scanstring
+import json
+import re
+
+
+decoder = json.JSONDecoder()
+whitespace = re.compile(r"[ \t\n\r]*")
+
+
+def skipWhitespace(s, i):
+	return whitespace.match(s, i).end()
+
+def expect(s, i, c):
+	i = skipWhitespace(s, i)
+	if s[i:i + 1] != c:
+		raise ValueError("expected %r at %d" % (c, i))
+	return i + 1
+
+def decode(s, i):
+	# (value, end) of the json value at i
+	return decoder.raw_decode(s, skipWhitespace(s, i))
+
+def skip(s, i):
+	# end of the json value at i; decoding it with the C scanner and dropping it is faster than any scanning in python,
+	# and scanArray/scanObject skip big containers an element at a time, so little is alive at once
+	return decoder.raw_decode(s, skipWhitespace(s, i))[1]
+
+def scanObject(s, i, handle):
+	# calls handle(key, i) for every member of the object at i, i being where its value starts; handle returns the
+	# end of the value, or None to stop the walk. returns the end of the object, or None when stopped
+	i = skipWhitespace(s, expect(s, i, "{"))
+	if s[i:i + 1] == "}":
+		return i + 1
+	while True:
+		key, i = scanstring(s, expect(s, i, '"'))
+		i = handle(key, skipWhitespace(s, expect(s, i, ":")))
+		if i is None:
+			return None
+		i = skipWhitespace(s, i)
+		c = s[i:i + 1]
+		if c == "}":
+			return i + 1
+		if c != ",":
+			raise ValueError("expected ',' or '}' at %d" % i)
+		i += 1
+
+def scanArray(s, i, handle):
+	# like scanObject, calls handle(index, i) for every element
+	i = skipWhitespace(s, expect(s, i, "["))
+	if s[i:i + 1] == "]":
+		return i + 1
+	n = 0
+	while True:
+		i = handle(n, i)
+		if i is None:
+			return None
+		i = skipWhitespace(s, i)
+		c = s[i:i + 1]
+		if c == "]":
+			return i + 1
+		if c != ",":
+			raise ValueError("expected ',' or ']' at %d" % i)
+		i += 1
+		n += 1
@@ -0,0 +1,129 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+from twisted.internet import defer
+
+from collections import OrderedDict
+import json
+import time
+import unicodedata
+
+
+try:
+	from urllib.parse import quote
+except ImportError:
+	from urllib import quote
+
+
+try:
+	unicode
+except NameError:
+	unicode = str
+
+
+def normalize(text):
+	# case and accent insensitive form used for matching, e.g. "België" -> "belgie"
+	if not isinstance(text, unicode):
+		text = text.decode("utf-8", "ignore")
+	text = unicodedata.normalize("NFKD", text.strip().lower())
+	return "".join([c for c in text if not unicodedata.combining(c)])
+
+
+def utf8(text):
+	# enigma wants utf-8 encoded str on python 2
+	if str is bytes and isinstance(text, unicode):
+		return text.encode("utf-8")
+	return text
+
+
+class Location(object):
+
+	__slots__ = ("id", "name", "province", "provincecode", "country", "countrycode", "lat", "lon", "key")
+
+	def __init__(self, id, name="", province="", provincecode="", country="", countrycode="", lat=None, lon=None):
+		self.id = id
+		self.name = name
+		self.province = province
+		self.provincecode = provincecode
+		self.country = country
+		self.countrycode = countrycode
+		self.lat = lat
+		self.lon = lon
+		self.key = normalize(name)
+
+	@classmethod
+	def fromJson(cls, x):
+		foad = x.get("foad") or {}
+		location = x.get("location") or {}
+		return cls(x["id"], utf8(x.get("name", "")), utf8(foad.get("name", "")), utf8(foad.get("code", "")), utf8(x.get("country", "")), utf8(x.get("countrycode", "")), location.get("lat"), location.get("lon"))
+
+	def matches(self, query):
+		return query in self.key
+
+
+class LocationSearch(object):
+	# location search with a cache of previous queries; a query that refines an earlier, complete result
+	# (e.g. "amst" after "ams") is answered from that result without going to the network
+
+	url = "https://location.buienradar.nl/1.1/location/search?query=%s"
+
+	def __init__(self, tag, httpClient, stats, capacity=32, completeBelow=10, maxAge=None):
+		self.tag = tag
+		self.httpClient = httpClient
+		self.stats = stats
+		self.capacity = capacity
+		self.completeBelow = completeBelow # a result with fewer locations is assumed not to be truncated by the server
+		self.maxAge = maxAge # seconds a result is reused, None to reuse it as long as it is cached
+		self.queries = OrderedDict() # normalized query -> (time.time(), list of Locations), least recently used first
+		self.pending = {} # normalized query -> list of waiting Deferreds
+
+	def cached(self, query):
+		if self.maxAge is not None:
+			now = time.time()
+			for previous, (fetched, result) in list(self.queries.items()):
+				if now - fetched > self.maxAge:
+					del self.queries[previous]
+		if query in self.queries:
+			entry = self.queries.pop(query)
+			self.queries[query] = entry
+			return entry[1]
+		for previous, (fetched, result) in reversed(list(self.queries.items())):
+			if query.startswith(previous) and len(result) < self.completeBelow:
+				return [location for location in result if location.matches(query)]
+		return None
+
+	def search(self, searchterm):
+		# returns a Deferred firing with a list of Locations
+		query = normalize(searchterm)
+		result = self.cached(query)
+		if result is not None:
+			print("[%s] location search for %r answered from cache" % (self.tag, query))
+			self.stats.count("location_cache_hits")
+			return defer.succeed(result)
+		d = defer.Deferred()
+		if query in self.pending:
+			self.pending[query].append(d)
+			return d
+		self.pending[query] = [d]
+		self.stats.count("location_downloads")
+		url = self.url % quote(utf8(searchterm.strip()) if str is bytes else searchterm.strip())
+		print("[%s] downloading %s" % (self.tag, url))
+		self.httpClient.fetch(url).addCallback(self.parse).addCallbacks(self.done, self.failed, callbackArgs=(query,), errbackArgs=(query,))
+		return d
+
+	def parse(self, result):
+		return [Location.fromJson(x) for x in json.loads(result.data)]
+
+	def done(self, result, query):
+		self.queries[query] = (time.time(), result)
+		while len(self.queries) > self.capacity:
+			self.queries.popitem(last=False)
+		for d in self.pending.pop(query, []):
+			d.callback(result)
+
+	def failed(self, failure, query):
+		for d in self.pending.pop(query, []):
+			d.errback(failure)
@@ -0,0 +1,300 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+from .jsonscan import decode, scanArray, scanObject, skip
+from .refresh import monotonic
+
+import bisect
+import calendar
+import datetime
+import json
+import time
+
+
+compassPoints = ["N", "NNO", "NO", "ONO", "O", "OZO", "ZO", "ZZO", "Z", "ZZW", "ZW", "WZW", "W", "WNW", "NW", "NNW"]
+beaufortLimits = [0.3, 1.6, 3.4, 5.5, 8.0, 10.8, 13.9, 17.2, 20.8, 24.5, 28.5, 32.7] # m/s, lower limits of 1 to 12 BFT
+
+
+def beaufortOf(windspeedms):
+	return bisect.bisect_right(beaufortLimits, windspeedms)
+
+def compassPoint(degrees):
+	# index in compassPoints
+	return int(round(degrees / 22.5)) % 16
+
+def hhmm(isotime):
+	# "2024-06-01T05:21:00" -> "05:21"
+	return isotime.split("T")[1][:5] if isotime and "T" in isotime else None
+
+
+class Hour(object):
+	# the weather of one hour, in the units buienradar uses; fields a provider does not have are None
+
+	__slots__ = ("time", "temperature", "feeltemperature", "humidity", "precipitation", "windspeedms", "beaufort", "winddirection", "iconcode", "sunpower")
+
+	def __init__(self, time, temperature=None, feeltemperature=None, humidity=None, precipitation=None, windspeedms=None, winddirection=None, iconcode=None, sunpower=None, beaufort=None):
+		self.time = time # local time of the location, "YYYY-MM-DDTHH:MM"
+		self.temperature = temperature # °C
+		self.feeltemperature = feeltemperature # °C
+		self.humidity = humidity # %
+		self.precipitation = precipitation # chance of rain, %
+		self.windspeedms = windspeedms
+		if beaufort is None and windspeedms is not None:
+			beaufort = beaufortOf(windspeedms) # for providers that only have the wind speed
+		self.beaufort = beaufort
+		self.winddirection = winddirection # index in compassPoints
+		self.iconcode = iconcode # buienradar icon code, see images/icons
+		self.sunpower = sunpower # W/m²
+
+	def interpolate(self, other, f):
+		# the weather at fraction f of the way to the next hour; icon and wind direction do not interpolate
+		def mix(a, b, digits):
+			if a is None or b is None:
+				return a
+			value = round(a + (b - a) * f, digits)
+			return int(value) if digits == 0 else value
+		nearest = self if f < 0.5 else other
+		return Hour(self.time, mix(self.temperature, other.temperature, 1), mix(self.feeltemperature, other.feeltemperature, 1), mix(self.humidity, other.humidity, 0), mix(self.precipitation, other.precipitation, 0),
+			mix(self.windspeedms, other.windspeedms, 2), nearest.winddirection, self.iconcode, mix(self.sunpower, other.sunpower, 0), mix(self.beaufort, other.beaufort, 0))
+
+
+class Forecast(object):
+	# normalized forecast of one location, whatever provider it came from; hours[0] is the hour it was issued in
+
+	__slots__ = ("provider", "updated", "utcOffset", "hours", "hourTimes", "mintemperature", "maxtemperature", "uvindex", "sunrise", "sunset")
+
+	def __init__(self, provider, updated, utcOffset, hours, mintemperature=None, maxtemperature=None, uvindex=None, sunrise=None, sunset=None):
+		self.provider = provider
+		self.updated = updated # "HH:MM", local time of the location
+		self.utcOffset = utcOffset # seconds, of the local time of the location
+		self.hours = hours
+		self.hourTimes = None # see times()
+		self.mintemperature = mintemperature
+		self.maxtemperature = maxtemperature
+		self.uvindex = uvindex
+		self.sunrise = sunrise # "HH:MM"
+		self.sunset = sunset # "HH:MM"
+
+	def times(self):
+		# start of each hour in seconds, counted as if the local time of the location were utc; empty if unknown
+		if self.hourTimes is None:
+			try:
+				self.hourTimes = [calendar.timegm(time.strptime(hour.time, "%Y-%m-%dT%H:%M")) for hour in self.hours]
+			except ValueError:
+				self.hourTimes = []
+		return self.hourTimes
+
+	def at(self, ahead=0):
+		# the weather now (or ahead seconds from now), interpolated between the hours around it, so the display keeps up
+		# with the time without downloading the forecast again
+		times = self.times()
+		if not times:
+			return self.hours[0]
+		now = time.time() + self.utcOffset + ahead
+		i = bisect.bisect_right(times, now) - 1
+		if i < 0:
+			return self.hours[0]
+		if i >= len(self.hours) - 1:
+			return self.hours[-1]
+		return self.hours[i].interpolate(self.hours[i + 1], (now - times[i]) / float(times[i + 1] - times[i]))
+
+
+class Buienradar(object):
+
+	name = "buienradar"
+	url = "https://forecast.buienradar.nl/2.0/forecast/%d"
+	rainForecastUrl = "https://gpsgadget.buienradar.nl/data/raintext/?lat=%g&lon=%g"
+
+	def supports(self, location):
+		return True
+
+	def forecastUrl(self, location):
+		return self.url % location.id
+
+	def rainUrl(self, location):
+		# the two hour rain forecast, only available for The Netherlands and Belgium
+		return self.rainForecastUrl % (float(location.lat), float(location.lon)) if location.hasRain else None
+
+	topFields = ("timestamp", "timeOffset")
+	dayFields = ("mintemperature", "maxtemperature", "uvindex", "sunrise", "sunset")
+
+	def hour(self, d):
+		winddirection = d.get("winddirection")
+		if winddirection in compassPoints:
+			winddirection = compassPoints.index(winddirection)
+		elif d.get("winddirectiondegrees") is not None:
+			winddirection = compassPoint(d["winddirectiondegrees"])
+		else:
+			winddirection = None
+		return Hour(d.get("datetime", "")[:16], d.get("temperature"), d.get("feeltemperature"), d.get("humidity"), d.get("precipitation"), d.get("windspeedms"), winddirection, d.get("iconcode"), d.get("sunpower"), d.get("beaufort"))
+
+	def parse(self, data, horizon):
+		# the document has hours for several days, of which only the first horizon hours and the summary of the first
+		# day are used: only those are decoded, and the rest of the document is not even looked at once they are found
+		if not isinstance(data, str):
+			data = data.decode("utf-8")
+		top = {}
+		days = [] # summary fields per day
+		hours = []
+
+		def done():
+			return len(hours) >= horizon and len(top) == len(self.topFields) and (len(days) > 1 or len(days[0]) == len(self.dayFields))
+
+		def member(key, i):
+			if key == "days":
+				return scanArray(data, i, day)
+			if key in self.topFields:
+				top[key], i = decode(data, i)
+				return i
+			return skip(data, i)
+
+		def day(n, i):
+			if len(hours) >= horizon:
+				return None if done() else skip(data, i)
+			days.append({})
+			return scanObject(data, i, dayMember)
+
+		def dayMember(key, i):
+			if key == "hours":
+				return scanArray(data, i, hour)
+			if key in self.dayFields and len(days) == 1:
+				days[0][key], i = decode(data, i)
+				return i
+			return skip(data, i)
+
+		def hour(n, i):
+			if len(hours) >= horizon:
+				return None if done() else skip(data, i)
+			d, i = decode(data, i)
+			hours.append(self.hour(d))
+			return i
+
+		try:
+			scanObject(data, 0, member)
+			if not hours:
+				raise ValueError("no hours in forecast")
+			updated = None
+			if "timestamp" in top:
+				dt = datetime.datetime.strptime(top["timestamp"], "%Y-%m-%dT%H:%M:%S")
+				updated = str(dt + datetime.timedelta(hours=top.get("timeOffset", 0)))[11:16]
+			summary = days[0]
+			return Forecast(self.name, updated, int(top.get("timeOffset", 0) * 3600), hours, summary.get("mintemperature"), summary.get("maxtemperature"), summary.get("uvindex"), hhmm(summary.get("sunrise")), hhmm(summary.get("sunset")))
+		except (AttributeError, IndexError, TypeError) as e:
+			raise ValueError("unexpected forecast: %r" % e)
+
+
+class OpenMeteo(object):
+	# https://open-meteo.com, no api key needed, worldwide
+
+	name = "openmeteo"
+	url = ("https://api.open-meteo.com/v1/forecast?latitude=%g&longitude=%g&timezone=auto&forecast_days=3&wind_speed_unit=ms&current=is_day"
+		"&hourly=temperature_2m,apparent_temperature,relative_humidity_2m,precipitation_probability,wind_speed_10m,wind_direction_10m,weather_code,is_day,shortwave_radiation"
+		"&daily=temperature_2m_max,temperature_2m_min,uv_index_max,sunrise,sunset")
+	# wmo weather interpretation code -> buienradar icon code (doubled at night)
+	iconcodes = {0: "a", 1: "b", 2: "j", 3: "c", 45: "n", 48: "n", 51: "m", 53: "m", 55: "m", 56: "w", 57: "w", 61: "q", 63: "q", 65: "q", 66: "w", 67: "w",
+		71: "u", 73: "u", 75: "t", 77: "u", 80: "f", 81: "f", 82: "f", 85: "u", 86: "t", 95: "s", 96: "s", 99: "s"}
+
+	def supports(self, location):
+		try:
+			float(location.lat), float(location.lon)
+		except (TypeError, ValueError):
+			return False
+		return True
+
+	def forecastUrl(self, location):
+		return self.url % (float(location.lat), float(location.lon))
+
+	def rainUrl(self, location):
+		return None
+
+	def parse(self, data, horizon):
+		# a small document, columns per field
+		j = json.loads(data)
+		try:
+			hourly = j["hourly"]
+			daily = j["daily"]
+			now = j["current"]["time"]
+			times = hourly["time"]
+			start = 0
+			while start < len(times) - 1 and times[start + 1] <= now:
+				start += 1
+			hours = []
+			for i in range(start, min(start + horizon, len(times))):
+				iconcode = self.iconcodes.get(hourly["weather_code"][i])
+				if iconcode is not None and not hourly["is_day"][i]:
+					iconcode += iconcode
+				windspeedms = hourly["wind_speed_10m"][i]
+				winddirection = hourly["wind_direction_10m"][i]
+				hours.append(Hour(times[i], hourly["temperature_2m"][i], hourly["apparent_temperature"][i], hourly["relative_humidity_2m"][i], hourly["precipitation_probability"][i], windspeedms, compassPoint(winddirection) if winddirection is not None else None, iconcode, hourly["shortwave_radiation"][i]))
+			if not hours:
+				raise ValueError("no hours in forecast")
+			uvindex = daily["uv_index_max"][0]
+			return Forecast(self.name, hhmm(now), j.get("utc_offset_seconds", 0), hours, daily["temperature_2m_min"][0], daily["temperature_2m_max"][0], int(round(uvindex)) if uvindex is not None else None, hhmm(daily["sunrise"][0]), hhmm(daily["sunset"][0]))
+		except (KeyError, IndexError, TypeError) as e:
+			raise ValueError("unexpected forecast: %r" % e)
+
+
+class ProviderHealth(object):
+	# moving averages of the latency and error rate of one provider
+
+	def __init__(self, weight=0.3, halfLife=3600):
+		self.weight = weight # of the newest request
+		self.halfLife = halfLife # seconds
+		self.latency = None # seconds
+		self.errorRate = 0.0
+		self.updated = 0 # monotonic()
+
+	def currentErrorRate(self):
+		# errors are forgotten over time, so a provider that failed is tried again eventually
+		return self.errorRate * 0.5 ** ((monotonic() - self.updated) / self.halfLife)
+
+	def success(self, seconds):
+		self.latency = seconds if self.latency is None else (1 - self.weight) * self.latency + self.weight * seconds
+		self.errorRate = (1 - self.weight) * self.currentErrorRate()
+		self.updated = monotonic()
+
+	def failure(self):
+		self.errorRate = (1 - self.weight) * self.currentErrorRate() + self.weight
+		self.updated = monotonic()
+
+
+class Providers(object):
+	# picks the healthiest provider for a location and the ones to fail over to
+
+	def __init__(self, providers):
+		self.providers = providers
+		self.health = dict((p.name, ProviderHealth()) for p in providers)
+
+	def get(self, name):
+		for provider in self.providers:
+			if provider.name == name:
+				return provider
+		return None
+
+	def ordered(self, location, pinned="auto"):
+		# least errors first, then buienradar for The Netherlands and Belgium and the others elsewhere, then fastest
+		if pinned != "auto":
+			provider = self.get(pinned)
+			return [provider] if provider is not None and provider.supports(location) else []
+		candidates = [p for p in self.providers if p.supports(location)]
+		def key(provider):
+			health = self.health[provider.name]
+			preferred = (provider.name == Buienradar.name) == bool(location.hasRain)
+			return (int(health.currentErrorRate() * 4), not preferred, health.latency or 0)
+		return sorted(candidates, key=key)
+
+	def success(self, provider, seconds):
+		self.health[provider.name].success(seconds)
+
+	def failure(self, provider):
+		self.health[provider.name].failure()
+
+	def state(self):
+		return dict((name, {"latency": health.latency, "errorRate": health.currentErrorRate()}) for name, health in self.health.items())
+
+
+buienradar = Buienradar()
+providers = Providers([buienradar, OpenMeteo()])
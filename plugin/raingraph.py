@@ -0,0 +1,83 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+# the rain forecast as one widget: the bars of images/rain/*.png drawn with a few rectangle fills on a canvas,
+# instead of two MultiPixmap widgets per bar that each load all 30 pixmaps
+
+from Components.GUIComponent import GUIComponent
+from enigma import eCanvas, eRect, gRGB
+
+
+# colors as gRGB takes them, the alpha byte being transparency (0 is opaque)
+TRANSPARENT = 0xff000000
+OUTLINE = 0xa2000000 # the dark line above each bar and below the graph
+DRY = 0x00999999 # a bar without rain
+# the colors of the rows of a bar, from the top row of the highest bar (row 1) down to row 29; every bar shows the
+# bottom rows of this gradient, as the rain pixmaps do
+gradient = [0xc41cb7, 0xcd1c9e, 0xd51b86, 0xdc196c, 0xe31a59, 0xea1940, 0xf31827, 0xee1608, 0xcd1416, 0xac1125,
+	0x8c0f33, 0x6b0e41, 0x520c4c, 0x320a5a, 0x050d79, 0x0f188c, 0x19239e, 0x232eb1, 0x2b37bf, 0x3541d1, 0x3f4de4,
+	0x5767ff, 0x6b78ff, 0x7e8aff, 0x8d96ff, 0xa1a8ff, 0xb4baff, 0xc7cbff, 0xdbddff]
+height = 31 # rows, like the rain pixmaps
+barWidth = 2 # the rain pixmaps overlap, 2 pixels of each stay visible
+
+
+def pixelColor(level, y):
+	# the color of row y of a bar of level (a pixmap number, 0-29), None if transparent
+	if y == height - 1:
+		return OUTLINE
+	top = height - 1 - max(level, 1)
+	if y == top - 1:
+		return OUTLINE
+	if y >= top:
+		return gradient[y - 1] if level else DRY
+	return None
+
+def rects(levels):
+	# (x, y, width, height, color) rectangles drawing bars of the given levels: every row is split into runs of one
+	# color, so a dry forecast is three fills and even heavy rain only a few per row
+	result = []
+	for y in range(height):
+		start = 0
+		color = pixelColor(levels[0], y) if levels else None
+		for i in range(1, len(levels) + 1):
+			c = pixelColor(levels[i], y) if i < len(levels) else None
+			if c != color or i == len(levels):
+				if color is not None:
+					result.append((start * barWidth, y, (i - start) * barWidth, 1, color))
+				start = i
+				color = c
+	return result
+
+
+class RainGraph(GUIComponent):
+
+	GUI_WIDGET = eCanvas
+
+	def __init__(self):
+		GUIComponent.__init__(self)
+		self.levels = None
+		self.fills = 0 # calls into enigma for the last update
+
+	def applySkin(self, desktop, parent):
+		result = GUIComponent.applySkin(self, desktop, parent)
+		self.instance.setSize(self.instance.size()) # a canvas only allocates its pixmap in setSize
+		if self.levels is not None:
+			self.draw(self.levels)
+		return result
+
+	def setLevels(self, levels):
+		# levels: a rain pixmap number per bar; the heaviest rain pixmaps all show the whole gradient
+		levels = [min(level, len(gradient)) for level in levels]
+		self.levels = levels
+		if self.instance is not None:
+			self.draw(levels)
+
+	def draw(self, levels):
+		self.instance.clear(gRGB(TRANSPARENT))
+		todo = rects(levels)
+		for x, y, w, h, color in todo:
+			self.instance.fillRect(eRect(x, y, w, h), gRGB(color))
+		self.fills = len(todo) + 1
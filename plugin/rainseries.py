@@ -0,0 +1,114 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+from array import array
+import io
+import time
+
+
+NO_TIME = 0xffff
+
+
+def intensityToPixmapNum(v):
+	# maps a raintext intensity (0-255) to a rain pixmap number, 0 (dry) up to 32 for the heaviest rain; callers clamp
+	# it to the pixmaps (or gradient rows) they have
+	if not v:
+		return 0
+	if v <= 125.0:
+		return int(round(v / 15.625)) + 1
+	elif v <= 136.0:
+		return int(round((v - 125.0)/ 1.375)) + 9
+	elif v <= 157.0:
+		return int(round((v - 136.0)/ 2.625)) + 17
+	else:
+		return int(round((v - 157.0)/ 15.0)) + 25
+
+
+pixmapNumTable = array('B', [intensityToPixmapNum(v) for v in range(0, 256)])
+
+
+def minutesNow():
+	# local time as minutes since midnight, like RainSeries.times
+	t = time.localtime()
+	return t.tm_hour * 60 + t.tm_min
+
+
+class RainSeries(object):
+	# compact two hour rain forecast: one byte of intensity and the HH:MM time (as minutes since midnight) per 5 minute bucket
+
+	__slots__ = ("intensities", "times")
+
+	def __init__(self):
+		self.intensities = array('B')
+		self.times = array('H')
+
+	def __len__(self):
+		return len(self.intensities)
+
+	@classmethod
+	def parse(cls, data):
+		# raintext lines look like "077|13:05", raises ValueError on a malformed intensity
+		if not isinstance(data, bytes):
+			data = data.encode("utf-8")
+		series = cls()
+		intensities = series.intensities
+		times = series.times
+		for line in io.BytesIO(data):
+			line = line.strip()
+			if not line:
+				continue
+			sep = line.find(b"|")
+			if sep < 0:
+				value = line
+				t = b""
+			else:
+				value = line[:sep]
+				t = line[sep + 1:]
+			v = int(round(float(value.replace(b",", b"."))))
+			intensities.append(min(max(v, 0), 255))
+			try:
+				times.append(int(t[:2]) * 60 + int(t[3:5]))
+			except ValueError:
+				times.append(NO_TIME)
+		return series
+
+	def hasTimes(self):
+		return len(self) > 0 and self.times[0] != NO_TIME and self.times[-1] != NO_TIME
+
+	def offset(self, minutes):
+		# minutes (since midnight) relative to the first bucket, also when the series crosses midnight; a series
+		# never starts more than an hour ahead, anything else is after its start
+		d = (minutes - self.times[0]) % 1440
+		return d - 1440 if d > 1380 else d
+
+	def index(self, minutes):
+		# the bucket minutes (since midnight) falls in: 0 before the series, len(self) once it has passed
+		if not self.hasTimes():
+			return 0
+		now = self.offset(minutes)
+		if now < 0:
+			return 0
+		if now >= self.offset(self.times[-1]) + 5:
+			return len(self)
+		i = 0
+		while i + 1 < len(self) and self.times[i + 1] != NO_TIME and self.offset(self.times[i + 1]) <= now:
+			i += 1
+		return i
+
+	def remaining(self, minutes):
+		# minutes of forecast left after minutes (since midnight)
+		if not self.hasTimes():
+			return 0
+		return self.offset(self.times[-1]) + 5 - self.offset(minutes)
+
+	def raining(self, minutes):
+		# whether any rain is forecast from minutes (since midnight) on
+		return any(self.intensities[self.index(minutes):])
+
+	def pixmapNums(self, count, start=0):
+		# count buckets from start, the ones past the end of the series as no rain
+		nums = [pixmapNumTable[v] for v in self.intensities[start:start + count]]
+		return nums + [0] * (count - len(nums))
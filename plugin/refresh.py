@@ -0,0 +1,123 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+from twisted.internet import defer
+
+import time
+
+
+try:
+	from time import monotonic
+except ImportError:
+	def monotonic():
+		# python 2: seconds since boot, not affected by the clock being set (e.g. by NTP after boot)
+		with open("/proc/uptime") as f:
+			return float(f.read().split()[0])
+
+
+class RefreshCoordinator(object):
+	# makes sure each resource (url) is downloaded at most once at a time and keeps track of attempts and successes
+
+	def __init__(self, minRetryDelay=60, maxRetryDelay=600, clock=monotonic):
+		self.clock = clock
+		self.minRetryDelay = minRetryDelay # seconds
+		self.maxRetryDelay = maxRetryDelay # seconds
+		self.inFlight = {} # resource -> list of waiting Deferreds
+		self.lastAttempt = {} # resource -> clock()
+		self.lastSuccess = {} # resource -> clock()
+		self.lastError = {} # resource -> str(failure)
+		self.failures = {} # resource -> number of consecutive failures
+
+	def isInFlight(self, resource):
+		return resource in self.inFlight
+
+	def refresh(self, resource, start):
+		# start() is only called when no request for resource is pending; every caller gets its own
+		# Deferred, fired with the result of the single shared request
+		d = defer.Deferred()
+		if resource in self.inFlight:
+			self.inFlight[resource].append(d)
+			return d
+		self.inFlight[resource] = [d]
+		self.lastAttempt[resource] = self.clock()
+		try:
+			request = start()
+		except Exception:
+			request = defer.fail()
+		request.addCallbacks(self.success, self.failure, callbackArgs=(resource,), errbackArgs=(resource,))
+		return d
+
+	def success(self, result, resource):
+		self.lastSuccess[resource] = self.clock()
+		self.failures[resource] = 0
+		self.lastError.pop(resource, None)
+		for d in self.inFlight.pop(resource, []):
+			d.callback(result)
+
+	def failure(self, failure, resource):
+		self.failures[resource] = self.failures.get(resource, 0) + 1
+		self.lastError[resource] = str(failure.value)
+		for d in self.inFlight.pop(resource, []):
+			d.errback(failure)
+
+	def retryDelay(self, resource):
+		# exponential backoff after consecutive failures
+		failures = self.failures.get(resource, 0)
+		if not failures:
+			return self.minRetryDelay
+		return min(self.minRetryDelay * 2 ** (failures - 1), self.maxRetryDelay)
+
+	def state(self):
+		# lastAttempt and lastSuccess in seconds ago
+		now = self.clock()
+		resources = set(self.lastAttempt) | set(self.inFlight)
+		return dict((resource, {
+			"inFlight": resource in self.inFlight,
+			"waiters": len(self.inFlight.get(resource, [])),
+			"lastAttempt": now - self.lastAttempt[resource] if resource in self.lastAttempt else None,
+			"lastSuccess": now - self.lastSuccess[resource] if resource in self.lastSuccess else None,
+			"failures": self.failures.get(resource, 0),
+			"lastError": self.lastError.get(resource),
+		}) for resource in resources)
+
+
+class RefreshPolicy(object):
+	# how long each kind of data stays fresh: rain is refreshed faster while it rains nearby, everything backs off at
+	# night and while the values do not change, always within the bounds set by the user
+
+	forecastInterval = 60 * 60 # seconds, also the minimum: forecasts are downloaded at least an hour apart
+	rainInterval = 5 * 60 # seconds, while it rains or is about to
+	rainHorizon = 90 * 60 # seconds of rain forecast to keep ahead of now
+	iconTtl = 30 * 24 * 60 * 60 # seconds before a downloaded icon is downloaded again
+	locationTtl = 24 * 60 * 60 # seconds a location search result is reused
+	nightHours = range(0, 6)
+	nightFactor = 2
+	stableFactor = 1.5
+
+	def __init__(self, bounds, localtime=time.localtime):
+		self.bounds = bounds # returns (minimum, maximum) seconds between downloads of forecast and rain
+		self.localtime = localtime
+
+	def isNight(self):
+		return self.localtime().tm_hour in self.nightHours
+
+	def adjust(self, ttl, backoff=True):
+		if backoff and self.isNight():
+			ttl *= self.nightFactor
+		minimum, maximum = self.bounds()
+		return int(min(max(ttl, minimum), maximum))
+
+	def forecastTtl(self, lifetime, changed):
+		ttl = self.forecastInterval if lifetime is None else max(lifetime, self.forecastInterval)
+		if not changed:
+			ttl *= self.stableFactor
+		return self.adjust(ttl)
+
+	def rainTtl(self, remaining, raining):
+		# remaining: seconds of rain forecast left
+		if raining:
+			return self.adjust(self.rainInterval, backoff=False)
+		return self.adjust(max(remaining - self.rainHorizon, self.rainInterval))
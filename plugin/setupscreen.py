@@ -0,0 +1,507 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+from . import _, PLUGIN_NAME
+from .common import extraLocations, settings, stats, statsFile, TAG, VERSION
+from .locations import LocationSearch
+from .refresh import RefreshPolicy
+from .weather import httpClient, refreshCoordinator
+from Components.ActionMap import ActionMap
+from Components.Button import Button
+from Components.config import config, getConfigListEntry
+from Components.ConfigList import ConfigListScreen
+from Components.Label import Label
+from Components.MenuList import MenuList
+from Components.Pixmap import Pixmap
+from Components.ScrollLabel import ScrollLabel
+from Components.Sources.Boolean import Boolean
+from enigma import eListboxPythonMultiContent, gFont, RT_HALIGN_LEFT, RT_HALIGN_RIGHT, RT_VALIGN_CENTER
+from Screens.MessageBox import MessageBox
+from Screens.Screen import Screen
+from Screens.VirtualKeyBoard import VirtualKeyBoard
+from skin import parseFont
+
+import json
+
+
+locationSearch = LocationSearch(TAG, httpClient, stats, maxAge=RefreshPolicy.locationTtl)
+
+
+def searchLocationsFailed(session, failure):
+	print("[%s] location search failed: %s" % (TAG, failure.getErrorMessage()))
+	if failure.check(ValueError, KeyError, TypeError):
+		session.open(MessageBox, _("Could not parse location data."), MessageBox.TYPE_ERROR)
+	else:
+		session.open(MessageBox, _("Could not download location data."), MessageBox.TYPE_ERROR)
+
+
+class LocationList(MenuList):
+
+	def __init__(self, list, selection=0, enableWrapAround=False):
+		MenuList.__init__(self, list, enableWrapAround, eListboxPythonMultiContent)
+		self.l.setFont(0, gFont("Regular", 26))
+		self.l.setItemHeight(45)
+		self.selection = selection
+
+	@staticmethod
+	def entry(locationid, locationname, province, country, lat, lon):
+		l = [locationid]
+		lonStart = 1010
+		lonWidth = 90
+		latStart = 910
+		latWidth = 90
+		countryStart = 670
+		countryWidth = 270
+		provinceStart = 380
+		provinceWidth = 270
+		locationnameStart = 10
+		locationnameWidth = 360
+		itemHeight = 45
+		l.append((eListboxPythonMultiContent.TYPE_TEXT, lonStart,          0, lonWidth,          itemHeight, 0, RT_HALIGN_RIGHT | RT_VALIGN_CENTER, lon))
+		l.append((eListboxPythonMultiContent.TYPE_TEXT, latStart,          0, latWidth,          itemHeight, 0, RT_HALIGN_RIGHT | RT_VALIGN_CENTER, lat))
+		l.append((eListboxPythonMultiContent.TYPE_TEXT, countryStart,      0, countryWidth,      itemHeight, 0, RT_HALIGN_LEFT  | RT_VALIGN_CENTER, country))
+		l.append((eListboxPythonMultiContent.TYPE_TEXT, provinceStart,     0, provinceWidth,     itemHeight, 0, RT_HALIGN_LEFT  | RT_VALIGN_CENTER, province))
+		l.append((eListboxPythonMultiContent.TYPE_TEXT, locationnameStart, 0, locationnameWidth, itemHeight, 0, RT_HALIGN_LEFT  | RT_VALIGN_CENTER, locationname))
+		return l
+
+	def applySkin(self, desktop, parent):
+		attribs = []
+		if self.skinAttributes is not None:
+			for (attrib, value) in self.skinAttributes:
+				if attrib == "font":
+					self.font = parseFont(value, ((1, 1), (1, 1)))
+					self.l.setFont(0, self.font)
+				elif attrib == "itemHeight":
+					self.l.setItemHeight(int(value))
+				else:
+					attribs.append((attrib, value))
+			self.skinAttributes = attribs
+		return MenuList.applySkin(self, desktop, parent)
+
+	def postWidgetCreate(self, instance):
+		MenuList.postWidgetCreate(self, instance)
+		self.moveToIndex(self.selection)
+
+
+class SelectLocationScreen(Screen):
+
+	pageSize = 20
+
+	def __init__(self, session, locations):
+		primarySkin = config.skin.primary_skin.value.split("/")[0]
+		if primarySkin == "PLi-FullNightHD" or primarySkin == "PLi-FullHD" or primarySkin == "Pd1loi-HD-night":
+			self.skin = """
+				<screen name=\"""" + PLUGIN_NAME + """SelectLocation" position="fill" flags="wfNoBorder">
+					<panel name="PigTemplate"/>
+					<panel name="ButtonRed"/>
+					<panel name="ButtonGreen"/>
+					<panel name="KeyOkTemplate"/>
+					<widget name="city" position="790,103" size="200,45" font="Regular; 28" />
+					<widget name="province" position="1160,103" size="200,45" font="Regular; 28" />
+					<widget name="country" position="1451,103" size="200,45" font="Regular; 28" />
+					<widget name="lat" position="1740,103" size="80,45" font="Regular; 28" />
+					<widget name="lon" position="1834,103" size="80,45" font="Regular; 28" />
+					<widget name="locationList" position="780,153" size="1109,855" font="Regular; 26" itemHeight="45" scrollbarMode="showOnDemand" />
+				</screen>"""
+		else:
+			self.skin = """
+				<screen name=\"""" + PLUGIN_NAME + """SelectLocation" position="center,center" size="1150,715">
+					<widget name="city" position="20,9" size="200,45" font="Regular; 28" />
+					<widget name="province" position="390,9" size="200,45" font="Regular; 28" />
+					<widget name="country" position="681,9" size="200,45" font="Regular; 28" />
+					<widget name="lat" position="971,9" size="80,45" font="Regular; 28" />
+					<widget name="lon" position="1064,9" size="80,45" font="Regular; 28" />
+					<widget name="locationList" position="10,55" size="e-10,e-130" font="Regular; 26" itemHeight="45" scrollbarMode="showOnDemand" />
+					<ePixmap pixmap="skin_default/buttons/key_ok.png" position="10,e-42" zPosition="0" size="35,25" transparent="1" alphatest="on" />
+					<ePixmap pixmap="skin_default/buttons/red.png" position="55,e-50" zPosition="0" size="140,40" transparent="1" alphatest="on" />
+					<ePixmap pixmap="skin_default/buttons/green.png" position="195,e-50" zPosition="0" size="140,40" transparent="1" alphatest="on" />
+					<widget name="key_red" position="55,e-50" zPosition="1" size="140,40" font="Regular; 20" valign="center" halign="center" backgroundColor="#9f1313" transparent="1" />
+					<widget name="key_green" position="195,e-50" zPosition="1" size="140,40" font="Regular; 20" valign="center" halign="center" backgroundColor="#1f771f" transparent="1" />
+				</screen>"""
+		self.session = session
+		Screen.__init__(self, session)
+		self.skinName = PLUGIN_NAME + "SelectLocation"
+		self.setTitle(_("Select location"))
+
+		self["actions"] = ActionMap(["SetupActions", "ColorActions"],
+		{
+			"ok": self.keyOk,
+			"green": self.keyOk,
+			"cancel": self.keyCancel,
+			"red": self.keyCancel,
+		}, -2)
+
+		self.locations = locations
+		self.locationList = []
+		self.addPage()
+		self["city"] = Label(_("Location"))
+		self["province"] = Label(_("State/province"))
+		self["country"] = Label(_("Country"))
+		self["lat"] = Label(_("Lat"))
+		self["lon"] = Label(_("Lon"))
+		self["locationList"] = LocationList(list=self.locationList)
+		self["locationList"].onSelectionChanged.append(self.selectionChanged)
+		self["key_red"] = Button(_("Cancel"))
+		if len(self.locationList) > 0:
+			self["key_green"] = Button(_("Select"))
+
+	def addPage(self):
+		# list entries are only built for what can be scrolled to, a page at a time
+		for x in self.locations[len(self.locationList):len(self.locationList) + self.pageSize]:
+			province = x.province + (" (" + x.provincecode + ")" if x.provincecode else "")
+			country = x.country + (" (" + x.countrycode + ")" if x.countrycode else "")
+			lat = "{:.2f}".format(x.lat) if x.lat is not None else ""
+			lon = "{:.2f}".format(x.lon) if x.lon is not None else ""
+			self.locationList.append(LocationList.entry(x.id, x.name, province, country, lat, lon))
+
+	def selectionChanged(self):
+		index = self["locationList"].getSelectedIndex()
+		if len(self.locationList) < len(self.locations) and index >= len(self.locationList) - 5:
+			self.addPage()
+			self["locationList"].setList(self.locationList)
+			self["locationList"].moveToIndex(index)
+
+	def keyOk(self):
+		if self["locationList"].getCurrent() is None:
+			return
+		x = self.locations[self["locationList"].getSelectedIndex()]
+		if settings.locationid.value != x.id:
+			country = x.country + (" (" + x.countrycode + ")" if x.countrycode else "")
+			hasRain = x.countrycode in ("NL", "BE")
+			self.close(x.id, country, hasRain, x.name, str(x.lat), str(x.lon))
+		else:
+			self.close()
+
+	def keyCancel(self):
+		self.close()
+
+
+class SetupScreen(Screen, ConfigListScreen):
+
+	def __init__(self, session):
+		primarySkin = config.skin.primary_skin.value.split("/")[0]
+		if primarySkin == "PLi-FullNightHD" or primarySkin == "PLi-FullHD" or primarySkin == "Pd1loi-HD-night":
+			self.skin = """
+				<screen name=\"""" + PLUGIN_NAME + """Setup" position="fill" flags="wfNoBorder">
+					<panel name="PigTemplate"/>
+					<panel name="VKeyIconPanel"/>
+					<widget name="description" position="30,570" size="720,300" itemHeight="38" font="Regular;30" valign="top"/>
+					<panel name="ButtonRed"/>
+					<panel name="ButtonGreen"/>
+					<panel name="ButtonYellow"/>
+					<panel name="KeyOkTemplate"/>
+					<widget name="config" position="780,120" size="1109,855" font="Regular; 28" itemHeight="45" scrollbarMode="showOnDemand" />
+				</screen>"""
+		else:
+			self.skin = """
+				<screen name=\"""" + PLUGIN_NAME + """Setup" position="center,center" size="1110,715">
+					<widget name="description" position="21,551" size="1059,114" itemHeight="38" font="Regular;30" valign="top" />
+					<widget name="config" position="5,5" size="1100,540" font="Regular; 28" itemHeight="45" scrollbarMode="showOnDemand" />
+					<ePixmap pixmap="skin_default/buttons/key_ok.png" position="10,e-42" zPosition="0" size="35,25" transparent="1" alphatest="on" />
+					<ePixmap pixmap="skin_default/buttons/red.png" position="55,e-50" zPosition="0" size="140,40" transparent="1" alphatest="on" />
+					<ePixmap pixmap="skin_default/buttons/green.png" position="195,e-50" zPosition="0" size="140,40" transparent="1" alphatest="on" />
+					<widget name="key_red" position="55,e-50" zPosition="1" size="140,40" font="Regular; 20" valign="center" halign="center" backgroundColor="#9f1313" transparent="1" />
+					<widget name="key_green" position="195,e-50" zPosition="1" size="140,40" font="Regular; 20" valign="center" halign="center" backgroundColor="#1f771f" transparent="1" />
+					<ePixmap pixmap="skin_default/buttons/yellow.png" position="335,e-50" zPosition="0" size="140,40" transparent="1" alphatest="on" />
+					<widget name="key_yellow" position="335,e-50" zPosition="1" size="140,40" font="Regular; 20" valign="center" halign="center" backgroundColor="#a08500" transparent="1" />
+				</screen>"""
+		self.session = session
+		self.locationid = settings.locationid.value
+		self.hasRain = settings.hasRain.value
+		self.locationname = settings.locationname.value
+		self.locationlat = settings.locationlat.value
+		self.locationlon = settings.locationlon.value
+		self.watched = [list(x) for x in extraLocations()]
+		self.pinned = settings.pinnedlocation.value
+		Screen.__init__(self, session)
+		ConfigListScreen.__init__(self, [], session=session) #, on_change=self.changed)
+		self.skinName = PLUGIN_NAME + "Setup"
+		self.setTitle(_("InfoBarWeather %(version)s setup" % {"version": VERSION}))
+		self.onLayoutFinish.append(self.initConfiglist)
+		self.onClose.append(self.deinitConfig)
+		locationname = settings.locationname.value
+		if locationname is not None and locationname != '':
+			settings.locationname2.setCurrentText(locationname)
+		self.setWatchedText()
+		self.setPinnedChoices()
+		self["setupActions"] = ActionMap(["SetupActions", "ColorActions"], {
+			"red": self.keyCancel,
+			"green": self.keySave,
+			"yellow": self.keyStatistics,
+			"cancel": self.keyCancel,
+			"save": self.keySave,
+			"ok": self.keyOk,
+		}, -2)
+		self["key_red"] = Button(_("Cancel"))
+		self["key_green"] = Button(_("Save"))
+		self["key_yellow"] = Button(_("Statistics"))
+		self["description"] = Label("")
+		self["VirtualKB"].setEnabled(False)
+		self["VKeyIcon"] = Boolean(False)
+		self["HelpWindow"] = Pixmap()
+		self["HelpWindow"].hide()
+
+	def initConfiglist(self):
+		settings.enabled.addNotifier(self.buildConfiglist, initial_call=False)
+		settings.position.addNotifier(self.buildConfiglist, initial_call=False)
+		settings.showrain.addNotifier(self.buildConfiglist, initial_call=False)
+		settings.showrainforecast.addNotifier(self.buildConfiglist, initial_call=False)
+		settings.locationmode.addNotifier(self.buildConfiglist, initial_call=False)
+		self.buildConfiglist()
+
+	def deinitConfig(self):
+		settings.locationmode.removeNotifier(self.buildConfiglist)
+		settings.showrainforecast.removeNotifier(self.buildConfiglist)
+		settings.showrain.removeNotifier(self.buildConfiglist)
+		settings.position.removeNotifier(self.buildConfiglist)
+		settings.enabled.removeNotifier(self.buildConfiglist)
+
+	def buildConfiglist(self, configElement=None):
+		cfgList = [getConfigListEntry(_('Enabled'), settings.enabled)]
+		if settings.enabled.value:
+			cfgList.extend([
+				getConfigListEntry(_('Location'), settings.locationname2, _("Press OK to open location search.")),
+				getConfigListEntry(_('Display location as'), settings.displayas),
+				getConfigListEntry(_('Other locations'), settings.watchedlocations2, _("Press OK to add or remove other locations to show weather for.")),
+				getConfigListEntry(_('Weather provider'), settings.provider, _("Automatic uses the provider that has been the most reliable and fastest lately, and switches to another one when it fails.")),
+				getConfigListEntry(_('Forecast hours to keep'), settings.horizon, _("Fewer hours take less memory and are read faster from the downloaded forecast.")),
+				getConfigListEntry(_('Show weather for'), settings.locationmode, _("Always show one location, or show the next location each time the infobar is shown."))])
+			if settings.locationmode.value == "pin" and self.watched:
+				cfgList.append(getConfigListEntry(_('Location to show'), settings.pinnedlocation2, _("Only this location is downloaded and shown.")))
+			cfgList.extend([
+				getConfigListEntry(_('Position'), settings.position),
+				getConfigListEntry(_('Wind speed unit'), settings.windSpeedUnit, _("Display wind speed as BFT, m/s, km/h or mph.")),
+				getConfigListEntry(_('Temperature unit'), settings.temperatureUnit, _("Display temperature as °C or °F.")),
+				getConfigListEntry(_('Show location'), settings.showregio),
+				getConfigListEntry(_('Show last update time'), settings.showtime, _("Show last update time by weather service.")),
+				getConfigListEntry(_('Refresh in background'), settings.backgroundrefresh, _("Keep the weather up to date while the infobar is hidden, so it shows immediately.")),
+				getConfigListEntry(_('Keep showing weather while refreshing'), settings.keepstale, _("Show the previous values until new ones have been downloaded, instead of hiding them.")),
+				getConfigListEntry(_('Mark weather as outdated after'), settings.staleage, _("The last update time is dimmed when the shown values are older than this.")),
+				getConfigListEntry(_('Refresh at most every'), settings.refreshmin, _("Rain is refreshed this often while it rains nearby.")),
+				getConfigListEntry(_('Refresh at least every'), settings.refreshmax, _("Longest time between refreshes, e.g. at night or when the weather does not change.")),
+				getConfigListEntry(_('Show sunrise/sunset'), settings.showsunriseset),
+				getConfigListEntry(_('Show humidity'), settings.showhumidity),
+				getConfigListEntry(_('Show rain'), settings.showrain)])
+			if self.hasRain and settings.showrain.value:
+				cfgList.append(getConfigListEntry(_('Show rain forecast'), settings.showrainforecast, _("Show two hour rain forecast instead of rain probability (only available for The Netherlands and Belgium).")))
+				if settings.showrainforecast.value:
+					cfgList.append(getConfigListEntry(_('Draw rain forecast as'), settings.raingraph, _("A single graph is lighter, separate pixmaps work with skins that style each bar.")))
+			cfgList.extend([
+				getConfigListEntry(_('Show wind'), settings.showwind),
+				getConfigListEntry(_('Show icon'), settings.showicon),
+				getConfigListEntry(_('Show temperature'), settings.showtemperature),
+				getConfigListEntry(_('Show feel temperature'), settings.showfeeltemperature)])
+			if int(settings.position.value) != 1:
+				cfgList.extend([
+					getConfigListEntry(_('Show min/max temperature'), settings.showminmaxtemperature),
+					getConfigListEntry(_('Show UV index'), settings.showuvindex),
+					getConfigListEntry(_('Show sun power'), settings.showsunpower)])
+		self["config"].list = cfgList
+		self["config"].l.setList(cfgList)
+
+	def keyCancel(self):
+		ConfigListScreen.keyCancel(self)
+
+	def keySave(self):
+		settings.locationid.value = self.locationid
+		settings.locationid.save()
+		settings.hasRain.value = self.hasRain
+		settings.hasRain.save()
+		settings.locationname.value = self.locationname
+		settings.locationname.save()
+		settings.locationlat.value = self.locationlat
+		settings.locationlat.save()
+		settings.locationlon.value = self.locationlon
+		settings.locationlon.save()
+		settings.watchedlocations.value = json.dumps(self.watched)
+		settings.watchedlocations.save()
+		settings.pinnedlocation.value = int(settings.pinnedlocation2.value)
+		settings.pinnedlocation.save()
+		ConfigListScreen.keySave(self)
+		from .plugin import start, SETTINGSCHANGE
+		start(SETTINGSCHANGE, reason=1)
+		if settings.enabled.value:
+			start(SETTINGSCHANGE, reason=0)
+
+	def keyStatistics(self):
+		self.session.open(StatisticsScreen)
+
+	def keyOk(self):
+		sel = self["config"].getCurrent()[1]
+		if sel and sel == settings.locationname2:
+			self.session.openWithCallback(self.downloadLocations, VirtualKeyBoard, title=(_("Enter (part of) location to search for (e.g. \"Amsterdam\" or \"Ams\"):")))
+		elif sel and sel == settings.watchedlocations2:
+			self.session.openWithCallback(self.watchedLocationsScreenCB, WatchedLocationsScreen, self.watched)
+
+	def setWatchedText(self):
+		settings.watchedlocations2.setCurrentText(", ".join([x[1] for x in self.watched]) if self.watched else _("None"))
+
+	def setPinnedChoices(self):
+		# the main location (0, whichever location that is) or one of the other watched locations; keeps the selection
+		# unless that location was removed
+		choices = [("0", self.locationname or _("Main location"))] + [(str(x[0]), x[1]) for x in self.watched]
+		pinned = str(self.pinned)
+		if pinned not in [choice[0] for choice in choices]:
+			pinned = "0"
+		settings.pinnedlocation2.setChoices(choices, default=pinned)
+		settings.pinnedlocation2.value = pinned
+
+	def watchedLocationsScreenCB(self, watched):
+		self.watched = watched
+		self.setWatchedText()
+		self.pinned = int(settings.pinnedlocation2.value)
+		self.setPinnedChoices()
+		self.buildConfiglist()
+
+	def downloadLocations(self, searchterm):
+		if searchterm is None or searchterm == '':
+			return
+		self["config"].hide()
+		self["description"].hide()
+		locationSearch.search(searchterm).addCallbacks(self.downloadLocationsSuccessCB, self.downloadLocationsFailureCB)
+
+	def downloadLocationsSuccessCB(self, locations):
+		self.session.openWithCallback(self.selectLocationScreenCB, SelectLocationScreen, locations)
+		self["config"].show()
+		self["description"].show()
+
+	def downloadLocationsFailureCB(self, failure):
+		searchLocationsFailed(self.session, failure)
+		self["config"].show()
+		self["description"].show()
+
+	def selectLocationScreenCB(self, locationid=None, country=None, hasRain=None, locationname=None, locationlat=None, locationlon=None):
+		if locationid is not None:
+			self.locationid = locationid
+			self.country = country
+			self.hasRain = hasRain
+			self.locationname = locationname
+			self.locationlat = locationlat
+			self.locationlon = locationlon
+			settings.displayas.value = locationname
+			settings.locationname2.setCurrentText(locationname)
+			self.pinned = int(settings.pinnedlocation2.value)
+			self.setPinnedChoices()
+			self.buildConfiglist()
+
+
+class WatchedLocationsScreen(Screen):
+	# the locations besides the main one, refreshed together with it
+
+	skin = """
+		<screen name=\"""" + PLUGIN_NAME + """WatchedLocations" position="center,center" size="1110,715">
+			<widget name="locations" position="10,10" size="e-20,e-70" font="Regular; 28" itemHeight="45" scrollbarMode="showOnDemand" />
+			<ePixmap pixmap="skin_default/buttons/red.png" position="55,e-50" zPosition="0" size="140,40" transparent="1" alphatest="on" />
+			<ePixmap pixmap="skin_default/buttons/green.png" position="195,e-50" zPosition="0" size="140,40" transparent="1" alphatest="on" />
+			<widget name="key_red" position="55,e-50" zPosition="1" size="140,40" font="Regular; 20" valign="center" halign="center" backgroundColor="#9f1313" transparent="1" />
+			<widget name="key_green" position="195,e-50" zPosition="1" size="140,40" font="Regular; 20" valign="center" halign="center" backgroundColor="#1f771f" transparent="1" />
+		</screen>"""
+
+	def __init__(self, session, watched):
+		Screen.__init__(self, session)
+		self.skinName = PLUGIN_NAME + "WatchedLocations"
+		self.setTitle(_("Other locations"))
+		self.watched = list(watched)
+		self["actions"] = ActionMap(["SetupActions", "ColorActions"], {
+			"red": self.keyRemove,
+			"green": self.keyAdd,
+			"ok": self.keyClose,
+			"cancel": self.keyClose,
+		}, -2)
+		self["key_red"] = Button(_("Remove"))
+		self["key_green"] = Button(_("Add"))
+		self["locations"] = MenuList([])
+		self.buildList()
+
+	def buildList(self):
+		self["locations"].setList([x[1] for x in self.watched])
+
+	def keyRemove(self):
+		index = self["locations"].getSelectedIndex()
+		if 0 <= index < len(self.watched):
+			del self.watched[index]
+			self.buildList()
+
+	def keyAdd(self):
+		self.session.openWithCallback(self.searchLocations, VirtualKeyBoard, title=(_("Enter (part of) location to search for (e.g. \"Amsterdam\" or \"Ams\"):")))
+
+	def searchLocations(self, searchterm):
+		if searchterm is None or searchterm == '':
+			return
+		locationSearch.search(searchterm).addCallbacks(self.searchLocationsSuccessCB, self.searchLocationsFailureCB)
+
+	def searchLocationsSuccessCB(self, locations):
+		self.session.openWithCallback(self.selectLocationScreenCB, SelectLocationScreen, locations)
+
+	def searchLocationsFailureCB(self, failure):
+		searchLocationsFailed(self.session, failure)
+
+	def selectLocationScreenCB(self, locationid=None, country=None, hasRain=None, locationname=None, locationlat=None, locationlon=None):
+		if locationid is not None and locationid not in [x[0] for x in self.watched]:
+			self.watched.append([locationid, locationname, locationlat, locationlon, hasRain])
+			self.buildList()
+
+	def keyClose(self):
+		self.close(self.watched)
+
+
+class StatisticsScreen(Screen):
+
+	skin = """
+		<screen name=\"""" + PLUGIN_NAME + """Statistics" position="center,center" size="1110,715">
+			<widget name="statistics" position="10,10" size="e-20,e-70" font="Regular; 24" />
+			<ePixmap pixmap="skin_default/buttons/red.png" position="55,e-50" zPosition="0" size="140,40" transparent="1" alphatest="on" />
+			<widget name="key_red" position="55,e-50" zPosition="1" size="140,40" font="Regular; 20" valign="center" halign="center" backgroundColor="#9f1313" transparent="1" />
+		</screen>"""
+
+	def __init__(self, session):
+		Screen.__init__(self, session)
+		self.skinName = PLUGIN_NAME + "Statistics"
+		self.setTitle(_("InfoBarWeather statistics"))
+		self["actions"] = ActionMap(["SetupActions", "ColorActions", "DirectionActions"], {
+			"red": self.close,
+			"cancel": self.close,
+			"ok": self.close,
+			"up": self.pageUp,
+			"down": self.pageDown,
+			"left": self.pageUp,
+			"right": self.pageDown,
+		}, -2)
+		self["key_red"] = Button(_("Close"))
+		self["statistics"] = ScrollLabel(self.text())
+
+	def text(self):
+		# timings first, they tell a slow network (response, download) from a slow receiver (decompress, parse, render)
+		lines = []
+		for stage in sorted(stats.timings):
+			count, total, last, maximum = stats.timings[stage]
+			lines.append(_("%(stage)s: last %(last).3fs, average %(average).3fs, max %(max).3fs (%(count)d times)") % {"stage": stage, "last": last, "average": total / count, "max": maximum, "count": count})
+		if lines:
+			lines.append("")
+		for name in sorted(stats.counters):
+			lines.append("%s: %d" % (name, stats.counters[name]))
+		# then every url that has been tried: whether it is being downloaded now, and when it last worked
+		state = refreshCoordinator.state()
+		if state and lines:
+			lines.append("")
+		for url in sorted(state):
+			x = state[url]
+			line = url + ": " + (_("downloading") if x["inFlight"] else _("tried %d seconds ago") % x["lastAttempt"])
+			if x["lastSuccess"] is not None:
+				line += ", " + _("last success %d seconds ago") % x["lastSuccess"]
+			if x["failures"]:
+				line += ", " + _("%(failures)d failures, last: %(error)s") % {"failures": x["failures"], "error": x["lastError"]}
+			lines.append(line)
+		if not lines:
+			lines.append(_("Nothing has been downloaded yet."))
+		lines.extend(["", _("Also written to %s") % statsFile])
+		return "\n".join(lines)
+
+	def pageUp(self):
+		self["statistics"].pageUp()
+
+	def pageDown(self):
+		self["statistics"].pageDown()
@@ -0,0 +1,151 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+# the last parsed weather of every watched location, kept on flash so it can be shown right after a restart
+
+from .providers import Forecast, Hour
+from .rainseries import RainSeries
+
+import struct
+
+
+# file layout, all little endian:
+#   header: magic, version, time.time() when written, id of the shown location, number of locations
+#   per location: a sequence of tagged values (see Writer), the forecast and rain series being None if there are none
+MAGIC = b"IBWS"
+VERSION = 2
+header = struct.Struct("<4sHdiI")
+hourFields = ("time", "temperature", "feeltemperature", "humidity", "precipitation", "windspeedms", "beaufort", "winddirection", "iconcode", "sunpower")
+forecastFields = ("provider", "updated", "utcOffset", "mintemperature", "maxtemperature", "uvindex", "sunrise", "sunset")
+
+
+class Writer(object):
+	# values are a tag byte followed by the value: N(one), i(nt), d(ouble), s(tr), b(ytes)
+
+	def __init__(self):
+		self.chunks = []
+
+	def value(self, x):
+		if x is None:
+			self.chunks.append(b"N")
+		elif isinstance(x, bool) or isinstance(x, int):
+			self.chunks.append(struct.pack("<cq", b"i", x))
+		elif isinstance(x, float):
+			self.chunks.append(struct.pack("<cd", b"d", x))
+		else:
+			if not isinstance(x, bytes):
+				x = x.encode("utf-8")
+			self.chunks.append(struct.pack("<cI", b"s", len(x)) + x)
+
+	def blob(self, x):
+		self.chunks.append(struct.pack("<cI", b"b", len(x)) + x)
+
+	def data(self):
+		return b"".join(self.chunks)
+
+
+class Reader(object):
+
+	def __init__(self, data, offset):
+		self.data = data
+		self.offset = offset
+
+	def unpack(self, fmt):
+		values = struct.unpack_from(fmt, self.data, self.offset)
+		self.offset += struct.calcsize(fmt)
+		return values
+
+	def value(self):
+		tag = self.unpack("<c")[0]
+		if tag == b"N":
+			return None
+		if tag == b"i":
+			return int(self.unpack("<q")[0])
+		if tag == b"d":
+			return self.unpack("<d")[0]
+		if tag in (b"s", b"b"):
+			n = self.unpack("<I")[0]
+			x = self.data[self.offset:self.offset + n]
+			if len(x) != n:
+				raise ValueError("truncated snapshot")
+			self.offset += n
+			return x.decode("utf-8") if tag == b"s" and str is not bytes else x
+		raise ValueError("unknown tag %r at %d" % (tag, self.offset - 1))
+
+
+def read(path):
+	# the file's contents, None if there is none (yet)
+	try:
+		with open(path, "rb") as f:
+			return f.read()
+	except (IOError, OSError):
+		return None
+
+def dump(weatherData, savedAt, shown):
+	# weatherData: locationid -> object with forecast, forecastUrl, rain and rainUrl
+	w = Writer()
+	for locationid, data in sorted(weatherData.items()):
+		w.value(locationid)
+		w.value(data.forecastUrl)
+		f = data.forecast
+		if f is None:
+			w.value(None)
+		else:
+			w.value(len(f.hours))
+			for name in forecastFields:
+				w.value(getattr(f, name))
+			for hour in f.hours:
+				for name in hourFields:
+					w.value(getattr(hour, name))
+		w.value(data.rainUrl)
+		if data.rain is None:
+			w.value(None)
+		else:
+			w.value(len(data.rain))
+			w.blob(data.rain.intensities.tostring() if str is bytes else data.rain.intensities.tobytes())
+			w.blob(data.rain.times.tostring() if str is bytes else data.rain.times.tobytes())
+	return header.pack(MAGIC, VERSION, savedAt, shown, len(weatherData)) + w.data()
+
+def load(data, factory):
+	# returns (savedAt, shown, {locationid: factory() filled in}), raises ValueError on anything but a snapshot of
+	# this version
+	try:
+		magic, version, savedAt, shown, count = header.unpack_from(data, 0)
+	except struct.error:
+		raise ValueError("truncated snapshot")
+	if magic != MAGIC or version != VERSION:
+		raise ValueError("unsupported snapshot version")
+	r = Reader(data, header.size)
+	result = {}
+	try:
+		for i in range(count):
+			locationid = r.value()
+			item = factory()
+			item.forecastUrl = r.value()
+			n = r.value()
+			if n is not None:
+				fields = dict((name, r.value()) for name in forecastFields)
+				hours = []
+				for j in range(n):
+					hours.append(Hour(**dict((name, r.value()) for name in hourFields)))
+				item.forecast = Forecast(hours=hours, **fields)
+			item.rainUrl = r.value()
+			n = r.value()
+			if n is not None:
+				item.rain = RainSeries()
+				intensities, times = r.value(), r.value()
+				if str is bytes:
+					item.rain.intensities.fromstring(intensities)
+					item.rain.times.fromstring(times)
+				else:
+					item.rain.intensities.frombytes(intensities)
+					item.rain.times.frombytes(times)
+				if len(item.rain.intensities) != n or len(item.rain.times) != n:
+					raise ValueError("inconsistent rain series")
+			result[locationid] = item
+	except struct.error:
+		raise ValueError("truncated snapshot")
+	return savedAt, shown, result
@@ -0,0 +1,74 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+import os
+
+
+class Stats(object):
+	# counters and per-stage timings since the plugin was loaded, always on (unlike the benchmark), shown in the
+	# Statistics screen and flushed to a file in the Prometheus text format
+
+	def __init__(self, tag, path, prefix="infobarweather"):
+		self.tag = tag
+		self.path = path
+		self.prefix = prefix
+		self.counters = {} # name -> count
+		self.timings = {} # stage -> [count, total seconds, last seconds, max seconds]
+		self.dirty = False
+
+	def count(self, name, n=1):
+		self.counters[name] = self.counters.get(name, 0) + n
+		self.dirty = True
+
+	def time(self, stage, seconds):
+		timing = self.timings.get(stage)
+		if timing is None:
+			self.timings[stage] = [1, seconds, seconds, seconds]
+		else:
+			timing[0] += 1
+			timing[1] += seconds
+			timing[2] = seconds
+			timing[3] = max(timing[3], seconds)
+		self.dirty = True
+
+	def text(self):
+		lines = []
+		for name in sorted(self.counters):
+			metric = "%s_%s_total" % (self.prefix, name)
+			lines.append("# TYPE %s counter" % metric)
+			lines.append("%s %d" % (metric, self.counters[name]))
+		if self.timings:
+			metric = "%s_stage_seconds" % self.prefix
+			lines.append("# TYPE %s summary" % metric)
+			for stage in sorted(self.timings):
+				count, total = self.timings[stage][:2]
+				lines.append("%s_count{stage=\"%s\"} %d" % (metric, stage, count))
+				lines.append("%s_sum{stage=\"%s\"} %.6f" % (metric, stage, total))
+			for name, i in (("last", 2), ("max", 3)):
+				metric = "%s_stage_%s_seconds" % (self.prefix, name)
+				lines.append("# TYPE %s gauge" % metric)
+				for stage in sorted(self.timings):
+					lines.append("%s{stage=\"%s\"} %.6f" % (metric, stage, self.timings[stage][i]))
+		return "\n".join(lines) + "\n"
+
+	def pending(self):
+		# the text to write when anything changed since the last write, None otherwise
+		if not self.dirty:
+			return None
+		self.dirty = False
+		return self.text()
+
+	def write(self, text):
+		# only does file I/O, so it can run in a worker thread
+		try:
+			directory = os.path.dirname(self.path)
+			if not os.path.isdir(directory):
+				os.makedirs(directory)
+			with open(self.path + ".tmp", "w") as f:
+				f.write(text)
+			os.rename(self.path + ".tmp", self.path)
+		except (IOError, OSError) as e:
+			print("[%s] could not write %s: %s" % (self.tag, self.path, e))
@@ -0,0 +1,1001 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+from . import _, PLUGIN_PATH, PLUGIN_NAME
+from .benchmark import clock
+from .common import benchmark, iconStoreDir, jsonFile, rainFile, settings, skinCacheFile, snapshotFile, stats, TAG, tmpdir, VERSION, watchedLocations, writeDebugFile
+from .httpclient import HttpClient
+from .icons import IconManager
+from .providers import buienradar, compassPoints, providers
+from .rainseries import minutesNow, RainSeries
+from .refresh import monotonic, RefreshCoordinator, RefreshPolicy
+from . import snapshot
+from .worker import Superseded, Worker
+from Components.config import config
+from Components.Language import language
+from Components.Label import Label, MultiColorLabel
+from Components.Pixmap import MultiPixmap, Pixmap
+from enigma import eLabel, ePoint, eSize, eTimer, gFont
+from Screens.InfoBarGenerics import InfoBarEPG
+from Screens.Screen import Screen
+from Tools.BoundFunction import boundFunction
+from Tools.Directories import fileExists
+from twisted.internet import defer
+
+import json
+import os
+import sys
+import time
+import xml.etree.ElementTree
+
+
+class WeatherData(object):
+	# the last parsed downloads of one location, shared by all dialogs
+
+	def __init__(self):
+		self.forecast = None # providers.Forecast
+		self.forecastUrl = None
+		self.rain = None # RainSeries
+		self.rainUrl = None
+
+
+# these run in the worker thread and return (parsed data, seconds spent parsing); weatherData is only changed on the
+# main thread
+
+@benchmark.timed("parseForecast")
+def parseForecast(data, provider, horizon):
+	writeDebugFile(jsonFile, data)
+	started = clock()
+	forecast = provider.parse(data, horizon)
+	forecast.times() # converts the hour times here instead of on the first redraw
+	return forecast, clock() - started
+
+@benchmark.timed("parseRain")
+def parseRain(data):
+	writeDebugFile(rainFile, data)
+	started = clock()
+	return RainSeries.parse(data), clock() - started
+
+def writeFile(filename, data):
+	# atomic, so a restart while writing leaves the previous file
+	try:
+		directory = os.path.dirname(filename)
+		if not fileExists(directory):
+			os.mkdir(directory)
+		with open(filename + ".tmp", "wb" if isinstance(data, bytes) else "w") as f:
+			f.write(data)
+		os.rename(filename + ".tmp", filename)
+	except (IOError, OSError) as e:
+		print("[%s] could not write %s: %s" % (TAG, filename, e))
+
+
+weatherData = {} # locationid -> WeatherData, for every watched location
+compiledSkin = {} # see InfoBarWeather.initSkin
+httpClient = HttpClient(TAG, stats)
+iconManager = IconManager(TAG, httpClient, stats, PLUGIN_PATH + "/images/icons", iconStoreDir, maxAge=RefreshPolicy.iconTtl)
+refreshCoordinator = RefreshCoordinator()
+refreshPolicy = RefreshPolicy(lambda: (int(settings.refreshmin.value) * 60, int(settings.refreshmax.value) * 60))
+downloadSemaphore = defer.DeferredSemaphore(2) # downloads in flight, the connection pool keeps two connections per host
+worker = Worker(TAG, stats)
+
+extraImportPath = "/etc/enigma2"
+importPathModified = False
+if extraImportPath not in sys.path:
+	sys.path.insert(1, extraImportPath)
+	importPathModified = True
+try:
+	from infobarextra import InfoBarExtra
+except ImportError:
+	# for adding extra widgets, like room temperature:
+	# put class def between cut marks in /etc/enigma2/infobarextra.py (and add an empty __init__.py there as well)
+	# and modify at will
+	# -----8<-----8<-----8<-----8<-----8<-----8<-----8<-----8<-----8<-----8<-----
+	class InfoBarExtra(object):
+		def __init__(self, session):
+			pass # modify self.skin here
+		def timerCB(self):
+			pass # called every minute while infobar is shown, retrieve (use twisted.web or threads if doing I/O) and display values here
+		def onShowHideInfoBar(self, shown):
+			pass # retrieve (use twisted.web or threads if doing I/O) and display values here when shown == True
+		def onShowHideSecondInfoBar(self, shown):
+			pass
+	# -----8<-----8<-----8<-----8<-----8<-----8<-----8<-----8<-----8<-----8<-----
+if importPathModified:
+	del(sys.path[1])
+try:
+	from . import raingraph
+	from .raingraph import RainGraph
+except ImportError:
+	RainGraph = None # no canvas widget in this image, the rain forecast is drawn with MultiPixmaps
+
+
+class WeatherUpdater(object):
+	# downloads and parses forecast and rain data of all watched locations into weatherData, independent of the
+	# infobar being shown. every source (the forecast or rain forecast of a location) has its own freshness, but they
+	# are all checked on the same timer, so extra locations do not add wake-ups
+
+	refreshStarted = None # monotonic() of the start of the refresh whose forecast has not been shown yet
+	snapshotInterval = 15 * 60 # seconds between writes of the snapshot to flash
+
+	def __init__(self):
+		self.fetchRain = False # set by the dialog when its skin has rain widgets
+		self.urls = {} # source -> url it was last downloaded from
+		self.due = {} # source -> monotonic() when it needs downloading again
+		self.lastSuccess = {} # source -> monotonic() of its last successful download
+		self.restored = set() # sources shown from the snapshot until they are downloaded again
+		self.snapshotLoaded = False
+		self.snapshotDirty = False
+		self.nextSnapshot = 0 # monotonic()
+		self.shownLocation = 0 # id of the location the dialog shows, kept in the snapshot
+		self.onRefreshStarted = []
+		self.onForecast = []
+		self.onRain = []
+		self.timer = None
+
+	def startBackgroundRefresh(self):
+		if self.timer is None:
+			print("[%s] starting background refresh" % TAG)
+			self.timer = eTimer()
+			self.timer.callback.append(self.checkIfStale)
+			self.timer.start(60 * 1000)
+			self.checkIfStale()
+
+	def stopBackgroundRefresh(self):
+		if self.timer is not None:
+			print("[%s] stopping background refresh" % TAG)
+			self.timer.stop()
+			self.timer = None
+
+	@staticmethod
+	def forecastSource(locationid):
+		return "forecast:%d" % locationid
+
+	@staticmethod
+	def rainSource(locationid):
+		return "rain:%d" % locationid
+
+	def currentDownloads(self):
+		# (source, url, location, providers) for every watched location, providers being the forecast providers in
+		# the order to try them, or None for the rain forecast
+		downloads = []
+		for location in watchedLocations():
+			candidates = providers.ordered(location, settings.provider.value)
+			if candidates:
+				downloads.append((self.forecastSource(location.id), candidates[0].forecastUrl(location), location, candidates))
+			rainUrl = buienradar.rainUrl(location) if self.fetchRain else None
+			if rainUrl is not None:
+				downloads.append((self.rainSource(location.id), rainUrl, location, None))
+		return downloads
+
+	def currentUrls(self):
+		return [url for source, url, location, candidates in self.currentDownloads()]
+
+	def isDue(self, source, url):
+		# a source whose url changed (e.g. another provider is used now) is due immediately
+		return self.urls.get(source) != url or monotonic() >= self.due.get(source, 0)
+
+	def isRefreshing(self, source):
+		return source in self.urls and refreshCoordinator.isInFlight(self.urls[source])
+
+	def checkIfStale(self):
+		text = stats.pending() # called every minute while the infobar is shown or refreshing in the background
+		if text is not None:
+			worker.run(stats.write, text)
+		self.saveSnapshot()
+		downloads = self.currentDownloads()
+		sources = set([source for source, url, location, candidates in downloads])
+		for source in list(self.urls.keys()):
+			if source not in sources:
+				# no longer watched
+				del self.urls[source]
+				self.due.pop(source, None)
+				self.lastSuccess.pop(source, None)
+				self.restored.discard(source)
+		locationids = set([location.id for source, url, location, candidates in downloads])
+		for locationid in list(weatherData.keys()):
+			if locationid not in locationids:
+				del weatherData[locationid]
+		due = [x for x in downloads if self.isDue(x[0], x[1]) and not refreshCoordinator.isInFlight(x[1])]
+		if not due:
+			return
+		stats.count("refreshes")
+		if any(candidates is not None for source, url, location, candidates in due):
+			# only a forecast refresh replaces what the dialog shows, a rain refresh only touches the rain widgets
+			if self.refreshStarted is None:
+				self.refreshStarted = monotonic()
+			for f in self.onRefreshStarted:
+				f()
+		for source, url, location, candidates in due:
+			self.urls[source] = url
+			if candidates is not None:
+				self.fetchForecast(location, candidates)
+			else:
+				self.fetchRainForecast(location, url)
+
+	def fetch(self, url, cachedUrl):
+		print("[%s] downloading %s" % (TAG, url))
+		return refreshCoordinator.refresh(url, boundFunction(downloadSemaphore.run, httpClient.fetch, url, conditional=cachedUrl == url))
+
+	def fetchForecast(self, location, candidates):
+		url = candidates[0].forecastUrl(location)
+		data = weatherData.setdefault(location.id, WeatherData())
+		d = self.fetch(url, data.forecastUrl)
+		d.addCallbacks(self.downloadForecastCB, self.forecastFailedCB, callbackArgs=(location, candidates), errbackArgs=(location, candidates))
+		d.addErrback(self.downloadFailedCB, self.forecastSource(location.id), url)
+
+	def fetchRainForecast(self, location, url):
+		data = weatherData.setdefault(location.id, WeatherData())
+		source = self.rainSource(location.id)
+		self.fetch(url, data.rainUrl).addCallback(self.downloadRainCB, location.id).addErrback(self.downloadFailedCB, source, url)
+
+	def scheduleNextUpdate(self, source, ttl):
+		print("[%s] %s fresh for %d minutes" % (TAG, source, ttl // 60))
+		self.lastSuccess[source] = monotonic()
+		self.due[source] = monotonic() + ttl
+		self.restored.discard(source)
+		self.snapshotDirty = True
+
+	def scheduleRetry(self, source, url):
+		retryDelay = refreshCoordinator.retryDelay(url)
+		stats.count("retries")
+		print("[%s] retrying %s in %d seconds" % (TAG, url, retryDelay))
+		self.due[source] = monotonic() + retryDelay
+
+	def loadSnapshot(self):
+		# once, before anything is downloaded: the weather as it was last saved, shown as stale until it is refreshed
+		if self.snapshotLoaded:
+			return
+		self.snapshotLoaded = True
+		data = snapshot.read(snapshotFile)
+		if data is None:
+			return
+		started = clock()
+		try:
+			savedAt, self.shownLocation, restored = snapshot.load(data, WeatherData)
+		except ValueError as e:
+			print("[%s] ignoring %s: %s" % (TAG, snapshotFile, e))
+			return
+		locationids = set([location.id for location in watchedLocations()])
+		for locationid, item in restored.items():
+			if locationid in locationids and locationid not in weatherData:
+				weatherData[locationid] = item
+				if item.forecast is not None:
+					self.restored.add(self.forecastSource(locationid))
+				if item.rain is not None:
+					self.restored.add(self.rainSource(locationid))
+		stats.count("snapshot_loads")
+		stats.time("load_snapshot", clock() - started)
+		print("[%s] restored weather of %d locations saved %d minutes ago" % (TAG, len(weatherData), (time.time() - savedAt) // 60))
+
+	def saveSnapshot(self):
+		# at most every snapshotInterval, to spare the flash
+		if not self.snapshotDirty or monotonic() < self.nextSnapshot:
+			return
+		self.snapshotDirty = False
+		self.nextSnapshot = monotonic() + self.snapshotInterval
+		stats.count("snapshot_writes")
+		worker.run(writeFile, snapshotFile, snapshot.dump(weatherData, time.time(), self.shownLocation))
+
+	def notify(self, listeners, stage, locationid):
+		started = clock()
+		for f in listeners:
+			f(locationid)
+		if listeners:
+			stats.time(stage, clock() - started)
+		if listeners is self.onForecast and self.refreshStarted is not None:
+			# what the user waits for: from the start of the refresh until the new forecast is shown
+			stats.time("refresh", monotonic() - self.refreshStarted)
+			self.refreshStarted = None
+
+	def downloadFailedCB(self, failure, source, url):
+		print("[%s] error: %s" % (TAG, str(failure)))
+		stats.count("download_failures")
+		self.scheduleRetry(source, url)
+
+	def forecastFailedCB(self, failure, location, candidates):
+		print("[%s] error: %s" % (TAG, str(failure)))
+		stats.count("download_failures")
+		self.failover(location, candidates)
+
+	def failover(self, location, candidates):
+		provider = candidates[0]
+		providers.failure(provider)
+		stats.count("errors_" + provider.name)
+		if len(candidates) > 1:
+			print("[%s] %s failed, trying %s: %s" % (TAG, provider.name, candidates[1].name, providers.state()))
+			stats.count("failovers")
+			self.fetchForecast(location, candidates[1:])
+		else:
+			self.scheduleRetry(self.forecastSource(location.id), provider.forecastUrl(location))
+
+	def downloadForecastCB(self, result, location, candidates):
+		data = weatherData.setdefault(location.id, WeatherData())
+		if result.notModified and data.forecastUrl == result.url:
+			self.forecastParsedCB(None, result, location, candidates)
+			return
+		d = worker.runLatest(self.forecastSource(location.id), parseForecast, result.data, candidates[0], int(settings.horizon.value))
+		return d.addCallbacks(self.forecastParsedCB, self.forecastParseFailedCB, callbackArgs=(result, location, candidates), errbackArgs=(location, candidates))
+
+	def forecastParseFailedCB(self, failure, location, candidates):
+		if failure.check(Superseded):
+			return
+		if not failure.check(ValueError):
+			return failure
+		print("[%s] could not parse forecast from %s: %s" % (TAG, candidates[0].name, failure.getErrorMessage()))
+		stats.count("parse_failures")
+		self.failover(location, candidates)
+
+	def forecastParsedCB(self, parsed, result, location, candidates):
+		# parsed is None when the forecast was not modified
+		provider = candidates[0]
+		data = weatherData.setdefault(location.id, WeatherData())
+		shown = data.forecast.at() if data.forecast is not None else None
+		if parsed is not None:
+			data.forecast, seconds = parsed
+			data.forecastUrl = result.url
+			stats.time("parse_forecast", seconds)
+		response, body = httpClient.timings.get(result.url, (0, 0, 0))[:2]
+		providers.success(provider, response + body)
+		stats.time("latency_" + provider.name, response + body)
+		now = data.forecast.at()
+		self.urls[self.forecastSource(location.id)] = result.url # after a failover, the provider that answered
+		changed = shown is None or (shown.iconcode, shown.temperature, shown.precipitation) != (now.iconcode, now.temperature, now.precipitation)
+		self.scheduleNextUpdate(self.forecastSource(location.id), refreshPolicy.forecastTtl(result.lifetime, changed))
+		self.notify(self.onForecast, "render_forecast", location.id)
+
+	def rainTtl(self, rain):
+		minutes = minutesNow()
+		return refreshPolicy.rainTtl(rain.remaining(minutes) * 60, rain.raining(minutes))
+
+	def downloadRainCB(self, result, locationid):
+		data = weatherData.setdefault(locationid, WeatherData())
+		source = self.rainSource(locationid)
+		if result.notModified and data.rainUrl == result.url:
+			self.scheduleNextUpdate(source, self.rainTtl(data.rain))
+			self.notify(self.onRain, "render_rain", locationid)
+			return
+		d = worker.runLatest(source, parseRain, result.data)
+		return d.addCallbacks(self.rainParsedCB, self.rainParseFailedCB, callbackArgs=(result, locationid), errbackArgs=(result, locationid))
+
+	def rainParseFailedCB(self, failure, result, locationid):
+		if failure.check(Superseded):
+			return
+		if not failure.check(ValueError):
+			return failure
+		print("[%s] could not parse rain forecast: %s" % (TAG, failure.getErrorMessage()))
+		stats.count("parse_failures")
+		self.scheduleRetry(self.rainSource(locationid), result.url)
+
+	def rainParsedCB(self, parsed, result, locationid):
+		data = weatherData.setdefault(locationid, WeatherData())
+		data.rain, seconds = parsed
+		data.rainUrl = result.url
+		stats.time("parse_rain", seconds)
+		self.scheduleNextUpdate(self.rainSource(locationid), self.rainTtl(data.rain))
+		self.notify(self.onRain, "render_rain", locationid)
+
+
+weatherUpdater = WeatherUpdater()
+
+
+class InfoBarWeather(Screen, InfoBarExtra):
+
+	RAIN = 1
+	WEATHER = 2
+	REST = 4
+	ALL = RAIN | WEATHER | REST
+	hasRainWidget = False
+	windDirections = compassPoints
+	units = {"airpressure": " " + _("hPa"), "feeltemperature": "°", "groundtemperature": "°", "mintemperature": "°", "maxtemperature": "°", "humidity": "%", "precipitation": "%", "rainFallLast24Hour": " " + _("mm"), "rainFallLastHour": " " + _("mm"), "sunpower": " " + _("W/m²"), "temperature": "°", "visibility": " " + _("m"), "winddirectiondegrees": "°", "windgusts": " " + _("m/s"), "windspeedms": " " + _("m/s"), "beaufort": " " + _("BFT")}
+	infoBarBackground = None
+	secondInfoBarBackground = None
+	skinRevision = 3 # bump when buildSkin changes, to invalidate cached skins
+	pos = {
+		"notconfigured"            : ePoint(  10,  0),
+		"regio"                    : ePoint(  10,  0),
+		"time"                     : ePoint( 352,  0),
+		"sunrise"                  : ePoint( 442,  0),
+		"sunrisesetPixmap"         : ePoint( 530,  7),
+		"sunset"                   : ePoint( 587,  0),
+		"humidityPixmap"           : ePoint( 690,  7),
+		"humidity"                 : ePoint( 718,  0),
+		"precipitationPixmap"      : ePoint( 798,  7),
+		"rainWidgets"              : ePoint( 818,  1),
+		"precipitation"            : ePoint( 828,  0),
+		"zero"                     : ePoint( 812, 30),
+		"one"                      : ePoint( 836, 30),
+		"two"                      : ePoint( 860, 30),
+		"winddirectionMultiPixmap" : ePoint( 907,  7),
+		"beaufort"                 : ePoint( 940,  0),
+		"windspeedms"              : ePoint( 940,  0),
+		"weatherPixmap"            : ePoint(1057,  7),
+		"temperature"              : ePoint(1099,  0),
+		"feeltemperature"          : ePoint(1167,  0),
+		"minmaxtemperature"        : ePoint(1283,  0),
+		"uvindexPixmap"            : ePoint(1440,  5),
+		"uvindexLabel"             : ePoint(1433,  6),
+		"uvindex"                  : ePoint(1473,  0),
+		"sunpowerPixmap"           : ePoint(1530,  5),
+		"sunpower"                 : ePoint(1563,  0)
+	}
+
+	@benchmark.timed("dialog construction")
+	def __init__(self, session):
+		windSpeedUnit = int(settings.windSpeedUnit.value)
+		self.position = int(settings.position.value)
+		self.units["windspeedms"] = " " + _("km/h") if windSpeedUnit == 3 else (" " + _("mph") if windSpeedUnit == 4 else " " + _("m/s"))
+		self.primarySkin = config.skin.primary_skin.value.split("/")[0]
+		self.font = gFont("Regular", 26)
+		self.widgetVisible = {} # name -> visibility as last set on the widget
+		self.rendered = {} # (name, property) -> value as last set on the widget
+		self.iconcode = None
+		self.locations = watchedLocations() # settings can only change through SetupScreen, which recreates this dialog on save
+		self.locationIndex = 0
+		weatherUpdater.loadSnapshot()
+		for i, location in enumerate(self.locations):
+			if location.id == weatherUpdater.shownLocation:
+				self.locationIndex = i
+		skinName, skin, widgets = self.initSkin()
+		self.skin = skin
+		InfoBarExtra.__init__(self, session)
+		if self.skin != skin:
+			widgets = self.buildWidgetSpecs(self.skin) # InfoBarExtra modified the skin
+		Screen.__init__(self, session)
+		self.skinName = skinName
+		for name, widgetClass, text, hidden in widgets:
+			name = str(name)
+			if widgetClass == "RainGraph" and RainGraph is not None:
+				self[name] = RainGraph()
+			elif widgetClass == "MultiPixmap":
+				self[name] = MultiPixmap()
+			elif widgetClass == "Pixmap":
+				self[name] = Pixmap()
+			elif widgetClass == "MultiColorLabel":
+				self[name] = MultiColorLabel()
+			else:
+				self[name] = Label(_(str(text)))
+			if hidden:
+				self[name].hide()
+			self.widgetVisible[name] = not hidden
+			if "rainMultiPixmap" in name or name in ("rainGraph", "precipitation"):
+				self.hasRainWidget = True
+		self.infoBarBackground = self.get("infoBarBackground")
+		self.secondInfoBarBackground = self.get("secondInfoBarBackground")
+		self.initVisibilityTable()
+		self.showWidgets(self.ALL)
+		self.timer = eTimer()
+		self.timer.callback.append(self.timerCB)
+		weatherUpdater.fetchRain = self.hasRainWidget
+		weatherUpdater.onRefreshStarted.append(self.refreshStartedCB)
+		weatherUpdater.onForecast.append(self.forecastCB)
+		weatherUpdater.onRain.append(self.rainCB)
+		self.onClose.append(self.__onClose)
+		self.renderLocation() # already downloaded, e.g. before the settings were saved
+		if settings.backgroundrefresh.value:
+			weatherUpdater.startBackgroundRefresh()
+
+	def __onClose(self):
+		weatherUpdater.stopBackgroundRefresh()
+		weatherUpdater.onRefreshStarted.remove(self.refreshStartedCB)
+		weatherUpdater.onForecast.remove(self.forecastCB)
+		weatherUpdater.onRain.remove(self.rainCB)
+
+	@benchmark.timed("initSkin")
+	def initSkin(self):
+		# the compiled skin only depends on these inputs, so it is cached (also on flash) until one of them changes
+		key = [VERSION, self.skinRevision, PLUGIN_PATH, language.getLanguage(), self.primarySkin, self.locationNames(), settings.windSpeedUnit.value, self.units["sunpower"], self.position, self.rainGraph()]
+		key = json.loads(json.dumps(key)) # as it comes back from the cache file: on python 2 its str values become unicode
+		if compiledSkin.get("key") != key:
+			try:
+				with open(skinCacheFile, "r") as f:
+					compiledSkin.update(json.load(f))
+			except (IOError, ValueError):
+				pass
+		if compiledSkin.get("key") != key:
+			print("[%s] compiling skin" % TAG)
+			stats.count("skin_compiles")
+			skinName, skin = self.buildSkin(self.position - 1)
+			compiledSkin.clear()
+			compiledSkin.update({"key": key, "skinName": skinName, "skin": skin, "widgets": self.buildWidgetSpecs(skin)})
+			worker.run(writeFile, skinCacheFile, json.dumps(compiledSkin))
+			if settings.debugfiles.value:
+				# all three screens, for skinners to copy from
+				worker.run(writeDebugFile, tmpdir + "/skin.xml", "\n".join([self.buildSkin(i)[1] for i in range(0, 3)]).encode("utf-8"))
+		return str(compiledSkin["skinName"]), str(compiledSkin["skin"]), compiledSkin["widgets"]
+
+	def rainGraph(self):
+		return RainGraph is not None and settings.raingraph.value == "graph" and not self.skinHasRainPixmaps()
+
+	def skinHasRainPixmaps(self):
+		# a skin with its own version of our screen styles the rainMultiPixmap widgets, which the graph would not create
+		import skin
+		for name in (PLUGIN_NAME, PLUGIN_NAME + "Above", PLUGIN_NAME + "Top"):
+			screen = getattr(skin, "dom_screens", {}).get(name)
+			if screen is not None and screen[0].find(".//widget[@name='rainMultiPixmap0']") is not None:
+				return True
+		return False
+
+	def buildWidgetSpecs(self, skin):
+		windSpeedUnit = int(settings.windSpeedUnit.value)
+		widgets = [] # [name, widget class, untranslated initial text, hidden]
+		for item in xml.etree.ElementTree.fromstring(skin).findall('./widget'):
+			name = item.attrib["name"]
+			text = "a"
+			hidden = False
+			if name == "rainGraph":
+				widgetClass = "RainGraph"
+			elif "MultiPixmap" in name or "pixmaps" in item.attrib:
+				widgetClass = "MultiPixmap"
+			elif "Pixmap" in name or "pixmap" in item.attrib:
+				widgetClass = "Pixmap"
+			elif "foregroundColors" in item.attrib:
+				widgetClass = "MultiColorLabel"
+			else:
+				widgetClass = "Label"
+				if name == "uvindexLabel":
+					text = "UV"
+				elif name == "notconfigured":
+					text = "Please configure a location in plugin settings"
+				elif name in ("zero", "one", "two"):
+					text = str(("zero", "one", "two").index(name))
+				if (windSpeedUnit == 1 and name == "windspeedms") or (windSpeedUnit != 1 and name == "beaufort"):
+					hidden = True
+				if name in ("infoBarBackground", "secondInfoBarBackground", "notconfigured"):
+					hidden = True
+			widgets.append([name, widgetClass, text, hidden])
+		return widgets
+
+	@benchmark.timed("buildSkin")
+	def buildSkin(self, i):
+		secondInfoBarBackgroundColor = "#ff000000"
+		if self.primarySkin == "PLi-FullNightHD":
+			secondInfoBarBackgroundColor = "#2d101214"
+		elif self.primarySkin == "PLi-FullHD" or self.primarySkin == "Pd1loi-HD-night":
+			secondInfoBarBackgroundColor = "#54111112"
+		imageDir = "%s/images" % PLUGIN_PATH
+		windImageDir = imageDir + "/wind/"
+		rainImageDir = imageDir + "/rain/"
+		windPixmaps = ",".join([windImageDir + x + ".png" for x in self.windDirections])
+		rainShadowPixmaps = ",".join([rainImageDir + "s%d.png" % x for x in range(0, 30)])
+		rainPixmaps = ",".join([rainImageDir + "%d.png" % x for x in range(0, 30)])
+		locationnameWidth = max([eLabel.calculateTextSize(self.font, name, eSize(337, 45)).width() for name in self.locationNames()])
+		sunpowerWidth = eLabel.calculateTextSize(self.font, "119" + self.units["sunpower"], eSize(200, 45)).width()
+		width = self.pos["sunpower"].x() - self.pos["regio"].x() - 337 + locationnameWidth + sunpowerWidth
+		offsetX = int((1920 - width) / 2) - (337 - locationnameWidth) - 10  # 10?
+		offsetY = 0
+		if i == 1:
+			screenName = "%sAbove" % PLUGIN_NAME
+			position = "0,800"
+			size = "1920,51"
+			backgroundPixmap = "PLi-FullNightHD-background-above.png"
+		elif i == 2:
+			screenName = "%sTop" % PLUGIN_NAME
+			position = "0,0"
+			size = "1920,78"
+			offsetY = 6
+			backgroundPixmap = "PLi-FullNightHD-background-top.png"
+		else:
+			screenName = PLUGIN_NAME
+			position = "392,845"
+			if self.primarySkin == "Pd1loi-HD-night":
+				size = "1408,51"
+			else:
+				size = "1248,51"
+			offsetX = 0
+			backgroundPixmap = "PLi-FullNightHD-background.png"
+		startPosX = self.pos["rainWidgets"].x() + offsetX
+		if self.rainGraph():
+			rainShadowWidgets = ""
+			rainWidgets = "<widget name=\"rainGraph\" position=\"%d,%d\" size=\"%d,%d\" alphatest=\"blend\" />" % (startPosX, self.pos["rainWidgets"].y() + offsetY, 24 * raingraph.barWidth, raingraph.height)
+		else:
+			rainShadowWidgets = "\n\t\t".join(["<widget name=\"rainShadowMultiPixmap" + str(x) + "\" position=\"" + str(startPosX + 2 * x - 1) + "," + str(self.pos["rainWidgets"].y() + offsetY) + "\" size=\"1,31\" alphatest=\"blend\" pixmaps=\"%(rainShadowPixmaps)s\" />" % {"rainShadowPixmaps": rainShadowPixmaps} for x in range(0, 24)])
+			rainWidgets = "\n\t\t".join(["<widget name=\"rainMultiPixmap" + str(x) + "\" position=\"" + str(startPosX + 2 * x) + "," + str(self.pos["rainWidgets"].y() + offsetY) + "\" size=\"3,31\" alphatest=\"blend\" pixmaps=\"%(rainPixmaps)s\" />" % {"rainPixmaps": rainPixmaps} for x in range(0, 24)])
+		props = {
+			"screenName"                   : screenName,
+			"position"                     : position,
+			"size"                         : size,
+			"imageDir"                     : imageDir,
+			"backgroundPixmap"             : backgroundPixmap,
+			"windPixmaps"                  : windPixmaps,
+			"secondInfoBarBackgroundColor" : secondInfoBarBackgroundColor,
+			"rainShadowWidgets"            : rainShadowWidgets,
+			"rainWidgets"                  : rainWidgets
+		}
+		for k, v in self.pos.items():
+			props["%sXpos" % k] = v.x() + offsetX
+			props["%sYpos" % k] = v.y() + offsetY
+		return screenName, """	<screen name="%(screenName)s" position="%(position)s" size="%(size)s" backgroundColor="#ff000000" zPosition="2" flags="wfNoBorder">
+		<!-- SKINNERS: enable at most one of the following two lines -->
+		<!--<widget name="infoBarBackground" position="0,0" size="%(size)s" zPosition="-1" backgroundColor="#ff000000" />-->
+		<widget name="infoBarBackground" position="0,0" size="%(size)s" zPosition="-1" alphatest="off" pixmap="%(imageDir)s/%(backgroundPixmap)s" />
+
+		<!-- SKINNERS: enable at most one of the following two lines -->
+		<widget name="secondInfoBarBackground" position="0,0" size="%(size)s" zPosition="-1" backgroundColor="%(secondInfoBarBackgroundColor)s" />
+		<!--<widget name="secondInfoBarBackground" position="0,0" size="%(size)s" zPosition="-1" alphatest="off" pixmap="" />-->
+
+		<widget name="notconfigured" position="%(notconfiguredXpos)s,%(notconfiguredYpos)s" size="1096,45" borderWidth="1" valign="center" halign="center" foregroundColor="#00B6B6B6" backgroundColor="#18101214" font="Regular; 26" transparent="1" />
+		<widget name="regio" position="%(regioXpos)s,%(regioYpos)s" size="337,45" borderWidth="1" valign="center" halign="right" foregroundColor="#00B6B6B6" backgroundColor="#18101214" font="Regular; 26" transparent="1" />
+		<widget name="time" position="%(timeXpos)s,%(timeYpos)s" size="70,45" borderWidth="1" valign="center" halign="left" foregroundColors="#00B6B6B6,#00606060" backgroundColor="#18101214" font="Regular; 26" transparent="1" />
+		<widget name="sunrise" position="%(sunriseXpos)s,%(sunriseYpos)s" size="80,45" borderWidth="1" valign="center" halign="right" foregroundColor="#00B6B6B6" backgroundColor="#18101214" font="Regular; 26" transparent="1" />
+		<widget name="sunrisesetPixmap" position="%(sunrisesetPixmapXpos)s,%(sunrisesetPixmapYpos)s" size="50,30" alphatest="blend" pixmap="%(imageDir)s/sunriseset.png" />
+		<widget name="sunset" position="%(sunsetXpos)s,%(sunsetYpos)s" size="80,45" borderWidth="1" valign="center" halign="left" foregroundColor="#00B6B6B6" backgroundColor="#18101214" font="Regular; 26" transparent="1" />
+		<widget name="humidityPixmap" position="%(humidityPixmapXpos)s,%(humidityPixmapYpos)s" size="30,30" alphatest="blend" pixmap="%(imageDir)s/droplet.png" />
+		<widget name="humidity" position="%(humidityXpos)s,%(humidityYpos)s" size="80,45" borderWidth="1" valign="center" halign="left" foregroundColor="#00B6B6B6" backgroundColor="#18101214" font="Regular; 26" transparent="1" />
+		%(rainShadowWidgets)s
+		%(rainWidgets)s
+		<widget name="zero" position="%(zeroXpos)s,%(zeroYpos)s" size="12,14" borderWidth="1" valign="top" halign="center" foregroundColor="#00B6B6B6" backgroundColor="#18101214" font="Regular; 11" transparent="1" />
+		<widget name="one" position="%(oneXpos)s,%(oneYpos)s" size="12,14" borderWidth="1" valign="top" halign="center" foregroundColor="#00B6B6B6" backgroundColor="#18101214" font="Regular; 11" transparent="1" />
+		<widget name="two" position="%(twoXpos)s,%(twoYpos)s" size="12,14" borderWidth="1" valign="top" halign="center" foregroundColor="#00B6B6B6" backgroundColor="#18101214" font="Regular; 11" transparent="1" />
+		<widget name="winddirectionMultiPixmap" position="%(winddirectionMultiPixmapXpos)s,%(winddirectionMultiPixmapYpos)s" size="30,30" alphatest="blend" pixmaps="%(windPixmaps)s" />
+		<widget name="beaufort" position="%(beaufortXpos)s,%(beaufortYpos)s" size="112,45" borderWidth="1" valign="center" halign="left" foregroundColor="#00B6B6B6" backgroundColor="#18101214" font="Regular; 26" transparent="1" />
+		<widget name="windspeedms" position="%(windspeedmsXpos)s,%(windspeedmsYpos)s" size="200,45" borderWidth="1" valign="center" halign="left" foregroundColor="#00B6B6B6" backgroundColor="#18101214" font="Regular; 26" transparent="1" />
+		<widget name="precipitationPixmap" position="%(precipitationPixmapXpos)s,%(precipitationPixmapYpos)s" size="30,30" alphatest="blend" pixmap="%(imageDir)s/rain.png" />
+		<widget name="precipitation" position="%(precipitationXpos)s,%(precipitationYpos)s" size="200,45" borderWidth="1" valign="center" halign="left" foregroundColor="#00B6B6B6" backgroundColor="#18101214" font="Regular; 26" transparent="1" />
+		<widget name="weatherPixmap" position="%(weatherPixmapXpos)s,%(weatherPixmapYpos)s" size="30,30" alphatest="blend" />
+		<widget name="temperature" position="%(temperatureXpos)s,%(temperatureYpos)s" size="80,45" borderWidth="1" valign="center" halign="right" foregroundColor="#00B6B6B6" backgroundColor="#18101214" font="Regular; 26" transparent="1" />
+		<widget name="feeltemperature" position="%(feeltemperatureXpos)s,%(feeltemperatureYpos)s" size="80,45" borderWidth="1" valign="center" halign="right" foregroundColors="#00B6B6B6,#29abe2,#ff5555" backgroundColor="#18101214" font="Regular; 26" transparent="1" />
+		<widget name="minmaxtemperature" position="%(minmaxtemperatureXpos)s,%(minmaxtemperatureYpos)s" size="256,45" borderWidth="1" valign="center" halign="left" foregroundColor="#00B6B6B6" backgroundColor="#18101214" font="Regular; 26" transparent="1" />
+		<widget name="uvindexPixmap" position="%(uvindexPixmapXpos)s,%(uvindexPixmapYpos)s" size="30,16" alphatest="blend" pixmap="%(imageDir)s/uv.png" />
+		<widget name="uvindexLabel" position="%(uvindexLabelXpos)s,%(uvindexLabelYpos)s" size="45,45" borderWidth="1" valign="center" halign="center" foregroundColor="#00B6B6B6" backgroundColor="#18101214" font="Regular; 15" transparent="1" />
+		<widget name="uvindex" position="%(uvindexXpos)s,%(uvindexYpos)s" size="200,45" borderWidth="1" valign="center" halign="left" foregroundColors="#B6B6B6,#3ea72d,#fff300,#f18b00,#ff5555,#b567a4" backgroundColor="#18101214" font="Regular; 26" transparent="1" />
+		<widget name="sunpowerPixmap" position="%(sunpowerPixmapXpos)s,%(sunpowerPixmapYpos)s" size="30,30" alphatest="blend" pixmap="%(imageDir)s/sunpower.png" />
+		<widget name="sunpower" position="%(sunpowerXpos)s,%(sunpowerYpos)s" size="200,45" borderWidth="1" valign="center" halign="left" foregroundColors="#B6B6B6,#3ea72d,#fff300,#f18b00,#ff5555,#b567a4" backgroundColor="#18101214" font="Regular; 26" transparent="1" />
+	</screen>
+""" % props
+
+	def timerCB(self):
+		self.checkIfStale()
+		self.updateUI() # advances the shown weather to the current time
+		self.updateRainUI()
+		self.updateStaleness()
+		InfoBarExtra.timerCB(self)
+
+	def locationNames(self):
+		# the regio widget is sized for the longest of these
+		return [x.name for x in self.locations] or [settings.locationname.value]
+
+	def location(self):
+		return self.locations[self.locationIndex] if self.locations else None
+
+	def data(self):
+		location = self.location()
+		return weatherData.get(location.id) if location is not None else None
+
+	def hasData(self):
+		data = self.data()
+		return data is not None and data.forecastUrl is not None and data.forecastUrl in weatherUpdater.currentUrls()
+
+	def isCurrentLocation(self, locationid):
+		location = self.location()
+		return location is not None and location.id == locationid
+
+	def forecastCB(self, locationid):
+		if self.isCurrentLocation(locationid):
+			self.updateUI()
+
+	def rainCB(self, locationid):
+		if self.isCurrentLocation(locationid):
+			self.updateRainUI()
+
+	def renderLocation(self):
+		# only renders what has already been downloaded, so switching locations is instant and costs no download
+		data = self.data()
+		if data is None or data.forecast is None:
+			self.hideWidgets(self.ALL)
+			return
+		self.updateUI()
+		if data.rain is not None and data.rainUrl in weatherUpdater.currentUrls():
+			self.updateRainUI()
+
+	def showLocation(self, index):
+		if index == self.locationIndex:
+			return
+		self.hideWidgets(self.RAIN) # which rain widgets are visible depends on the location
+		self.locationIndex = index
+		weatherUpdater.shownLocation = self.location().id
+		self.visibilityTable = self.visibilityTables[self.location().hasRain]
+		self.renderLocation()
+
+	def showNextLocation(self):
+		if len(self.locations) > 1:
+			self.showLocation((self.locationIndex + 1) % len(self.locations))
+
+	def updateStaleness(self):
+		# dim the update time when the shown data is older than the configured age
+		location = self.location()
+		if "time" not in self or not isinstance(self["time"], MultiColorLabel) or location is None:
+			return
+		source = weatherUpdater.forecastSource(location.id)
+		if source in weatherUpdater.restored:
+			stale = True
+		elif source in weatherUpdater.lastSuccess:
+			stale = monotonic() - weatherUpdater.lastSuccess[source] > int(settings.staleage.value) * 60 and not weatherUpdater.isRefreshing(source)
+		else:
+			return
+		self.renderColorNum("time", 1 if stale else 0)
+
+	@benchmark.timed("updateRainUI")
+	def updateRainUI(self):
+		data = self.data()
+		if data is None or data.rain is None:
+			return
+		pixmapNums = data.rain.pixmapNums(24, data.rain.index(minutesNow()))
+		if "rainGraph" in self:
+			graph = self["rainGraph"]
+			self.render("rainGraph", "levels", pixmapNums, graph.setLevels)
+			stats.count("rain_graph_fills", graph.fills)
+			graph.fills = 0
+		else:
+			for i, pixmapNum in enumerate(pixmapNums):
+				try:
+					name = "rainMultiPixmap" + str(i)
+					self.renderPixmapNum(name, min(pixmapNum, len(self[name].pixmaps) - 1))
+					name = "rainShadowMultiPixmap" + str(i)
+					self.renderPixmapNum(name, min(pixmapNum, len(self[name].pixmaps) - 1))
+				except KeyError:
+					pass  # some skinner removed the widget
+		self.showWidgets(self.RAIN)
+
+	def iconCB(self, pixmap, iconcode):
+		if iconcode != self.iconcode:
+			return # a newer forecast arrived while this icon was downloading
+		self.renderPixmap("weatherPixmap", iconcode, pixmap)
+		self.showWidgets(self.WEATHER)
+
+	def iconFailedCB(self, failure):
+		self.setWidgetVisible("weatherPixmap", False)
+		self.errback(failure)
+
+	def render(self, name, prop, value, apply):
+		# only call into enigma when the value differs from what the widget already shows
+		key = (name, prop)
+		if key in self.rendered and self.rendered[key] == value:
+			stats.count("widget_updates_skipped")
+			return
+		apply(value)
+		self.rendered[key] = value
+		stats.count("widget_updates_applied")
+
+	def renderText(self, name, text):
+		self.render(name, "text", text, self[name].setText)
+
+	def renderColorNum(self, name, num):
+		self.render(name, "color", num, self[name].setForegroundColorNum)
+
+	def renderPixmapNum(self, name, num):
+		self.render(name, "pixmap", num, self[name].setPixmapNum)
+
+	def renderPixmap(self, name, key, pixmap):
+		self.render(name, "pixmapkey", key, lambda key: self[name].instance.setPixmap(pixmap))
+
+	def initVisibilityTable(self):
+		# settings can only change through SetupScreen, which recreates this dialog on save
+		self.visibilityTables = {}
+		for hasRain in (False, True):
+			self.visibilityTables[hasRain] = self.buildVisibilityTable(hasRain)
+		location = self.location()
+		self.visibilityTable = self.visibilityTables[location is not None and location.hasRain]
+
+	def buildVisibilityTable(self, hasRain):
+		windSpeedUnit = int(settings.windSpeedUnit.value)
+		position = int(settings.position.value)
+		members = {self.RAIN: set(), self.WEATHER: set(), self.REST: set()} # widgets per group
+		visible = {self.RAIN: set(), self.WEATHER: set(), self.REST: set()} # members to show when shown
+		for x in self.widgetVisible:
+			if "rainMultiPixmap" in x or "rainShadowMultiPixmap" in x or x in ("rainGraph", "zero", "one", "two"):
+				members[self.RAIN].add(x)
+				if settings.showrain.value and settings.showrainforecast.value and hasRain:
+					visible[self.RAIN].add(x)
+			elif "precipitation" in x:
+				members[self.RAIN].add(x)
+				if settings.showrain.value and (not hasRain or not settings.showrainforecast.value):
+					visible[self.RAIN].add(x)
+			elif x == "weatherPixmap":
+				members[self.WEATHER].add(x)
+				if settings.showicon.value:
+					visible[self.WEATHER].add(x)
+			elif "nfoBarBackground" not in x and x != "notconfigured":
+				members[self.REST].add(x)
+				if x == 'sunrise' or x == 'sunset' or x == 'sunrisesetPixmap':
+					attr = 'showsunriseset'
+				elif x == 'humidity' or x == 'humidityPixmap':
+					attr = 'showhumidity'
+				elif x == 'windspeedms' or x == 'beaufort' or x == 'winddirectionMultiPixmap':
+					attr = 'showwind'
+				elif x == 'uvindexPixmap' or x == "uvindexLabel":
+					attr = 'showuvindex'
+				elif x == 'sunpowerPixmap':
+					attr = 'showsunpower'
+				else:
+					attr = 'show' + x
+				if not hasattr(settings, attr) or not getattr(settings, attr).value:
+					continue
+				if (windSpeedUnit == 1 and x == "windspeedms") or (windSpeedUnit != 1 and x == "beaufort"):
+					continue
+				if (x == "minmaxtemperature" or x.startswith("uvindex") or x.startswith("sunpower")) and position == 1:
+					continue
+				visible[self.REST].add(x)
+		visibilityTable = []
+		for what in range(0, self.ALL + 1):
+			m = set()
+			v = set()
+			for group in (self.RAIN, self.WEATHER, self.REST):
+				if what & group:
+					m |= members[group]
+					v |= visible[group]
+			visibilityTable.append((m, v))
+		return visibilityTable
+
+	def setWidgetVisible(self, name, visible):
+		if self.widgetVisible.get(name) != visible:
+			self.widgetVisible[name] = visible
+			if visible:
+				self[name].show()
+			else:
+				self[name].hide()
+
+	def hideOrShowWidgets(self, how, what):
+		start = clock()
+		members, visible = self.visibilityTable[what]
+		for x in members:
+			self.setWidgetVisible(x, how and x in visible)
+		if benchmark.enabled:
+			benchmark.record("hideOrShowWidgets(%s, %d)" % (how, what), clock() - start)
+
+	def hideWidgets(self, what):
+		self.hideOrShowWidgets(False, what)
+
+	def showWidgets(self, what):
+		self.hideOrShowWidgets(True, what)
+
+	def errback(self, failure):
+		print("[%s] error: %s" % (TAG, str(failure)))
+
+	@benchmark.timed("updateUI")
+	def updateUI(self):
+		data = self.data()
+		f = data.forecast if data is not None else None
+		if f is None:
+			return
+
+		d = f.at()
+
+		self.beaufort        = d.beaufort
+		self.windspeedms     = d.windspeedms
+		self.temperature     = d.temperature
+		self.feeltemperature = d.feeltemperature
+
+		windSpeedUnit   = int(settings.windSpeedUnit.value)
+		temperatureUnit = int(settings.temperatureUnit.value)
+		def temperature(t):
+			return round(t * 1.8 + 32, 1) if temperatureUnit == 2 and t is not None else t
+		x = {}
+		x['regio']             = self.location().name
+		x['temperature']       = temperature(d.temperature)
+		x['feeltemperature']   = temperature(d.feeltemperature)
+		if f.mintemperature is not None and f.maxtemperature is not None:
+			x['minmaxtemperature'] = "%s%s - %s%s" % (temperature(f.mintemperature), self.units["mintemperature"], temperature(f.maxtemperature), self.units["maxtemperature"])
+		x['beaufort']          = d.beaufort
+		if d.windspeedms is not None:
+			x['windspeedms']   = int(round(d.windspeedms)) if windSpeedUnit == 2 else (int(round(d.windspeedms * 3.6)) if windSpeedUnit == 3 else int(round(d.windspeedms * 2.236936)))
+		x['humidity']          = d.humidity
+		x['precipitation']     = d.precipitation
+		x['uvindex']           = f.uvindex
+		x['sunpower']          = d.sunpower
+		x['sunrise']           = f.sunrise
+		x['sunset']            = f.sunset
+		x['time']              = f.updated
+		x = dict((k, v) for k, v in x.items() if v is not None) # not every provider has every field
+
+		if "weatherPixmap" in self and d.iconcode:
+			self.iconcode = d.iconcode
+			iconManager.get(self.iconcode).addCallbacks(self.iconCB, self.iconFailedCB, callbackArgs=(self.iconcode,))
+			iconManager.warm([f.at(3600).iconcode]) # next hour
+		if "winddirectionMultiPixmap" in self and d.winddirection is not None:
+			self.renderPixmapNum("winddirectionMultiPixmap", d.winddirection)
+		for y in x:
+			if y in self:
+				try:
+					unit = self.units[y]
+				except KeyError:
+					unit = ""
+				cur_val = str(x[y])
+				if y in ["humidity", "rainFallLastHour", "sunpower"]:
+					cur_val = str(int(round(float(cur_val))))
+				cur_val += unit
+				self.renderText(y, cur_val)
+				if y == "feeltemperature" and "temperature" in x:
+					if float(x[y]) > float(x["temperature"]):
+						self.renderColorNum(y, 2)
+					elif float(x[y]) < float(x["temperature"]):
+						self.renderColorNum(y, 1)
+					else:
+						self.renderColorNum(y, 0)
+				if y == "uvindex":
+					uv = x[y]
+					if uv == 0:
+						self.renderColorNum(y, 0)
+					elif uv <= 2:
+						self.renderColorNum(y, 1)
+					elif uv <= 5:
+						self.renderColorNum(y, 2)
+					elif uv <= 7:
+						self.renderColorNum(y, 3)
+					elif uv <= 10:
+						self.renderColorNum(y, 4)
+					else:
+						self.renderColorNum(y, 5)
+		if self.hasRainWidget and not self.location().hasRain:
+			self.showWidgets(self.RAIN)
+		self.showWidgets(self.REST)
+		self.updateStaleness()
+		if settings.debugfiles.value or benchmark.enabled:
+			print("[%s] render: %d applied, %d skipped" % (TAG, stats.counters.get("widget_updates_applied", 0), stats.counters.get("widget_updates_skipped", 0)))
+
+	def checkIfStale(self):
+		if settings.locationid.value == 0:
+			self.hideWidgets(self.ALL)
+			self.setWidgetVisible("notconfigured", True)
+			return
+		weatherUpdater.checkIfStale()
+
+	def refreshStartedCB(self):
+		# keep showing the previous values while refreshing, unless there are none (for this location)
+		if not self.hasData() or not (settings.keepstale.value or settings.backgroundrefresh.value or weatherUpdater.forecastSource(self.location().id) in weatherUpdater.restored):
+			self.hideWidgets(self.ALL)
+
+	def _onShowInfoBar(self, parent):
+		if isinstance(parent, InfoBarEPG):
+			self.show()
+			self.onShowHideInfoBar(True)
+
+	def _onHideInfoBar(self):
+		if self.shown:
+			self.hide()
+			self.onShowHideInfoBar(False)
+
+	def _onShowSecondInfoBar(self):
+		if self.position != 1 and self.shown:
+			self.hide()
+		else:
+			self.onShowHideSecondInfoBar(True)
+
+	def _onHideSecondInfoBar(self):
+		if self.position != 1 and not self.shown:
+			self.show()
+		else:
+			self.onShowHideSecondInfoBar(False)
+
+	def onShowHideInfoBar(self, shown):
+		if not settings.enabled.value:
+			return
+		print("[%s] onShowHideInfoBar(%s)" % (TAG, str(shown)))
+		if (shown):
+			self.updateUI()
+			self.updateRainUI()
+			self.checkIfStale()
+			if self.infoBarBackground:
+				self.setWidgetVisible("infoBarBackground", True)
+			if self.secondInfoBarBackground:
+				self.setWidgetVisible("secondInfoBarBackground", False)
+			self.timer.start(60 * 1000)
+		else:
+			self.timer.stop()
+			if settings.locationmode.value == "cycle":
+				self.showNextLocation() # rendered while hidden, so it is there when the infobar is shown next
+			benchmark.save()
+		InfoBarExtra.onShowHideInfoBar(self, shown)
+
+	def onShowHideSecondInfoBar(self, shown):
+		if not settings.enabled.value:
+			return
+		print("[%s] onShowHideSecondInfoBar(%s)" % (TAG, str(shown)))
+		if (shown):
+			if self.infoBarBackground:
+				self.setWidgetVisible("infoBarBackground", False)
+			if self.secondInfoBarBackground:
+				self.setWidgetVisible("secondInfoBarBackground", True)
+		InfoBarExtra.onShowHideSecondInfoBar(self, shown)
@@ -0,0 +1,50 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+from twisted.internet import defer, threads
+
+
+class Superseded(Exception):
+	# the job was dropped because a newer one for the same key was started
+	pass
+
+
+class Worker(object):
+	# runs blocking work (parsing, disk access) in a thread, a bounded number of jobs at a time, so the main loop keeps
+	# handling remote control input and drawing; results are delivered on the main thread
+
+	def __init__(self, tag, stats, size=1):
+		self.tag = tag
+		self.stats = stats
+		self.semaphore = defer.DeferredSemaphore(size)
+		self.latest = {} # key -> number of the last job started for it
+
+	def run(self, f, *args):
+		return self.semaphore.run(threads.deferToThread, f, *args)
+
+	def runLatest(self, key, f, *args):
+		# like run, but a newer job for key supersedes this one: if it has not started yet it is not run at all,
+		# otherwise its result is dropped. either way the Deferred fails with Superseded
+		n = self.latest.get(key, 0) + 1
+		self.latest[key] = n
+
+		def start():
+			if self.latest.get(key) != n:
+				return defer.fail(Superseded(key))
+			return threads.deferToThread(f, *args)
+
+		def done(result):
+			if self.latest.get(key) != n:
+				raise Superseded(key)
+			return result
+
+		def superseded(failure):
+			failure.trap(Superseded)
+			print("[%s] dropped %s, superseded by a newer job" % (self.tag, key))
+			self.stats.count("worker_superseded")
+			return failure
+
+		return self.semaphore.run(start).addCallback(done).addErrback(superseded)
@@ -0,0 +1,125 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+# the plugin's hot paths timed headless against the fixtures, saved per plugin version like the receiver's benchmarks:
+#   python -m tests.bench [-n repeat] [results.json]
+
+from . import harness
+
+import os
+import subprocess
+import sys
+
+
+class Quiet(object):
+	# the plugin prints a line for most steps, which would be timed as well
+
+	def write(self, text):
+		pass
+
+	def flush(self):
+		pass
+
+
+def importTime(module):
+	# in a fresh interpreter, like the first import on a receiver
+	code = "import tests.harness; from plugin.benchmark import clock; t = clock(); import %s; print(repr(clock() - t))" % module
+	output = subprocess.check_output([sys.executable, "-c", code], cwd=os.path.dirname(harness.testsDir))
+	return float(output.decode("ascii").strip().splitlines()[-1])
+
+
+def run(results, repeat):
+	from plugin import common, weather
+	from plugin.benchmark import clock
+	from plugin.common import watchedLocations
+	from plugin.httpclient import FetchResult
+	from plugin.providers import providers
+	from plugin.rainseries import RainSeries
+
+	def timed(name, f, *args):
+		start = clock()
+		result = f(*args)
+		results.record(name, clock() - start)
+		return result
+
+	for module in ("plugin.plugin", "plugin.weather"):
+		for i in range(repeat):
+			results.record("import " + module, importTime(module))
+
+	harness.configure()
+	location = watchedLocations()[0]
+	session = harness.Session()
+	harness.reset()
+	dialog = weather.InfoBarWeather(session)
+	for i in range(repeat):
+		weather.compiledSkin.clear()
+		os.remove(common.skinCacheFile)
+		timed("initSkin compile", dialog.initSkin)
+		weather.compiledSkin.clear()
+		timed("initSkin from file", dialog.initSkin)
+		timed("initSkin from memory", dialog.initSkin)
+	dialog.close()
+
+	for i in range(repeat):
+		timed("dialog construction", weather.InfoBarWeather, session).close()
+
+	dialog = weather.InfoBarWeather(session)
+	for name in harness.fixtures("buienradar") + harness.fixtures("openmeteo"):
+		provider = providers.get(name.split(".")[0])
+		result = FetchResult(provider.forecastUrl(location), harness.fixture(name))
+		weather.weatherUpdater.downloadForecastCB(result, location, [provider])
+		for i in range(repeat):
+			dialog.rendered.clear() # as on the first update after a download
+			timed("updateUI " + name, dialog.updateUI)
+			timed("updateUI unchanged " + name, dialog.updateUI)
+
+	for name in harness.fixtures("rain-"):
+		result = FetchResult(weather.buienradar.rainUrl(location), harness.fixture(name))
+		start = result.data.split(b"|")[1][:5]
+		weather.minutesNow = lambda: int(start[:2]) * 60 + int(start[3:5]) # the start of the series is now
+		for i in range(repeat):
+			timed("downloadRainCB " + name, weather.weatherUpdater.downloadRainCB, result, location.id)
+
+	for name in harness.fixtures("rain-"):
+		data = harness.fixture(name)
+		for i in range(repeat):
+			try:
+				series = timed("RainSeries.parse " + name, RainSeries.parse, data)
+			except ValueError:
+				continue
+			minutes = series.times[0] + 55
+			start = timed("RainSeries.index " + name, series.index, minutes)
+			timed("RainSeries.remaining " + name, series.remaining, minutes)
+			timed("RainSeries.pixmapNums " + name, series.pixmapNums, 24, start)
+
+	for what in range(0, dialog.ALL + 1):
+		for i in range(repeat):
+			timed("hideOrShowWidgets(False, %d)" % what, dialog.hideOrShowWidgets, False, what)
+			timed("hideOrShowWidgets(True, %d)" % what, dialog.hideOrShowWidgets, True, what)
+	dialog.close()
+
+
+def main(args):
+	repeat = 20
+	if args[:1] == ["-n"]:
+		repeat = int(args[1])
+		args = args[2:]
+	path = args[0] if args else "benchmarks.json"
+	from plugin.benchmark import Benchmark
+	from plugin.common import TAG, VERSION
+	results = Benchmark(TAG, VERSION, os.path.abspath(path))
+	results.enabled = True
+	stdout = sys.stdout
+	sys.stdout = Quiet()
+	try:
+		run(results, repeat)
+	finally:
+		sys.stdout = stdout
+	results.save()
+
+
+if __name__ == "__main__":
+	main(sys.argv[1:])
@@ -0,0 +1,185 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+# runs the plugin without enigma2: tests/stubs stands in for enigma, Components, Screens, Tools, Plugins, skin and a
+# synchronous twisted, so the plugin can be imported and its dialog built and updated headless. the fixtures are
+# synthetic documents in the formats the providers serve
+
+import atexit
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+try:
+	from http.server import BaseHTTPRequestHandler, HTTPServer
+	from urllib.error import HTTPError
+	from urllib.parse import urlsplit
+	from urllib.request import urlopen
+except ImportError:
+	from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+	from urllib2 import HTTPError, urlopen
+	from urlparse import urlsplit
+
+
+testsDir = os.path.dirname(os.path.abspath(__file__))
+stubsDir = os.path.join(testsDir, "stubs")
+fixturesDir = os.path.join(testsDir, "fixtures")
+for path in (os.path.dirname(testsDir), stubsDir):
+	if path not in sys.path:
+		sys.path.insert(0, path)
+
+import Tools.Directories
+Tools.Directories.configDir = tempfile.mkdtemp(prefix="infobarweather-config-")
+atexit.register(shutil.rmtree, Tools.Directories.configDir, True)
+
+
+def fixture(name):
+	with open(os.path.join(fixturesDir, name), "rb") as f:
+		return f.read()
+
+def fixtures(prefix):
+	return sorted(x for x in os.listdir(fixturesDir) if x.startswith(prefix))
+
+
+class Clock(object):
+	# a monotonic clock that only moves when told to
+
+	def __init__(self, now=1000.0):
+		self.now = now
+
+	def __call__(self):
+		return self.now
+
+	def advance(self, seconds):
+		self.now += seconds
+
+
+class Session(object):
+
+	def instantiateDialog(self, screen, *args):
+		return screen(self, *args)
+
+	def open(self, screen, *args):
+		return screen(self, *args)
+
+
+def configure(locationid=2759794, name="Amsterdam", lat="52.37", lon="4.89", hasRain=True, **values):
+	# a configured main location and any other settings by name, e.g. raingraph="pixmaps"
+	from plugin.common import settings
+	settings.locationid.value = locationid
+	settings.locationname.value = name
+	settings.locationlat.value = lat
+	settings.locationlon.value = lon
+	settings.hasRain.value = hasRain
+	for key, value in values.items():
+		getattr(settings, key).value = value
+	return settings
+
+def reset():
+	# forget all downloaded and compiled state, as after a restart without a snapshot or skin cache
+	from plugin import common, weather
+	weather.weatherData.clear()
+	weather.compiledSkin.clear()
+	for path in (common.skinCacheFile, common.snapshotFile):
+		if os.path.exists(path):
+			os.remove(path)
+	weather.weatherUpdater = updater = weather.WeatherUpdater()
+	weather.refreshCoordinator.__init__()
+	for health in weather.providers.health.values():
+		health.__init__()
+	setupscreen = sys.modules.get("plugin.setupscreen") # not imported by the dialog
+	if setupscreen is not None:
+		setupscreen.locationSearch.queries.clear()
+	return updater
+
+
+class FixtureServer(object):
+	# a stand-in for the providers on localhost: serves fixtures (or errors) by path, and counts the requests per path
+
+	def __init__(self):
+		routes = self.routes = {} # path -> (status, body, maxAge)
+		requests = self.requests = {} # path -> number of requests
+
+		class Handler(BaseHTTPRequestHandler):
+
+			def do_GET(self):
+				path = urlsplit(self.path).path
+				requests[path] = requests.get(path, 0) + 1
+				status, body, maxAge = routes.get(path, (404, b"not found", None))
+				self.send_response(status)
+				self.send_header("Content-Length", str(len(body)))
+				if maxAge is not None:
+					self.send_header("Cache-Control", "max-age=%d" % maxAge)
+				self.end_headers()
+				self.wfile.write(body)
+
+			def log_message(self, *args):
+				pass
+
+		self.httpd = HTTPServer(("127.0.0.1", 0), Handler)
+		self.thread = threading.Thread(target=self.httpd.serve_forever)
+		self.thread.daemon = True
+		self.thread.start()
+
+	def url(self, path):
+		return "http://127.0.0.1:%d%s" % (self.httpd.server_address[1], path)
+
+	def route(self, path, name=None, status=200, body=b"", maxAge=None):
+		self.routes[path] = (status, fixture(name) if name is not None else body, maxAge)
+
+	def fetch(self, url, conditional=False):
+		# instead of HttpClient.fetch, which needs a reactor: a blocking download returning a fired Deferred
+		from plugin.httpclient import FetchResult
+		from plugin.weather import httpClient
+		from twisted.internet import defer
+		started = time.time()
+		try:
+			response = urlopen(url, timeout=10)
+			data = response.read()
+		except (HTTPError, IOError) as e:
+			return defer.fail(e)
+		httpClient.timings[url] = (time.time() - started, 0, len(data))
+		cacheControl = response.info().get("Cache-Control") or ""
+		lifetime = int(cacheControl[8:]) if cacheControl.startswith("max-age=") else None
+		return defer.succeed(FetchResult(url, data, lifetime=lifetime))
+
+	def close(self):
+		self.httpd.shutdown()
+		self.httpd.server_close()
+
+
+class FixtureServerTest(unittest.TestCase):
+	# one FixtureServer per test class, emptied before each test, with the plugin's downloads going to it; patch()
+	# points the providers at it for one test
+
+	@classmethod
+	def setUpClass(cls):
+		cls.server = FixtureServer()
+
+	@classmethod
+	def tearDownClass(cls):
+		cls.server.close()
+
+	def setUp(self):
+		from plugin import weather
+		self.weather = weather
+		self.patched = []
+		self.server.routes.clear()
+		self.server.requests.clear()
+		self.patch(weather.httpClient, "fetch", self.server.fetch)
+
+	def tearDown(self):
+		for obj, name in reversed(self.patched):
+			delattr(obj, name)
+
+	def patch(self, obj, name, value):
+		# shadows a class attribute (or method) on the instance, until the end of the test
+		setattr(obj, name, value)
+		self.patched.append((obj, name))
@@ -0,0 +1,11 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+class ActionMap(object):
+
+	def __init__(self, contexts=None, actions=None, prio=0):
+		self.contexts = contexts
+		self.actions = actions or {}
@@ -0,0 +1,12 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+class ConfigListScreen(object):
+
+	def __init__(self, list, session=None, on_change=None):
+		self.list = list
+		self.session = session
+		self.onChangedEntry = []
@@ -0,0 +1,29 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+from enigma import eWidget
+
+
+class GUIComponent(object):
+	# the instance exists right away, as if the screen had been shown once
+
+	GUI_WIDGET = eWidget
+
+	def __init__(self):
+		self.instance = self.GUI_WIDGET()
+		self.visible = True
+		self.skinAttributes = None
+
+	def show(self):
+		self.visible = True
+		self.instance.show()
+
+	def hide(self):
+		self.visible = False
+		self.instance.hide()
+
+	def applySkin(self, desktop, parent):
+		return True
@@ -0,0 +1,27 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+from Components.GUIComponent import GUIComponent
+
+
+class Label(GUIComponent):
+
+	def __init__(self, text=""):
+		GUIComponent.__init__(self)
+		self.text = text
+
+	def setText(self, text):
+		self.text = text
+		self.instance.setText(text)
+
+	def getText(self):
+		return self.text
+
+
+class MultiColorLabel(Label):
+
+	def setForegroundColorNum(self, num):
+		self.instance.setForegroundColorNum(num)
@@ -0,0 +1,19 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+class Language(object):
+
+	def __init__(self):
+		self.callbacks = []
+
+	def getLanguage(self):
+		return "en_EN"
+
+	def addCallback(self, callback):
+		self.callbacks.append(callback)
+
+
+language = Language()
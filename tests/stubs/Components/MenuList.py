@@ -0,0 +1,21 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+from Components.GUIComponent import GUIComponent
+
+
+class MenuList(GUIComponent):
+
+	def __init__(self, list, enableWrapAround=False, content=None):
+		GUIComponent.__init__(self)
+		self.list = list
+		self.l = content
+
+	def setList(self, list):
+		self.list = list
+
+	def getCurrent(self):
+		return self.list[0] if self.list else None
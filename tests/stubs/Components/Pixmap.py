@@ -0,0 +1,21 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+from Components.GUIComponent import GUIComponent
+
+
+class Pixmap(GUIComponent):
+	pass
+
+
+class MultiPixmap(Pixmap):
+
+	def __init__(self):
+		Pixmap.__init__(self)
+		self.pixmaps = [None] * 30 # loaded from the skin's pixmaps attribute on a receiver
+
+	def setPixmapNum(self, num):
+		self.instance.setPixmapNum(num)
@@ -0,0 +1,11 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+from Components.Label import Label
+
+
+class ScrollLabel(Label):
+	pass
@@ -0,0 +1,10 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+class Boolean(object):
+
+	def __init__(self, fixed=False):
+		self.boolean = fixed
@@ -0,0 +1,75 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+class ConfigElement(object):
+
+	def __init__(self, default):
+		self.default = default
+		self.value = default
+		self.notifiers = []
+
+	def save(self):
+		pass
+
+	def addNotifier(self, notifier, initial_call=True):
+		self.notifiers.append(notifier)
+		if initial_call:
+			notifier(self)
+
+	def removeNotifier(self, notifier):
+		self.notifiers.remove(notifier)
+
+
+class ConfigSelection(ConfigElement):
+
+	def __init__(self, choices, default=None):
+		self.setChoices(choices, default)
+		ConfigElement.__init__(self, self.default)
+
+	def setChoices(self, choices, default=None):
+		self.choices = [x if isinstance(x, tuple) else (x, x) for x in choices]
+		keys = [key for key, text in self.choices]
+		self.default = default if default in keys else keys[0]
+
+	def setCurrentText(self, text):
+		self.choices[[key for key, x in self.choices].index(self.value)] = (text, text)
+		self.value = text
+
+
+class ConfigBoolean(ConfigElement):
+
+	def __init__(self, default=False):
+		ConfigElement.__init__(self, default)
+
+
+class ConfigYesNo(ConfigBoolean):
+	pass
+
+
+class ConfigInteger(ConfigElement):
+
+	def __init__(self, default, limits=None):
+		ConfigElement.__init__(self, default)
+
+
+class ConfigText(ConfigElement):
+
+	def __init__(self, default="", fixed_size=True, visible_width=False):
+		ConfigElement.__init__(self, default)
+
+
+class ConfigSubsection(object):
+	pass
+
+
+def getConfigListEntry(*args):
+	return args
+
+
+config = ConfigSubsection()
+config.plugins = ConfigSubsection()
+config.skin = ConfigSubsection()
+config.skin.primary_skin = ConfigText("PLi-FullNightHD/skin.xml")
@@ -0,0 +1,19 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+class PluginDescriptor(object):
+
+	WHERE_PLUGINMENU = 0
+	WHERE_EXTENSIONSMENU = 1
+	WHERE_AUTOSTART = 2
+	WHERE_SESSIONSTART = 3
+
+	def __init__(self, name="", description="", where=None, icon=None, fnc=None, **kwargs):
+		self.name = name
+		self.description = description
+		self.where = where
+		self.icon = icon
+		self.fnc = fnc
@@ -0,0 +1,15 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+class InfoBarShowHide(object):
+
+	def __init__(self):
+		self.onShow = []
+		self.onHide = []
+
+
+class InfoBarEPG(object):
+	pass
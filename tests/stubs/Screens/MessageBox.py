@@ -0,0 +1,19 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+from Screens.Screen import Screen
+
+
+class MessageBox(Screen):
+
+	TYPE_YESNO = 0
+	TYPE_INFO = 1
+	TYPE_WARNING = 2
+	TYPE_ERROR = 3
+
+	def __init__(self, session, text, type=TYPE_YESNO, timeout=-1):
+		Screen.__init__(self, session)
+		self.text = text
@@ -0,0 +1,33 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+class Screen(dict):
+
+	def __init__(self, session, parent=None):
+		dict.__init__(self)
+		self.session = session
+		self.shown = False
+		self.onClose = []
+		self.onShow = []
+		self.onHide = []
+		self.onLayoutFinish = []
+
+	def show(self):
+		self.shown = True
+		for f in self.onShow:
+			f()
+
+	def hide(self):
+		self.shown = False
+		for f in self.onHide:
+			f()
+
+	def close(self, *args):
+		for f in self.onClose:
+			f()
+
+	def setTitle(self, title):
+		self.title = title
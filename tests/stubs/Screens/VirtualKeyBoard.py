@@ -0,0 +1,14 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+from Screens.Screen import Screen
+
+
+class VirtualKeyBoard(Screen):
+
+	def __init__(self, session, title="", text=""):
+		Screen.__init__(self, session)
+		self.text = text
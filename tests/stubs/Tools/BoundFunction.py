@@ -0,0 +1,17 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+class boundFunction(object):
+
+	def __init__(self, fnc, *args, **kwargs):
+		self.fnc = fnc
+		self.args = args
+		self.kwargs = kwargs
+
+	def __call__(self, *args, **kwargs):
+		newkwargs = dict(self.kwargs)
+		newkwargs.update(kwargs)
+		return self.fnc(*(self.args + args), **newkwargs)
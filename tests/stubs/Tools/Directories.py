@@ -0,0 +1,20 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+import os
+
+
+SCOPE_CONFIG = "config"
+SCOPE_PLUGINS = "plugins"
+configDir = None # instead of /etc/enigma2, a temporary directory set by tests/harness.py
+
+
+def fileExists(path, mode="r"):
+	return os.path.exists(path)
+
+
+def resolveFilename(scope, base=""):
+	return os.path.join(configDir, base)
@@ -0,0 +1,17 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+import os
+
+
+class DecodedPixmap(object):
+
+	def __init__(self, path):
+		self.path = path
+
+
+def LoadPixmap(path, desktop=None, cached=False):
+	return DecodedPixmap(path) if os.path.isfile(path) else None
@@ -0,0 +1,132 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+# just enough of enigma2's native module to construct the plugin's screens headless; widget instances count the
+# calls made on them, so benchmarks and tests can see how much work reaches the native side
+
+calls = {} # method name -> number of calls on any widget instance
+
+
+def count(name):
+	calls[name] = calls.get(name, 0) + 1
+
+
+class ePoint(object):
+
+	def __init__(self, x=0, y=0):
+		self._x = x
+		self._y = y
+
+	def x(self):
+		return self._x
+
+	def y(self):
+		return self._y
+
+
+class eSize(object):
+
+	def __init__(self, width=0, height=0):
+		self._width = width
+		self._height = height
+
+	def width(self):
+		return self._width
+
+	def height(self):
+		return self._height
+
+
+class eRect(object):
+
+	def __init__(self, x, y, width, height):
+		self.rect = (x, y, width, height)
+
+
+class gRGB(object):
+
+	def __init__(self, argb=0):
+		self.argb = argb
+
+
+class gFont(object):
+
+	def __init__(self, family, size):
+		self.family = family
+		self.size = size
+
+
+class eTimer(object):
+
+	def __init__(self):
+		self.callback = []
+		self.active = False
+
+	def start(self, msec, singleShot=False):
+		self.active = True
+
+	def stop(self):
+		self.active = False
+
+
+class eWidget(object):
+
+	def __init__(self):
+		self._size = eSize(0, 0)
+
+	def show(self):
+		count("show")
+
+	def hide(self):
+		count("hide")
+
+	def size(self):
+		return self._size
+
+	def resize(self, size):
+		self._size = size
+
+	def setPixmap(self, pixmap):
+		count("setPixmap")
+
+	def setPixmapNum(self, num):
+		count("setPixmapNum")
+
+	def setText(self, text):
+		count("setText")
+
+	def setForegroundColorNum(self, num):
+		count("setForegroundColorNum")
+
+
+class eCanvas(eWidget):
+
+	def setSize(self, size):
+		count("setSize")
+		self._size = size
+
+	def clear(self, color):
+		count("clear")
+
+	def fillRect(self, rect, color):
+		count("fillRect")
+
+
+class eLabel(eWidget):
+
+	@staticmethod
+	def calculateTextSize(font, text, size):
+		# a rough average glyph width
+		return eSize(min(len(text) * font.size // 2, size.width()), font.size)
+
+
+class eListboxPythonMultiContent(object):
+	pass
+
+
+RT_HALIGN_LEFT = 0
+RT_HALIGN_RIGHT = 2
+RT_VALIGN_CENTER = 8
@@ -0,0 +1,17 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+from enigma import gFont
+
+import xml.etree.ElementTree # noqa: F401 loaded by enigma2's skin.py too
+
+
+dom_screens = {} # screen name -> (element, path of the skin file), the screens the active skins define
+
+
+def parseFont(s, scale=None):
+	name, size = s.split(";")
+	return gFont(name.strip(), int(size))
@@ -0,0 +1,7 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+# a synchronous stand-in for the few twisted apis the plugin uses: everything runs to completion right away
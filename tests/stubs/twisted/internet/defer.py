@@ -0,0 +1,110 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+from twisted.python.failure import Failure
+
+
+class CancelledError(Exception):
+	pass
+
+
+def passthru(result):
+	return result
+
+
+class Deferred(object):
+
+	def __init__(self, canceller=None):
+		self.canceller = canceller
+		self.callbacks = []
+		self.called = False
+		self.paused = 0
+		self.result = None
+
+	def addCallbacks(self, callback, errback=None, callbackArgs=(), callbackKeywords=None, errbackArgs=(), errbackKeywords=None):
+		self.callbacks.append(((callback, callbackArgs, callbackKeywords or {}), (errback or passthru, errbackArgs, errbackKeywords or {})))
+		if self.called:
+			self.runCallbacks()
+		return self
+
+	def addCallback(self, callback, *args, **kwargs):
+		return self.addCallbacks(callback, passthru, callbackArgs=args, callbackKeywords=kwargs)
+
+	def addErrback(self, errback, *args, **kwargs):
+		return self.addCallbacks(passthru, errback, errbackArgs=args, errbackKeywords=kwargs)
+
+	def addBoth(self, callback, *args, **kwargs):
+		return self.addCallbacks(callback, callback, callbackArgs=args, callbackKeywords=kwargs, errbackArgs=args, errbackKeywords=kwargs)
+
+	def callback(self, result):
+		if self.called:
+			raise RuntimeError("already called")
+		self.called = True
+		self.result = result
+		self.runCallbacks()
+
+	def errback(self, fail=None):
+		if not isinstance(fail, Failure):
+			fail = Failure(fail)
+		self.callback(fail)
+
+	def cancel(self):
+		if not self.called:
+			if self.canceller is not None:
+				self.canceller(self)
+			if not self.called:
+				self.errback(CancelledError())
+
+	def continueWith(self, result):
+		self.paused -= 1
+		self.result = result
+		self.runCallbacks()
+
+	def runCallbacks(self):
+		while self.callbacks and not self.paused:
+			callback, errback = self.callbacks.pop(0)
+			f, args, kwargs = errback if isinstance(self.result, Failure) else callback
+			try:
+				self.result = f(self.result, *args, **kwargs)
+			except Exception:
+				self.result = Failure()
+			if isinstance(self.result, Deferred):
+				inner = self.result
+				self.paused += 1
+				inner.addBoth(self.continueWith)
+
+
+def succeed(result):
+	d = Deferred()
+	d.callback(result)
+	return d
+
+
+def fail(result=None):
+	d = Deferred()
+	d.errback(result)
+	return d
+
+
+def maybeDeferred(f, *args, **kwargs):
+	try:
+		result = f(*args, **kwargs)
+	except Exception:
+		return fail(Failure())
+	if isinstance(result, Deferred):
+		return result
+	if isinstance(result, Failure):
+		return fail(result)
+	return succeed(result)
+
+
+class DeferredSemaphore(object):
+
+	def __init__(self, tokens):
+		self.tokens = tokens
+
+	def run(self, f, *args, **kwargs):
+		return maybeDeferred(f, *args, **kwargs)
@@ -0,0 +1,24 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+class DelayedCall(object):
+
+	def __init__(self, f, args, kwargs):
+		self.f = f
+		self.args = args
+		self.kwargs = kwargs
+		self.cancelled = False
+
+	def active(self):
+		return not self.cancelled
+
+	def cancel(self):
+		self.cancelled = True
+
+
+def callLater(delay, f, *args, **kwargs):
+	# never fires: timeouts do not happen in tests
+	return DelayedCall(f, args, kwargs)
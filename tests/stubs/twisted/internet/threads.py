@@ -0,0 +1,12 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+from twisted.internet.defer import maybeDeferred
+
+
+def deferToThread(f, *args, **kwargs):
+	# runs in the calling thread, so results are there when it returns
+	return maybeDeferred(f, *args, **kwargs)
@@ -0,0 +1,37 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+import sys
+
+
+class Failure(object):
+
+	def __init__(self, value=None):
+		if value is None:
+			value = sys.exc_info()[1]
+		self.value = value
+		self.type = type(value)
+
+	def check(self, *errorTypes):
+		for errorType in errorTypes:
+			if isinstance(self.value, errorType):
+				return errorType
+		return None
+
+	def trap(self, *errorTypes):
+		errorType = self.check(*errorTypes)
+		if errorType is None:
+			raise self.value
+		return errorType
+
+	def getErrorMessage(self):
+		return str(self.value)
+
+	def raiseException(self):
+		raise self.value
+
+	def __str__(self):
+		return "[Failure instance: %s: %s]" % (self.type.__name__, self.value)
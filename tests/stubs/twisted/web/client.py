@@ -0,0 +1,32 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+class ResponseDone(Exception):
+	pass
+
+
+class HTTPConnectionPool(object):
+
+	def __init__(self, reactor, persistent=True):
+		self.persistent = persistent
+
+
+class Agent(object):
+
+	def __init__(self, reactor, connectTimeout=None, pool=None):
+		self.pool = pool
+
+	def request(self, method, uri, headers=None, bodyProducer=None):
+		raise NotImplementedError("no network in tests, replace HttpClient.fetch")
+
+
+class BrowserLikeRedirectAgent(object):
+
+	def __init__(self, agent, redirectLimit=20):
+		self.agent = agent
+
+	def request(self, method, uri, headers=None, bodyProducer=None):
+		return self.agent.request(method, uri, headers, bodyProducer)
@@ -0,0 +1,16 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+class Headers(object):
+
+	def __init__(self, rawHeaders=None):
+		self.rawHeaders = dict(rawHeaders or {})
+
+	def getRawHeaders(self, name, default=None):
+		return self.rawHeaders.get(name, default)
+
+	def setRawHeaders(self, name, values):
+		self.rawHeaders[name] = values
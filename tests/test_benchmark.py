@@ -0,0 +1,68 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+from . import harness
+from plugin.benchmark import Benchmark
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+
+
+class BenchmarkTest(unittest.TestCase):
+
+	def setUp(self):
+		self.dir = tempfile.mkdtemp(prefix="infobarweather-benchmark-")
+		self.benchmark = Benchmark("test", "1.0", os.path.join(self.dir, "benchmarks.json"), maxSamples=5)
+		self.benchmark.enabled = True
+
+	def tearDown(self):
+		shutil.rmtree(self.dir)
+
+	def testBounded(self):
+		for i in range(10):
+			self.benchmark.record("parseRain", float(i))
+		self.assertEqual(list(self.benchmark.samples["parseRain"]), [5.0, 6.0, 7.0, 8.0, 9.0])
+		self.assertEqual(self.benchmark.summary(), {"parseRain": {"count": 10, "min": 5.0, "median": 7.0, "max": 9.0}})
+
+	def testTimed(self):
+		double = self.benchmark.timed("double")(lambda x: 2 * x)
+		self.assertEqual(double(21), 42)
+		self.benchmark.enabled = False
+		double(21)
+		self.assertEqual(self.benchmark.counts, {"double": 1})
+
+	def testThreads(self):
+		# parsing is timed in worker threads while the main thread saves
+		def work():
+			for i in range(2000):
+				self.benchmark.record("parse%d" % (i % 50), 0.001)
+		threads = [threading.Thread(target=work) for i in range(4)]
+		stdout = sys.stdout
+		sys.stdout = open(os.devnull, "w")
+		try:
+			for thread in threads:
+				thread.start()
+			while any(thread.is_alive() for thread in threads):
+				self.benchmark.save()
+			for thread in threads:
+				thread.join()
+			self.benchmark.save()
+		finally:
+			sys.stdout.close()
+			sys.stdout = stdout
+		with open(self.benchmark.path) as f:
+			results = json.load(f)["1.0"]
+		self.assertEqual(len(results), 50)
+		self.assertEqual(sum(x["count"] for x in results.values()), 8000)
+
+
+if __name__ == "__main__":
+	unittest.main()
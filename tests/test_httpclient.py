@@ -0,0 +1,162 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+from . import harness
+from plugin.httpclient import freshnessLifetime, HttpClient
+from plugin.stats import Stats
+from twisted.internet import defer
+from twisted.python.failure import Failure
+from twisted.web.client import ResponseDone
+from twisted.web.http_headers import Headers
+
+import gzip
+import io
+import time
+import unittest
+
+
+try:
+	from email.utils import formatdate
+except ImportError:
+	from email.Utils import formatdate
+
+
+def gzipped(data):
+	out = io.BytesIO()
+	with gzip.GzipFile(fileobj=out, mode="wb") as f:
+		f.write(data)
+	return out.getvalue()
+
+
+class Transport(object):
+
+	def __init__(self):
+		self.stopped = False
+
+	def stopProducing(self):
+		self.stopped = True
+
+
+class Response(object):
+	# as an Agent delivers it: the headers first, then the body in chunks
+
+	def __init__(self, code, headers=None, body=b"", chunkSize=1024):
+		self.code = code
+		self.headers = Headers(dict((k.lower().encode("ascii"), [v.encode("ascii")]) for k, v in (headers or {}).items()))
+		self.body = body
+		self.chunkSize = chunkSize
+		self.transport = Transport()
+
+	def deliverBody(self, protocol):
+		protocol.transport = self.transport
+		for i in range(0, len(self.body), self.chunkSize):
+			if self.transport.stopped:
+				return
+			protocol.dataReceived(self.body[i:i + self.chunkSize])
+		protocol.connectionLost(Failure(ResponseDone()))
+
+
+class Agent(object):
+	# answers every request with the next response, and keeps the requests
+
+	def __init__(self, *responses):
+		self.responses = list(responses)
+		self.requests = [] # (method, url, headers)
+
+	def request(self, method, uri, headers=None, bodyProducer=None):
+		self.requests.append((method, uri, headers))
+		return defer.succeed(self.responses.pop(0))
+
+
+class FreshnessLifetimeTest(unittest.TestCase):
+
+	def lifetime(self, **headers):
+		return freshnessLifetime(Headers(dict((k.replace("_", "-").lower().encode("ascii"), [v.encode("ascii")]) for k, v in headers.items())))
+
+	def testMaxAge(self):
+		self.assertEqual(self.lifetime(cache_control="max-age=600"), 600)
+		self.assertEqual(self.lifetime(cache_control="public, MAX-AGE=300, must-revalidate"), 300)
+		self.assertEqual(self.lifetime(cache_control="max-age=-5"), 0)
+		self.assertTrue(110 <= self.lifetime(cache_control="max-age=soon", expires=formatdate(time.time() + 120)) <= 120) # falls back to expires
+
+	def testNoCache(self):
+		self.assertEqual(self.lifetime(cache_control="no-cache"), 0)
+		self.assertEqual(self.lifetime(cache_control="no-store, max-age=600"), 0)
+
+	def testExpires(self):
+		self.assertEqual(self.lifetime(expires="Sat, 01 Jun 2024 12:10:00 GMT", date="Sat, 01 Jun 2024 12:00:00 GMT"), 600) # against the server's clock
+		self.assertEqual(self.lifetime(expires="Sat, 01 Jun 2024 11:00:00 GMT", date="Sat, 01 Jun 2024 12:00:00 GMT"), 0)
+		self.assertEqual(self.lifetime(expires="0"), 0) # invalid means expired
+		self.assertTrue(290 <= self.lifetime(expires=formatdate(time.time() + 300)) <= 300) # without a date, against ours
+
+	def testNone(self):
+		self.assertEqual(self.lifetime(), None)
+		self.assertEqual(self.lifetime(cache_control="public"), None)
+
+
+class FetchTest(unittest.TestCase):
+
+	url = "https://forecast.buienradar.nl/2.0/forecast/2759794"
+
+	def setUp(self):
+		self.client = HttpClient("test", Stats("test", None), maxSize=4096)
+
+	def fetch(self, agent, conditional=False):
+		self.client.agent = agent
+		result = []
+		self.client.fetch(self.url, conditional).addBoth(result.append)
+		return result[0]
+
+	def testPlain(self):
+		result = self.fetch(Agent(Response(200, {"Cache-Control": "max-age=900"}, b"{}")))
+		self.assertEqual((result.url, result.data, result.notModified, result.lifetime), (self.url, b"{}", False, 900))
+		response, body, size = self.client.timings[self.url]
+		self.assertEqual(size, 2)
+		method, url, headers = self.client.agent.requests[0]
+		self.assertEqual((method, url), (b"GET", self.url.encode("utf-8")))
+		self.assertEqual(headers.getRawHeaders(b"Accept-Encoding"), [b"gzip"])
+
+	def testGzip(self):
+		data = harness.fixture("buienradar.json")
+		result = self.fetch(Agent(Response(200, {"Content-Encoding": "gzip"}, gzipped(data[:4000]))))
+		self.assertEqual(result.data, data[:4000])
+
+	def testTooLarge(self):
+		response = Response(200, {}, b"x" * 5000)
+		result = self.fetch(Agent(response))
+		self.assertTrue(isinstance(result, Failure) and result.check(IOError))
+		self.assertTrue(response.transport.stopped) # the rest is not downloaded
+		self.assertNotIn(self.url, self.client.timings)
+
+	def testGzipTooLarge(self):
+		result = self.fetch(Agent(Response(200, {"Content-Encoding": "gzip"}, gzipped(b"x" * 5000))))
+		self.assertTrue(isinstance(result, Failure) and result.check(IOError)) # the limit is after decompression
+
+	def testError(self):
+		result = self.fetch(Agent(Response(503, {}, b"busy")))
+		self.assertTrue(isinstance(result, Failure) and result.check(IOError))
+		self.assertIn("503", result.getErrorMessage())
+
+	def testValidators(self):
+		agent = Agent(Response(200, {"ETag": '"v1"', "Last-Modified": "Sat, 01 Jun 2024 12:00:00 GMT"}, b"{}"),
+			Response(304, {"Cache-Control": "max-age=600"}),
+			Response(200, {}, b"{}"),
+			Response(200, {}, b"{}"))
+		self.fetch(agent)
+		result = self.fetch(agent, conditional=True)
+		self.assertEqual((result.notModified, result.data, result.lifetime), (True, None, 600))
+		headers = agent.requests[1][2]
+		self.assertEqual(headers.getRawHeaders(b"If-None-Match"), [b'"v1"'])
+		self.assertEqual(headers.getRawHeaders(b"If-Modified-Since"), [b"Sat, 01 Jun 2024 12:00:00 GMT"])
+		self.fetch(agent) # unconditional, and the response has no validators
+		self.assertEqual(agent.requests[2][2].getRawHeaders(b"If-None-Match"), None)
+		self.assertNotIn(self.url, self.client.validators)
+		self.fetch(agent, conditional=True)
+		self.assertEqual(agent.requests[3][2].getRawHeaders(b"If-None-Match"), None)
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,112 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+from . import harness
+from plugin.icons import IconManager
+from plugin.stats import Stats
+from twisted.internet import defer
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+
+class HttpClient(object):
+	# stores a fake icon for every download, or fails while told to
+
+	def __init__(self):
+		self.downloads = []
+		self.failing = False
+
+	def download(self, url, outputfile):
+		self.downloads.append(url)
+		if self.failing:
+			return defer.fail(IOError("HTTP 404"))
+		with open(outputfile, "wb") as f:
+			f.write(url.encode("utf-8"))
+		return defer.succeed(None)
+
+
+class IconManagerTest(unittest.TestCase):
+
+	def setUp(self):
+		self.dir = tempfile.mkdtemp(prefix="infobarweather-icons-")
+		self.bundledDir = os.path.join(self.dir, "bundled")
+		self.storeDir = os.path.join(self.dir, "store")
+		os.mkdir(self.bundledDir)
+		os.mkdir(self.storeDir)
+		self.httpClient = HttpClient()
+		self.clock = harness.Clock()
+		self.icons = IconManager("test", self.httpClient, Stats("test", None), self.bundledDir, self.storeDir, capacity=2, maxAge=30 * 24 * 60 * 60, clock=self.clock)
+
+	def tearDown(self):
+		shutil.rmtree(self.dir)
+
+	def get(self, iconcode):
+		result = []
+		self.icons.get(iconcode).addBoth(result.append)
+		return result[0]
+
+	def testBundled(self):
+		with open(os.path.join(self.bundledDir, "a.png"), "wb") as f:
+			f.write(b"a")
+		self.assertEqual(self.get("a").path, os.path.join(self.bundledDir, "a.png"))
+		self.assertEqual(self.httpClient.downloads, [])
+
+	def testDownloaded(self):
+		pixmap = self.get("b")
+		self.assertEqual(pixmap.path, os.path.join(self.storeDir, "b.png"))
+		self.assertTrue(self.get("b") is pixmap) # cached
+		self.get("c")
+		self.get("d")
+		self.assertFalse(self.get("b") is pixmap) # evicted, loaded from flash again
+		self.assertEqual(len(self.httpClient.downloads), 3)
+
+	def testFailed(self):
+		self.httpClient.failing = True
+		self.assertTrue(self.get("b").check(IOError))
+		self.assertTrue(self.get("b").check(IOError)) # not downloaded again right away
+		self.assertEqual(len(self.httpClient.downloads), 1)
+		self.clock.advance(60)
+		self.get("b")
+		self.clock.advance(60)
+		self.get("b")
+		self.assertEqual(len(self.httpClient.downloads), 2) # backs off: two minutes after the second failure
+		self.clock.advance(60)
+		self.httpClient.failing = False
+		self.assertEqual(self.get("b").path, os.path.join(self.storeDir, "b.png"))
+		self.assertEqual(self.icons.failures, {})
+
+	def testExpired(self):
+		self.get("b")
+		path = os.path.join(self.storeDir, "b.png")
+		old = time.time() - 31 * 24 * 60 * 60
+		os.utime(path, (old, old))
+		self.icons.cache.clear()
+		stale = self.get("b") # shown until the new one is stored
+		self.assertEqual(len(self.httpClient.downloads), 2)
+		self.assertTrue(os.path.getmtime(path) > old)
+		fresh = self.get("b")
+		self.assertFalse(fresh is stale) # the stale pixmap is not kept in the cache
+		self.assertTrue(self.get("b") is fresh)
+		self.assertEqual(len(self.httpClient.downloads), 2)
+
+	def testExpiredFailed(self):
+		self.get("b")
+		path = os.path.join(self.storeDir, "b.png")
+		old = time.time() - 31 * 24 * 60 * 60
+		os.utime(path, (old, old))
+		self.httpClient.failing = True
+		for i in range(3):
+			self.icons.cache.clear()
+			self.assertEqual(self.get("b").path, path) # the stored icon is still shown
+		self.assertEqual(len(self.httpClient.downloads), 2) # and not downloaded again on every load
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,82 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+from . import harness
+
+import json
+import unittest
+
+
+def names(locations):
+	return sorted(x.name for x in locations)
+
+
+class LocationSearchTest(harness.FixtureServerTest):
+	# the setup screen's location search, online against a local server
+
+	def setUp(self):
+		from plugin import setupscreen
+		harness.FixtureServerTest.setUp(self)
+		self.locationSearch = setupscreen.locationSearch
+		harness.reset()
+		self.patch(self.locationSearch, "url", self.server.url("/location/search?query=%s"))
+
+	def search(self, searchterm):
+		result = []
+		self.locationSearch.search(searchterm).addCallbacks(result.append, result.append)
+		return result[0]
+
+	def testOnline(self):
+		self.server.route("/location/search", "locations-ams.json")
+		self.assertEqual(names(self.search("ams")), ["Amstelveen", "Amsterdam", "Amsterdam", "Amsterdam-Zuidoost"])
+		self.assertEqual(self.server.requests, {"/location/search": 1})
+
+	def testCached(self):
+		self.server.route("/location/search", "locations-ams.json")
+		self.search("ams")
+		self.assertEqual(len(self.search("AMS ")), 4)
+		self.assertEqual(names(self.search("amsterdam")), ["Amsterdam", "Amsterdam", "Amsterdam-Zuidoost"]) # refines a complete result
+		self.assertEqual(self.server.requests, {"/location/search": 1})
+
+	def testExpired(self):
+		self.server.route("/location/search", "locations-ams.json")
+		self.search("ams")
+		fetched, result = self.locationSearch.queries["ams"]
+		self.locationSearch.queries["ams"] = (fetched - self.locationSearch.maxAge - 1, result)
+		self.search("ams")
+		self.assertEqual(self.server.requests, {"/location/search": 2})
+
+	def testAccents(self):
+		self.server.route("/location/search", "locations-liege.json")
+		self.search(u"Liège")
+		location = self.search("LIEGE")[0]
+		self.assertEqual((location.id, location.country), (2792413, u"België" if str is not bytes else u"België".encode("utf-8")))
+		self.assertEqual(self.server.requests, {"/location/search": 1})
+
+	def testFailed(self):
+		self.server.route("/location/search", status=503)
+		failure = self.search("ams")
+		self.assertTrue(failure.check(IOError))
+		self.server.route("/location/search", "locations-ams.json")
+		self.assertEqual(len(self.search("ams")), 4) # a failure is not cached
+		self.assertEqual(self.server.requests, {"/location/search": 2})
+
+
+class WatchedLocationsTest(unittest.TestCase):
+
+	def testNames(self):
+		from plugin.common import watchedLocations
+		settings = harness.configure(locationmode="cycle", watchedlocations=json.dumps([[2792413, u"Liège", "50.63", "5.57", False]]))
+		try:
+			main, extra = watchedLocations()
+		finally:
+			settings.watchedlocations.value = "[]"
+			settings.locationmode.value = "pin"
+		self.assertEqual((extra.id, extra.name), (2792413, u"Liège" if str is not bytes else u"Liège".encode("utf-8"))) # str for enigma
+
+
+if __name__ == "__main__":
+	unittest.main()
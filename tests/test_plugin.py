@@ -0,0 +1,47 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+from . import harness # noqa: F401, puts the stubs on sys.path
+
+import sys
+import unittest
+
+
+lazy = ("plugin.weather", "plugin.setupscreen", "plugin.httpclient", "plugin.providers", "twisted")
+
+
+class ImportTest(unittest.TestCase):
+	# plugin.py is imported while enigma starts, with enigma's own modules already loaded
+
+	def setUp(self):
+		import plugin.plugin
+		from Components.config import config
+		self.config = config
+		self.settings = getattr(config.plugins, plugin.PLUGIN_NAME)
+		self.saved = dict((name, module) for name, module in sys.modules.items() if name.split(".")[0] in ("plugin", "twisted"))
+		for name in self.saved:
+			del sys.modules[name]
+
+	def tearDown(self):
+		for name in list(sys.modules.keys()):
+			if name.split(".")[0] in ("plugin", "twisted"):
+				del sys.modules[name]
+		sys.modules.update(self.saved)
+		setattr(self.config.plugins, sys.modules["plugin"].PLUGIN_NAME, self.settings)
+
+	def testBudget(self):
+		import plugin.plugin
+		self.assertTrue(plugin.plugin.importTime < plugin.plugin.importBudget, "import took %.3fs, budget %.3fs" % (plugin.plugin.importTime, plugin.plugin.importBudget))
+
+	def testLazy(self):
+		import plugin.plugin
+		for name in lazy:
+			self.assertNotIn(name, sys.modules)
+		self.assertTrue(plugin.plugin.Plugins())
+
+
+if __name__ == "__main__":
+	unittest.main()
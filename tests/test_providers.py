@@ -0,0 +1,225 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+from . import harness
+from plugin.common import WatchedLocation
+from plugin.providers import Buienradar, compassPoints, Forecast, Hour, OpenMeteo, Providers
+
+import calendar
+import time
+import unittest
+
+
+amsterdam = WatchedLocation(2759794, "Amsterdam", "52.37", "4.89", True)
+paris = WatchedLocation(2988507, "Paris", "48.85", "2.35", False)
+nowhere = WatchedLocation(1, "Nowhere", "", "", False) # no coordinates, as locations from old settings
+
+
+class BuienradarTest(unittest.TestCase):
+
+	def testParse(self):
+		f = Buienradar().parse(harness.fixture("buienradar.json"), 12)
+		self.assertEqual(f.provider, "buienradar")
+		self.assertEqual(len(f.hours), 12)
+		self.assertEqual(f.hours[0].time, "2024-06-01T14:00")
+		self.assertEqual(f.hours[-1].time, "2024-06-02T01:00")
+		self.assertEqual((f.updated, f.utcOffset), ("14:10", 7200))
+		self.assertEqual((f.mintemperature, f.maxtemperature, f.uvindex), (13.1, 23.4, 5))
+		self.assertEqual((f.sunrise, f.sunset), ("05:21", "21:56"))
+		hour = f.hours[0]
+		self.assertEqual((hour.temperature, hour.feeltemperature, hour.humidity, hour.precipitation), (22.8, 21.8, 68, 42))
+		self.assertEqual((hour.windspeedms, hour.beaufort, compassPoints[hour.winddirection]), (5.0, 2, "ZZW")) # buienradar's beaufort
+		self.assertEqual((hour.iconcode, hour.sunpower), ("a", 784))
+
+	def testHorizonAcrossDays(self):
+		f = Buienradar().parse(harness.fixture("buienradar.json").decode("utf-8"), 48)
+		self.assertEqual(len(f.hours), 48)
+		self.assertEqual(f.hours[-1].time, "2024-06-03T13:00")
+		self.assertEqual(f.mintemperature, 13.1) # of the first day
+
+	def testBeaufortFromWindSpeed(self):
+		self.assertEqual(Buienradar().hour({"windspeedms": 5.0}).beaufort, 3)
+		self.assertEqual(Buienradar().hour({"windspeedms": 5.0, "beaufort": 2}).beaufort, 2)
+		self.assertEqual(Buienradar().hour({}).beaufort, None)
+
+	def testWindDirectionDegrees(self):
+		hour = Buienradar().hour({"datetime": "2024-06-01T14:00:00", "winddirection": "?", "winddirectiondegrees": 92})
+		self.assertEqual(compassPoints[hour.winddirection], "O")
+		self.assertEqual(Buienradar().hour({}).winddirection, None)
+
+	def testMalformed(self):
+		for data in (b"<html>Service Unavailable</html>", b"{}", b'{"days": []}', b'{"days": [{"hours": "none"}]}', b""):
+			self.assertRaises(ValueError, Buienradar().parse, data, 12)
+
+
+class OpenMeteoTest(unittest.TestCase):
+
+	def testParse(self):
+		f = OpenMeteo().parse(harness.fixture("openmeteo.json"), 12)
+		self.assertEqual(f.provider, "openmeteo")
+		self.assertEqual(len(f.hours), 12)
+		self.assertEqual(f.hours[0].time, "2024-06-01T14:00") # the hour of current.time
+		self.assertEqual((f.updated, f.utcOffset), ("14:15", 7200))
+		self.assertEqual((f.mintemperature, f.maxtemperature, f.uvindex), (13.1, 23.4, 5))
+		self.assertEqual((f.sunrise, f.sunset), ("05:21", "21:56"))
+		hour = f.hours[0]
+		self.assertEqual((hour.temperature, hour.feeltemperature, hour.humidity, hour.precipitation), (22.8, 21.8, 68, 42))
+		self.assertEqual((hour.windspeedms, hour.beaufort, compassPoints[hour.winddirection]), (1.12, 1, "ZW"))
+		self.assertEqual(hour.sunpower, 784.6)
+
+	def testIconcodes(self):
+		f = OpenMeteo().parse(harness.fixture("openmeteo.json"), 12)
+		self.assertEqual([hour.iconcode for hour in f.hours], ["s", "n", "a", "b", "j", "c", "q", "f", "ss", "nn", "aa", "bb"]) # doubled at night
+
+	def testHorizonPastEnd(self):
+		self.assertEqual(len(OpenMeteo().parse(harness.fixture("openmeteo.json"), 100).hours), 72 - 14)
+
+	def testMalformed(self):
+		for data in (b"<html>Service Unavailable</html>", b"{}", b'{"hourly": {}, "daily": {}, "current": {"time": "2024-06-01T14:15"}}', b"[]"):
+			self.assertRaises(ValueError, OpenMeteo().parse, data, 12)
+
+	def testSupports(self):
+		self.assertTrue(OpenMeteo().supports(paris))
+		self.assertFalse(OpenMeteo().supports(nowhere))
+
+
+class ForecastTest(unittest.TestCase):
+
+	def forecast(self, minutes):
+		# two hours, 14:00 and 15:00, with the clock at the location minutes past 14:00
+		hours = [Hour("2024-06-01T14:00", 20.0, windspeedms=2.0, winddirection=0, iconcode="a"), Hour("2024-06-01T15:00", 22.0, windspeedms=4.0, winddirection=8, iconcode="c")]
+		start = calendar.timegm((2024, 6, 1, 14, 0, 0, 0, 0, 0))
+		return Forecast("test", "14:00", start + minutes * 60 - time.time(), hours)
+
+	def testInterpolated(self):
+		hour = self.forecast(15).at()
+		self.assertEqual((hour.temperature, hour.windspeedms, hour.beaufort), (20.5, 2.5, 2))
+		self.assertEqual((hour.iconcode, hour.winddirection), ("a", 0))
+		hour = self.forecast(45).at()
+		self.assertEqual((hour.temperature, hour.iconcode, hour.winddirection), (21.5, "a", 8)) # the icon of the hour, the nearest wind
+
+	def testOutside(self):
+		self.assertEqual(self.forecast(-30).at().temperature, 20.0)
+		self.assertEqual(self.forecast(90).at().temperature, 22.0)
+		self.assertEqual(self.forecast(0).at(3600).iconcode, "c")
+
+
+class OrderedTest(unittest.TestCase):
+
+	def setUp(self):
+		class Other(OpenMeteo):
+			name = "other"
+		self.buienradar = Buienradar()
+		self.openmeteo = OpenMeteo()
+		self.other = Other()
+		self.providers = Providers([self.buienradar, self.openmeteo, self.other])
+
+	def names(self, location, pinned="auto"):
+		return [p.name for p in self.providers.ordered(location, pinned)]
+
+	def testPreferred(self):
+		self.assertEqual(self.names(amsterdam)[0], "buienradar")
+		self.assertEqual(self.names(paris)[-1], "buienradar")
+		self.assertEqual(self.names(nowhere), ["buienradar"])
+
+	def testPinned(self):
+		self.assertEqual(self.names(amsterdam, "openmeteo"), ["openmeteo"])
+		self.assertEqual(self.names(nowhere, "openmeteo"), [])
+		self.assertEqual(self.names(amsterdam, "unknown"), [])
+
+	def testFailuresFirst(self):
+		self.providers.failure(self.buienradar)
+		self.providers.failure(self.buienradar)
+		self.assertEqual(self.names(amsterdam)[-1], "buienradar")
+		self.providers.success(self.buienradar, 0.1)
+		self.providers.success(self.buienradar, 0.1)
+		self.providers.success(self.buienradar, 0.1)
+		self.assertEqual(self.names(amsterdam)[0], "buienradar")
+
+	def testFailuresForgotten(self):
+		self.providers.failure(self.buienradar)
+		self.providers.failure(self.buienradar)
+		self.providers.health["buienradar"].updated -= 6 * 3600 # six half-lives ago
+		self.assertEqual(self.names(amsterdam)[0], "buienradar")
+
+	def testFastestAmongEquals(self):
+		self.providers.success(self.openmeteo, 2.0)
+		self.providers.success(self.other, 0.5)
+		self.assertEqual(self.names(paris), ["other", "openmeteo", "buienradar"])
+		for i in range(6):
+			self.providers.success(self.openmeteo, 0.1) # a moving average, so it takes a few
+		self.assertEqual(self.names(paris), ["openmeteo", "other", "buienradar"])
+
+
+class FailoverTest(harness.FixtureServerTest):
+	# WeatherUpdater against providers served on localhost
+
+	def setUp(self):
+		from plugin.common import stats, watchedLocations
+		harness.FixtureServerTest.setUp(self)
+		self.stats = stats
+		harness.configure(provider="auto")
+		self.updater = harness.reset()
+		self.location = watchedLocations()[0]
+		self.buienradar = self.weather.providers.get("buienradar")
+		self.openmeteo = self.weather.providers.get("openmeteo")
+		self.patch(self.buienradar, "url", self.server.url("/buienradar/%d"))
+		self.patch(self.openmeteo, "url", self.server.url("/openmeteo?latitude=%g&longitude=%g"))
+		self.server.route("/buienradar/%d" % self.location.id, "buienradar.json", maxAge=1800)
+		self.server.route("/openmeteo", "openmeteo.json")
+
+	def fetch(self):
+		candidates = self.weather.providers.ordered(self.location)
+		self.updater.fetchForecast(self.location, candidates)
+		return self.weather.weatherData[self.location.id]
+
+	def source(self):
+		return self.updater.forecastSource(self.location.id)
+
+	def testHealthy(self):
+		data = self.fetch()
+		self.assertEqual(data.forecast.provider, "buienradar")
+		self.assertEqual(self.server.requests, {"/buienradar/%d" % self.location.id: 1})
+		self.assertTrue(self.weather.providers.health["buienradar"].latency is not None)
+		self.assertTrue(self.updater.due[self.source()] - self.weather.monotonic() > 3500) # max-age below the hour floor
+
+	def testServerError(self):
+		self.server.route("/buienradar/%d" % self.location.id, status=503, body=b"busy")
+		failovers = self.stats.counters.get("failovers", 0)
+		data = self.fetch()
+		self.assertEqual(data.forecast.provider, "openmeteo")
+		self.assertEqual(data.forecastUrl, self.openmeteo.forecastUrl(self.location))
+		self.assertEqual(self.updater.urls[self.source()], data.forecastUrl)
+		self.assertEqual(self.stats.counters.get("failovers", 0), failovers + 1)
+		self.assertTrue(self.weather.providers.health["buienradar"].currentErrorRate() > 0)
+		self.assertEqual(self.server.requests, {"/buienradar/%d" % self.location.id: 1, "/openmeteo": 1})
+
+	def testUnparseable(self):
+		self.server.route("/buienradar/%d" % self.location.id, body=b"<html>maintenance</html>")
+		parseFailures = self.stats.counters.get("parse_failures", 0)
+		data = self.fetch()
+		self.assertEqual(data.forecast.provider, "openmeteo")
+		self.assertEqual(self.stats.counters.get("parse_failures", 0), parseFailures + 1)
+
+	def testFailedProviderLast(self):
+		self.server.route("/buienradar/%d" % self.location.id, status=500)
+		self.fetch()
+		self.assertEqual([p.name for p in self.weather.providers.ordered(self.location)], ["openmeteo", "buienradar"])
+		self.server.requests.clear()
+		self.assertEqual(self.fetch().forecast.provider, "openmeteo")
+		self.assertEqual(self.server.requests, {"/openmeteo": 1}) # the failing provider is not tried first again
+
+	def testAllFailing(self):
+		self.server.route("/buienradar/%d" % self.location.id, status=500)
+		self.server.route("/openmeteo", status=500)
+		data = self.fetch()
+		self.assertEqual(data.forecast, None)
+		self.assertTrue(self.updater.due[self.source()] > self.weather.monotonic()) # retried later, not in a loop
+		self.assertEqual(self.server.requests, {"/buienradar/%d" % self.location.id: 1, "/openmeteo": 1})
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,144 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+from . import harness
+from plugin.rainseries import intensityToPixmapNum, NO_TIME, pixmapNumTable, RainSeries
+
+import unittest
+
+
+def hhmm(s):
+	return int(s[:2]) * 60 + int(s[3:5])
+
+
+class IntensityTest(unittest.TestCase):
+
+	def testTable(self):
+		self.assertEqual(len(pixmapNumTable), 256)
+		self.assertEqual(list(pixmapNumTable), [intensityToPixmapNum(v) for v in range(0, 256)])
+
+	def testRange(self):
+		self.assertEqual(intensityToPixmapNum(0), 0)
+		self.assertEqual(intensityToPixmapNum(1), 1)
+		self.assertEqual(intensityToPixmapNum(125), 9)
+		self.assertEqual(intensityToPixmapNum(136), 17)
+		self.assertEqual(intensityToPixmapNum(157), 25)
+		self.assertEqual(intensityToPixmapNum(255), 32)
+
+	def testMonotonic(self):
+		nums = list(pixmapNumTable)
+		self.assertEqual(nums, sorted(nums))
+
+
+class ParseTest(unittest.TestCase):
+
+	def testFixture(self):
+		series = RainSeries.parse(harness.fixture("rain-showers.txt"))
+		self.assertEqual(len(series), 24)
+		self.assertEqual(series.intensities[4], 77)
+		self.assertEqual(series.times[0], hhmm("14:10"))
+		self.assertEqual(series.times[-1], hhmm("16:05"))
+		self.assertTrue(series.hasTimes())
+
+	def testText(self):
+		series = RainSeries.parse(u"000|10:00\n 077|10:05 \n\n")
+		self.assertEqual(list(series.intensities), [0, 77])
+		self.assertEqual(list(series.times), [600, 605])
+
+	def testDecimalComma(self):
+		series = RainSeries.parse(b"12,6|10:00\r\n300|10:05\r\n-4|10:10\r\n")
+		self.assertEqual(list(series.intensities), [13, 255, 0])
+
+	def testMalformedIntensity(self):
+		self.assertRaises(ValueError, RainSeries.parse, harness.fixture("rain-malformed.txt"))
+		self.assertRaises(ValueError, RainSeries.parse, b"|10:00\r\n")
+
+	def testMalformedTime(self):
+		series = RainSeries.parse(b"010\r\n020|1x:05\r\n030|10:10\r\n")
+		self.assertEqual(list(series.intensities), [10, 20, 30])
+		self.assertEqual(list(series.times), [NO_TIME, NO_TIME, 610])
+		self.assertFalse(series.hasTimes())
+		self.assertEqual(series.index(610), 0)
+		self.assertEqual(series.remaining(610), 0)
+
+	def testEmpty(self):
+		series = RainSeries.parse(b"")
+		self.assertEqual(len(series), 0)
+		self.assertFalse(series.hasTimes())
+		self.assertEqual(series.index(600), 0)
+		self.assertEqual(series.pixmapNums(3), [0, 0, 0])
+
+
+class IndexTest(unittest.TestCase):
+
+	def setUp(self):
+		self.series = RainSeries.parse(harness.fixture("rain-showers.txt")) # 14:10 - 16:05
+
+	def testIndex(self):
+		self.assertEqual(self.series.index(hhmm("13:30")), 0)
+		self.assertEqual(self.series.index(hhmm("14:10")), 0)
+		self.assertEqual(self.series.index(hhmm("14:14")), 0)
+		self.assertEqual(self.series.index(hhmm("14:15")), 1)
+		self.assertEqual(self.series.index(hhmm("16:09")), 23)
+		self.assertEqual(self.series.index(hhmm("16:10")), 24)
+		self.assertEqual(self.series.index(hhmm("20:00")), 24)
+
+	def testRemaining(self):
+		self.assertEqual(self.series.remaining(hhmm("14:10")), 120)
+		self.assertEqual(self.series.remaining(hhmm("15:00")), 70)
+		self.assertEqual(self.series.remaining(hhmm("13:50")), 140)
+		self.assertTrue(self.series.remaining(hhmm("16:30")) <= 0)
+
+	def testRaining(self):
+		self.assertTrue(self.series.raining(hhmm("14:10")))
+		self.assertFalse(self.series.raining(hhmm("15:50")))
+		self.assertFalse(RainSeries.parse(harness.fixture("rain-dry.txt")).raining(hhmm("14:10")))
+
+	def testPixmapNums(self):
+		nums = self.series.pixmapNums(24)
+		self.assertEqual(nums, [pixmapNumTable[v] for v in self.series.intensities])
+		self.assertEqual(nums[4], 6)
+		self.assertEqual(max(nums), 32)
+		self.assertEqual(self.series.pixmapNums(6, 20), [0, 0, 0, 0, 0, 0])
+		self.assertEqual(self.series.pixmapNums(3, 24), [0, 0, 0])
+		self.assertEqual(len(self.series.pixmapNums(24, self.series.index(hhmm("15:00")))), 24)
+
+
+class MidnightTest(unittest.TestCase):
+
+	def setUp(self):
+		self.series = RainSeries.parse(harness.fixture("rain-midnight.txt")) # 23:05 - 01:00
+
+	def testTimes(self):
+		self.assertEqual(self.series.times[0], hhmm("23:05"))
+		self.assertEqual(self.series.times[-1], hhmm("01:00"))
+		self.assertTrue(self.series.hasTimes())
+
+	def testIndex(self):
+		self.assertEqual(self.series.index(hhmm("22:30")), 0) # before the series, not a day after it
+		self.assertEqual(self.series.index(hhmm("23:55")), 10)
+		self.assertEqual(self.series.index(hhmm("00:00")), 11)
+		self.assertEqual(self.series.index(hhmm("00:02")), 11)
+		self.assertEqual(self.series.index(hhmm("01:00")), 23)
+		self.assertEqual(self.series.index(hhmm("01:05")), 24)
+
+	def testRemaining(self):
+		self.assertEqual(self.series.remaining(hhmm("23:05")), 120)
+		self.assertEqual(self.series.remaining(hhmm("00:02")), 63)
+		self.assertEqual(self.series.remaining(hhmm("22:30")), 155)
+
+	def testRaining(self):
+		self.assertTrue(self.series.raining(hhmm("23:30")))
+		self.assertFalse(self.series.raining(hhmm("00:00")))
+
+	def testPixmapNums(self):
+		nums = self.series.pixmapNums(24, self.series.index(hhmm("23:20")))
+		self.assertEqual(nums[:2], [pixmapNumTable[40], pixmapNumTable[80]])
+		self.assertEqual(nums[-3:], [0, 0, 0])
+
+
+if __name__ == "__main__":
+	unittest.main()
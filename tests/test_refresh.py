@@ -0,0 +1,102 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+from . import harness
+from plugin.refresh import RefreshCoordinator, RefreshPolicy
+from twisted.internet import defer
+
+import time
+import unittest
+
+
+def localtime(hour):
+	return lambda: time.struct_time((2024, 6, 1, hour, 30, 0, 5, 153, 1))
+
+
+class RefreshCoordinatorTest(unittest.TestCase):
+
+	url = "https://forecast.buienradar.nl/2.0/forecast/2759794"
+
+	def setUp(self):
+		self.clock = harness.Clock()
+		self.coordinator = RefreshCoordinator(minRetryDelay=60, maxRetryDelay=600, clock=self.clock)
+
+	def testInFlight(self):
+		requests = []
+		def start():
+			requests.append(defer.Deferred())
+			return requests[-1]
+		results = []
+		self.coordinator.refresh(self.url, start).addCallback(results.append)
+		self.coordinator.refresh(self.url, start).addCallback(results.append) # joins the pending request
+		self.assertEqual(len(requests), 1)
+		self.assertTrue(self.coordinator.isInFlight(self.url))
+		self.assertEqual(self.coordinator.state()[self.url]["waiters"], 2)
+		requests[0].callback("data")
+		self.assertEqual(results, ["data", "data"])
+		self.assertFalse(self.coordinator.isInFlight(self.url))
+
+	def testSuccess(self):
+		self.coordinator.refresh(self.url, lambda: defer.succeed("data"))
+		self.clock.advance(90)
+		state = self.coordinator.state()[self.url]
+		self.assertEqual((state["inFlight"], state["lastAttempt"], state["lastSuccess"], state["failures"], state["lastError"]), (False, 90, 90, 0, None))
+
+	def testFailure(self):
+		results = []
+		self.coordinator.refresh(self.url, lambda: defer.fail(IOError("HTTP 503"))).addErrback(results.append)
+		self.assertTrue(results[0].check(IOError))
+		self.clock.advance(30)
+		self.coordinator.refresh(self.url, lambda: 1 / 0).addErrback(lambda failure: None) # start() raising counts as a failure
+		state = self.coordinator.state()[self.url]
+		self.assertEqual((state["lastAttempt"], state["lastSuccess"], state["failures"]), (0, None, 2))
+		self.assertFalse(self.coordinator.isInFlight(self.url))
+		self.coordinator.refresh(self.url, lambda: defer.succeed("data"))
+		self.assertEqual((self.coordinator.failures[self.url], self.coordinator.state()[self.url]["lastError"]), (0, None))
+
+	def testRetryDelay(self):
+		delays = [self.coordinator.retryDelay(self.url)]
+		for i in range(6):
+			self.coordinator.refresh(self.url, lambda: defer.fail(IOError())).addErrback(lambda failure: None)
+			delays.append(self.coordinator.retryDelay(self.url))
+		self.assertEqual(delays, [60, 60, 120, 240, 480, 600, 600])
+		self.coordinator.refresh(self.url, lambda: defer.succeed("data"))
+		self.assertEqual(self.coordinator.retryDelay(self.url), 60)
+
+
+class RefreshPolicyTest(unittest.TestCase):
+
+	def policy(self, hour=12, bounds=(20 * 60, 180 * 60)):
+		return RefreshPolicy(lambda: bounds, localtime=localtime(hour))
+
+	def testForecast(self):
+		policy = self.policy()
+		self.assertEqual(policy.forecastTtl(None, True), 3600)
+		self.assertEqual(policy.forecastTtl(600, True), 3600) # never more often than the interval
+		self.assertEqual(policy.forecastTtl(7200, True), 7200)
+		self.assertEqual(policy.forecastTtl(None, False), 5400) # unchanged: backs off
+
+	def testRain(self):
+		policy = self.policy()
+		self.assertEqual(policy.rainTtl(120 * 60, True), 20 * 60) # raining: as often as the user allows
+		self.assertEqual(policy.rainTtl(120 * 60, False), 30 * 60) # dry: until the horizon runs out
+		self.assertEqual(policy.rainTtl(60 * 60, False), 20 * 60)
+
+	def testNight(self):
+		self.assertTrue(self.policy(hour=3).isNight())
+		self.assertFalse(self.policy(hour=6).isNight())
+		self.assertEqual(self.policy(hour=3).forecastTtl(None, True), 7200)
+		self.assertEqual(self.policy(hour=3).rainTtl(120 * 60, True), 20 * 60) # not while it rains
+		self.assertEqual(self.policy(hour=3).rainTtl(120 * 60, False), 60 * 60)
+
+	def testBounds(self):
+		self.assertEqual(self.policy(bounds=(90 * 60, 180 * 60)).forecastTtl(None, True), 90 * 60)
+		self.assertEqual(self.policy(hour=3, bounds=(20 * 60, 60 * 60)).forecastTtl(7200, False), 60 * 60)
+		self.assertEqual(self.policy(bounds=(5 * 60, 180 * 60)).rainTtl(0, True), 5 * 60)
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,124 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+from . import harness
+from plugin import snapshot
+from plugin.providers import Buienradar
+from plugin.rainseries import RainSeries
+
+import os
+import struct
+import unittest
+
+
+class Item(object):
+
+	def __init__(self):
+		self.forecast = None
+		self.forecastUrl = None
+		self.rain = None
+		self.rainUrl = None
+
+
+def items():
+	item = Item()
+	item.forecast = Buienradar().parse(harness.fixture("buienradar.json"), 12)
+	item.forecastUrl = "https://forecast.buienradar.nl/2.0/forecast/2759794"
+	item.rain = RainSeries.parse(harness.fixture("rain-showers.txt"))
+	item.rainUrl = "https://gpsgadget.buienradar.nl/data/raintext/?lat=52.37&lon=4.89"
+	return {2759794: item, 2988507: Item()}
+
+
+class DumpLoadTest(unittest.TestCase):
+
+	def setUp(self):
+		self.data = snapshot.dump(items(), 1717243800.5, 2759794)
+
+	def testRoundTrip(self):
+		savedAt, shown, result = snapshot.load(self.data, Item)
+		self.assertEqual((savedAt, shown), (1717243800.5, 2759794))
+		self.assertEqual(sorted(result.keys()), [2759794, 2988507])
+		expected, item = items()[2759794], result[2759794]
+		self.assertEqual(item.forecastUrl, expected.forecastUrl)
+		for name in snapshot.forecastFields:
+			self.assertEqual(getattr(item.forecast, name), getattr(expected.forecast, name), name)
+		self.assertEqual(len(item.forecast.hours), 12)
+		for hour, expectedHour in zip(item.forecast.hours, expected.forecast.hours):
+			for name in snapshot.hourFields:
+				self.assertEqual(getattr(hour, name), getattr(expectedHour, name), name)
+		self.assertEqual(item.rainUrl, expected.rainUrl)
+		self.assertEqual(list(item.rain.intensities), list(expected.rain.intensities))
+		self.assertEqual(list(item.rain.times), list(expected.rain.times))
+		empty = result[2988507]
+		self.assertEqual((empty.forecast, empty.forecastUrl, empty.rain, empty.rainUrl), (None, None, None, None))
+
+	def testTruncated(self):
+		for n in range(len(self.data)):
+			self.assertRaises(ValueError, snapshot.load, self.data[:n], Item)
+
+	def testBadTag(self):
+		data = self.data[:snapshot.header.size] + b"X" + self.data[snapshot.header.size + 1:]
+		self.assertRaises(ValueError, snapshot.load, data, Item)
+
+	def testVersionMismatch(self):
+		magic, version, savedAt, shown, count = snapshot.header.unpack_from(self.data, 0)
+		for header in (snapshot.header.pack(magic, version + 1, savedAt, shown, count), snapshot.header.pack(b"XXXX", version, savedAt, shown, count)):
+			self.assertRaises(ValueError, snapshot.load, header + self.data[snapshot.header.size:], Item)
+
+	def testNotASnapshot(self):
+		for data in (b"", b"IBWS", b"<html>not a snapshot</html>", struct.pack("<4sH", b"IBWS", 1)):
+			self.assertRaises(ValueError, snapshot.load, data, Item)
+
+
+class LoadSnapshotTest(unittest.TestCase):
+	# WeatherUpdater.loadSnapshot on startup, before anything is downloaded
+
+	def setUp(self):
+		from plugin import weather
+		from plugin.common import snapshotFile, watchedLocations
+		self.weather = weather
+		self.snapshotFile = snapshotFile
+		harness.configure()
+		self.updater = harness.reset()
+		self.location = watchedLocations()[0]
+		self.source = self.updater.forecastSource(self.location.id)
+		self.url = weather.providers.ordered(self.location)[0].forecastUrl(self.location)
+
+	def write(self, data):
+		if not os.path.isdir(os.path.dirname(self.snapshotFile)):
+			os.makedirs(os.path.dirname(self.snapshotFile))
+		with open(self.snapshotFile, "wb") as f:
+			f.write(data)
+
+	def testRestored(self):
+		self.write(snapshot.dump(items(), 1717243800.5, self.location.id))
+		self.updater.loadSnapshot()
+		self.assertEqual(list(self.weather.weatherData.keys()), [self.location.id]) # only the watched locations
+		self.assertEqual(self.weather.weatherData[self.location.id].forecast.updated, "14:10")
+		self.assertIn(self.source, self.updater.restored)
+		self.assertTrue(self.updater.isDue(self.source, self.url)) # shown, but still downloaded again
+
+	def testUnusable(self):
+		data = snapshot.dump(items(), 1717243800.5, self.location.id)
+		magic, version, savedAt, shown, count = snapshot.header.unpack_from(data, 0)
+		badTag = data[:snapshot.header.size] + b"X" + data[snapshot.header.size + 1:]
+		newerVersion = snapshot.header.pack(magic, version + 1, savedAt, shown, count) + data[snapshot.header.size:]
+		for data in (data[:len(data) // 2], badTag, newerVersion):
+			self.updater = harness.reset()
+			self.write(data)
+			self.updater.loadSnapshot()
+			self.assertEqual(self.weather.weatherData, {})
+			self.assertEqual(self.updater.restored, set())
+			self.assertTrue(self.updater.isDue(self.source, self.url)) # so downloaded afresh
+
+	def testMissing(self):
+		self.updater.loadSnapshot()
+		self.assertEqual(self.weather.weatherData, {})
+		self.assertTrue(self.updater.isDue(self.source, self.url))
+
+
+if __name__ == "__main__":
+	unittest.main()
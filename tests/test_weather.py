@@ -0,0 +1,114 @@
+# -*- coding: UTF-8 -*-
+
+# InfoBarWeather by scriptmelvin
+# https://github.com/scriptmelvin/enigma2-plugin-extensions-infobarweather
+# License: GPL-2.0
+
+from . import harness
+
+import unittest
+import xml.etree.ElementTree
+
+
+class DialogTest(unittest.TestCase):
+
+	def setUp(self):
+		from plugin import weather
+		from plugin.common import watchedLocations
+		self.weather = weather
+		harness.configure(raingraph="graph")
+		self.updater = harness.reset()
+		self.location = watchedLocations()[0]
+		self.dialog = weather.InfoBarWeather(harness.Session())
+
+	def tearDown(self):
+		self.dialog.close()
+
+	def download(self, name):
+		from plugin.httpclient import FetchResult
+		from plugin.providers import providers
+		provider = providers.get(name.split(".")[0])
+		self.updater.downloadForecastCB(FetchResult(provider.forecastUrl(self.location), harness.fixture(name)), self.location, [provider])
+
+	def text(self, name):
+		return self.dialog.rendered.get((name, "text"))
+
+	def testConstruction(self):
+		self.assertIn("rainGraph", self.dialog)
+		self.assertTrue(self.dialog.hasRainWidget)
+		self.assertTrue(self.updater.fetchRain)
+		self.assertFalse(self.dialog.hasData())
+
+	def testSkinWithRainPixmaps(self):
+		# a skin that defines the plugin's screen with rainMultiPixmap widgets gets them, even with the graph chosen
+		import skin
+		from plugin import PLUGIN_NAME
+		self.dialog.close()
+		skin.dom_screens[PLUGIN_NAME] = (xml.etree.ElementTree.fromstring("<screen><widget name=\"rainMultiPixmap0\" /></screen>"), "skin.xml")
+		try:
+			self.dialog = self.weather.InfoBarWeather(harness.Session())
+		finally:
+			del skin.dom_screens[PLUGIN_NAME]
+		self.assertIn("rainMultiPixmap0", self.dialog)
+		self.assertNotIn("rainGraph", self.dialog)
+
+	def testSkinCache(self):
+		key = self.weather.compiledSkin["key"]
+		self.weather.compiledSkin.clear()
+		self.dialog.initSkin()
+		self.assertEqual(self.weather.compiledSkin["key"], key) # from the file written on construction
+
+	def testUpdateBuienradar(self):
+		self.download("buienradar.json")
+		self.assertTrue(self.dialog.hasData())
+		self.assertEqual(self.text("regio"), "Amsterdam")
+		self.assertEqual(self.text("time"), "14:10")
+		self.assertEqual(self.text("sunrise"), "05:21")
+		self.assertEqual(self.text("minmaxtemperature"), "13.1° - 23.4°")
+		self.assertTrue(self.dialog["temperature"].visible)
+
+	def testUpdateOpenMeteo(self):
+		self.download("openmeteo.json")
+		self.assertEqual(self.text("time"), "14:15")
+		self.assertEqual(self.text("uvindex"), "5")
+		self.assertEqual(self.text("minmaxtemperature"), "13.1° - 23.4°")
+
+	def testUnchangedUpdateSkipsWidgets(self):
+		from plugin.common import stats
+		self.download("buienradar.json")
+		applied = stats.counters.get("widget_updates_applied", 0)
+		self.dialog.updateUI()
+		self.assertEqual(stats.counters.get("widget_updates_applied", 0), applied)
+
+	def testRain(self):
+		from plugin.httpclient import FetchResult
+		self.download("buienradar.json")
+		self.weather.minutesNow = lambda: 14 * 60 + 10
+		try:
+			self.updater.downloadRainCB(FetchResult(self.weather.buienradar.rainUrl(self.location), harness.fixture("rain-showers.txt")), self.location.id)
+		finally:
+			from plugin.rainseries import minutesNow
+			self.weather.minutesNow = minutesNow
+		levels = self.dialog["rainGraph"].levels
+		self.assertEqual(len(levels), 24)
+		self.assertEqual(levels[:3], [0, 0, 0])
+		self.assertEqual(max(levels), 29) # the heaviest rain pixmaps are clamped to the gradient
+		self.assertTrue(self.dialog["rainGraph"].visible)
+
+	def testHideOrShowWidgets(self):
+		dialog = self.dialog
+		self.download("buienradar.json")
+		for what in range(0, dialog.ALL + 1):
+			dialog.showWidgets(dialog.ALL)
+			dialog.hideWidgets(what)
+			members, visible = dialog.visibilityTable[what]
+			for name in members:
+				self.assertFalse(dialog[name].visible, name)
+			dialog.showWidgets(what)
+			for name in members:
+				self.assertEqual(dialog[name].visible, name in visible, name)
+		self.assertFalse(dialog["notconfigured"].visible)
+
+
+if __name__ == "__main__":
+	unittest.main()